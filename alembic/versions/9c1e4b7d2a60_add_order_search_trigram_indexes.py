@@ -0,0 +1,53 @@
+"""add order search trigram indexes
+
+Revision ID: 9c1e4b7d2a60
+Revises: 58413e3a407f
+Create Date: 2026-10-18 10:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e4b7d2a60'
+down_revision: Union[str, Sequence[str], None] = '58413e3a407f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = (
+    ('ix_order_vin_trgm', 'vin'),
+    ('ix_order_vehicle_name_trgm', 'vehicle_name'),
+    ('ix_order_lot_id_text_trgm', 'CAST(lot_id AS VARCHAR)'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # SQLite (DEBUG) falls back to unindexed LIKE scans
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY cannot run inside a transaction; build without locking writes on "order"
+    with op.get_context().autocommit_block():
+        for name, expression in TRIGRAM_INDEXES:
+            op.execute(sa.text(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON "order" USING gin (({expression}) gin_trgm_ops)'
+            ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for name, _ in TRIGRAM_INDEXES:
+            op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS {name}'))
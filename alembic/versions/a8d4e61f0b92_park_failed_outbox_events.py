@@ -0,0 +1,41 @@
+"""park failed outbox events
+
+Revision ID: a8d4e61f0b92
+Revises: e5b38c0d7a19
+Create Date: 2026-10-18 16:41:27.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4e61f0b92'
+down_revision: Union[str, Sequence[str], None] = 'e5b38c0d7a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('outbox_event', sa.Column('failed_at', sa.DateTime(timezone=True), nullable=True))
+    # Parked events leave the relay's working set
+    op.drop_index('ix_outbox_event_pending', table_name='outbox_event')
+    op.create_index(
+        'ix_outbox_event_pending', 'outbox_event', ['id'], unique=False,
+        postgresql_where=sa.text('published_at IS NULL AND failed_at IS NULL'),
+        sqlite_where=sa.text('published_at IS NULL AND failed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_event_pending', table_name='outbox_event')
+    op.create_index(
+        'ix_outbox_event_pending', 'outbox_event', ['id'], unique=False,
+        postgresql_where=sa.text('published_at IS NULL'),
+        sqlite_where=sa.text('published_at IS NULL'),
+    )
+    op.drop_column('outbox_event', 'failed_at')
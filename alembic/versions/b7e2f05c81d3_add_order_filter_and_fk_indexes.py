@@ -0,0 +1,51 @@
+"""add order filter and fk indexes
+
+Revision ID: b7e2f05c81d3
+Revises: 9c1e4b7d2a60
+Create Date: 2026-10-18 11:04:27.730915
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2f05c81d3'
+down_revision: Union[str, Sequence[str], None] = '9c1e4b7d2a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ('ix_order_user_uuid_order_date', 'order', ['user_uuid', sa.text('order_date DESC'), sa.text('id DESC')]),
+    ('ix_order_order_date_id', 'order', [sa.text('order_date DESC'), sa.text('id DESC')]),
+    ('ix_order_delivery_status', 'order', ['delivery_status']),
+    ('ix_invoice_item_order_id', 'invoice_item', ['order_id']),
+    ('ix_order_status_history_order_id', 'order_status_history', ['order_id']),
+)
+
+
+def _index_block():
+    # CONCURRENTLY cannot run inside a transaction; build without locking writes on PostgreSQL
+    if op.get_bind().dialect.name == 'postgresql':
+        return op.get_context().autocommit_block()
+    return nullcontext()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with _index_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, if_not_exists=True, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with _index_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,49 @@
+"""add outbox_event table
+
+Revision ID: d41a9e6c3f28
+Revises: b7e2f05c81d3
+Create Date: 2026-10-18 12:21:53.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a9e6c3f28'
+down_revision: Union[str, Sequence[str], None] = 'b7e2f05c81d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_event',
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('available_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_outbox_event_id'), 'outbox_event', ['id'], unique=False)
+    op.create_index(op.f('ix_outbox_event_order_id'), 'outbox_event', ['order_id'], unique=False)
+    op.create_index(
+        'ix_outbox_event_pending', 'outbox_event', ['id'], unique=False,
+        postgresql_where=sa.text('published_at IS NULL'),
+        sqlite_where=sa.text('published_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_event_pending', table_name='outbox_event')
+    op.drop_index(op.f('ix_outbox_event_order_id'), table_name='outbox_event')
+    op.drop_index(op.f('ix_outbox_event_id'), table_name='outbox_event')
+    op.drop_table('outbox_event')
@@ -1,9 +1,10 @@
 import asyncio
+import math
 from contextlib import asynccontextmanager
 from typing import Optional, Callable
 
 from aio_pika import connect_robust
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi_pagination import add_pagination
 from fastapi_problem.handler import new_exception_handler, add_exception_handler
 
@@ -11,13 +12,31 @@ from app.database.db.session import AsyncSessionLocal
 from app.routers import api_router
 from app.config import settings
 from app.core.logger import logger
+from app.core.metrics import PrometheusMiddleware, metrics_response
+from app.core.problems import ServiceUnavailableProblem
+from app.rpc_client.channel_pool import channel_registry
+from app.rpc_client.circuit_breaker import CircuitOpenError
 from app.services.rabbit_service.file_routing_keys import RoutingKeys
 from app.services.rabbit_service.order_consumer import OrderRabbitConsumer
+from app.services.rabbit_service.user_eviction_consumer import UserEvictionConsumer
+from app.services.invoice_generator.render_pool import invoice_render_pool
+from app.services.outbox_relay import outbox_relay
+from app.services.refresh_user_identities import user_identity_refresh_runs
+from app.services.requote_orders import requote_runs
+from app.services.rabbit_service.service import rabbit_publisher
+
+
+def circuit_open_handler(_eh, _request: Request, exc: CircuitOpenError) -> ServiceUnavailableProblem:
+    return ServiceUnavailableProblem(
+        detail="A dependency is temporarily unavailable, try again later",
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
 
 
 def setup_middleware_and_handlers(app: FastAPI):
-    eh = new_exception_handler()
+    eh = new_exception_handler(handlers={CircuitOpenError: circuit_open_handler})
     add_exception_handler(app, eh)
+    app.add_middleware(PrometheusMiddleware)
 
 def setup_routers(app: FastAPI):
     app.include_router(api_router)
@@ -25,11 +44,17 @@ def setup_routers(app: FastAPI):
     async def health_check():
         return {"status": "ok"}
 
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return metrics_response()
+
 def create_app(
         lifespan_override: Optional[Callable] = None
 ) -> FastAPI:
     @asynccontextmanager
-    async def default_lifespan(_: FastAPI):
+    async def default_lifespan(app_: FastAPI):
+        await channel_registry.start()
+
         max_attempts = 5
         base_delay_s = 2
         connection = None
@@ -52,15 +77,30 @@ def create_app(
         consumer = OrderRabbitConsumer(
             AsyncSessionLocal,
             connection,
-            [member.value for member in RoutingKeys],
+            [member.value for member in RoutingKeys if member != RoutingKeys.USER_UPDATED],
 
         )
         await consumer.set_up()
         await consumer.start_consuming()
+        app_.state.order_consumer = consumer
+        user_eviction_consumer = UserEvictionConsumer(connection)
+        await user_eviction_consumer.start()
+        await rabbit_publisher.start(connection)
+        await outbox_relay.start()
+        invoice_render_pool.start()
 
         logger.info(f"{settings.APP_NAME} started!")
         yield
+        await user_identity_refresh_runs.close()
+        await requote_runs.close()
+        await outbox_relay.close()
+        # Flush pending publishes before the consumer closes the shared connection
+        await rabbit_publisher.close()
+        await user_eviction_consumer.close()
         await consumer.stop_consuming()
+        await channel_registry.close()
+        # Lets in-flight renders finish; blocks shutdown for at most one render per worker
+        await asyncio.to_thread(invoice_render_pool.close)
 
 
     docs_url = "/docs" if settings.enable_docs else None
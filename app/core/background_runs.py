@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Generic, Protocol, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.logger import logger
+from app.enums.background_run_status import BackgroundRunStatus
+
+
+class BackgroundJob(Protocol):
+    # Updated while the job runs so it can be polled
+    progress: BaseModel
+
+    async def run(self) -> BaseModel: ...
+
+
+P = TypeVar("P")
+J = TypeVar("J", bound=BackgroundJob)
+R = TypeVar("R", bound=BaseModel)
+
+
+@dataclass
+class _Run(Generic[J]):
+    run_id: str
+    job: J
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    status: BackgroundRunStatus = BackgroundRunStatus.RUNNING
+    finished_at: datetime | None = None
+    error: str | None = None
+    task: asyncio.Task | None = None
+
+
+class BackgroundRuns(Generic[P, J, R]):
+    """
+    Jobs running in the background of this process, started from ``params`` by ``job_factory``.
+
+    Runs are kept in memory for status polling, the latest ``keep`` of them; a run is only known
+    to the instance that started it, its progress is logged as well. ``run_out`` is the job's
+    progress model extended with the run fields.
+    """
+
+    def __init__(self, name: str, job_factory: Callable[[P], J], run_out: type[R], keep: int = 20):
+        self.name = name
+        self.job_factory = job_factory
+        self.run_out = run_out
+        self.keep = keep
+        self._runs: OrderedDict[str, _Run[J]] = OrderedDict()
+
+    def start(self, params: P) -> R:
+        run = _Run(run_id=uuid.uuid4().hex, job=self.job_factory(params))
+        run.task = asyncio.create_task(self._run(run))
+        self._runs[run.run_id] = run
+        while len(self._runs) > self.keep:
+            oldest = next(iter(self._runs.values()))
+            if oldest.status == BackgroundRunStatus.RUNNING:
+                break
+            self._runs.popitem(last=False)
+        return self._out(run)
+
+    def get(self, run_id: str) -> R | None:
+        run = self._runs.get(run_id)
+        return self._out(run) if run else None
+
+    def _out(self, run: _Run[J]) -> R:
+        return self.run_out(
+            run_id=run.run_id,
+            status=run.status,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            error=run.error,
+            **run.job.progress.model_dump(),
+        )
+
+    async def _run(self, run: _Run[J]):
+        logger.info(f"{self.name} started", extra={"run_id": run.run_id})
+        try:
+            await run.job.run()
+            run.status = BackgroundRunStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            run.status = BackgroundRunStatus.CANCELLED
+            raise
+        except Exception as e:
+            run.status = BackgroundRunStatus.FAILED
+            run.error = str(e)
+            logger.exception(f"{self.name} failed", extra={"run_id": run.run_id})
+        finally:
+            run.finished_at = datetime.now(timezone.utc)
+            logger.info(
+                f"{self.name} finished",
+                extra={"run_id": run.run_id, "status": run.status.value, **run.job.progress.model_dump()},
+            )
+
+    async def close(self):
+        tasks = [run.task for run in self._runs.values() if run.task and not run.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
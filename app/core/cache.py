@@ -0,0 +1,184 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+from app.core.logger import logger
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_caches: dict[str, "AsyncTTLCache"] = {}
+
+
+@dataclass
+class _Entry:
+    expires_at: float
+    value: Any = None
+    error: BaseException | None = None
+    # Past ``expires_at`` but before this, ``get_or_load`` still serves the value while reloading it
+    stale_until: float = 0.0
+
+
+class AsyncTTLCache(Generic[K, V]):
+    """
+    Bounded in-process LRU cache with per-entry TTL for async loaders.
+
+    Concurrent misses for the same key are coalesced into a single loader call, and
+    errors accepted by ``cache_error`` are cached for ``negative_ttl`` seconds and re-raised on hit.
+    With ``stale_ttl`` an expired value keeps being served for that long while one background
+    load refreshes it; a failed refresh leaves the stale value in place.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl: float, negative_ttl: float = 0.0, stale_ttl: float = 0.0):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+
+        self._entries: OrderedDict[K, _Entry] = OrderedDict()
+        self._inflight: dict[K, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        _caches[name] = self
+
+    def _lookup(self, key: K, allow_stale: bool = False) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if entry.expires_at <= now and not (allow_stale and entry.stale_until > now):
+            if entry.stale_until <= now:
+                del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: K, entry: _Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: K) -> V | None:
+        entry = self._lookup(key)
+        if entry is None or entry.error is not None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: K, value: V, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._store(key, _Entry(expires_at=expires_at, value=value, stale_until=expires_at + self.stale_ttl))
+
+    async def get_or_load(
+            self,
+            key: K,
+            loader: Callable[[], Awaitable[V]],
+            cache_error: Callable[[BaseException], bool] | None = None,
+    ) -> V:
+        entry = self._lookup(key, allow_stale=self.stale_ttl > 0)
+        if entry is not None:
+            if entry.error is not None:
+                self.negative_hits += 1
+                # Every hit raises the same instance; start from a fresh traceback each time
+                raise entry.error.with_traceback(None)
+            if entry.expires_at <= time.monotonic():
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._start_load(key, loader, cache_error).add_done_callback(self._log_failed_refresh)
+                return entry.value
+            self.hits += 1
+            return entry.value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._start_load(key, loader, cache_error)
+        # Shield so a cancelled caller does not cancel the load other callers are waiting on
+        return await asyncio.shield(task)
+
+    def _start_load(
+            self,
+            key: K,
+            loader: Callable[[], Awaitable[V]],
+            cache_error: Callable[[BaseException], bool] | None,
+    ) -> asyncio.Task:
+        task = self._inflight[key] = asyncio.ensure_future(self._load(key, loader, cache_error))
+        return task
+
+    def _log_failed_refresh(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                "Cache refresh failed, serving stale value",
+                extra={"cache": self.name, "error": str(task.exception())},
+            )
+
+    async def _load(
+            self,
+            key: K,
+            loader: Callable[[], Awaitable[V]],
+            cache_error: Callable[[BaseException], bool] | None,
+    ) -> V:
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+        except Exception as e:
+            stale = self._entries.get(key)
+            has_stale_value = stale is not None and stale.error is None and stale.stale_until > time.monotonic()
+            if (
+                    self._inflight.get(key) is task and cache_error is not None and self.negative_ttl > 0
+                    and cache_error(e) and not has_stale_value
+            ):
+                self._store(key, _Entry(expires_at=time.monotonic() + self.negative_ttl, error=e))
+            raise
+        else:
+            # A load overtaken by ``invalidate`` may have read the old value; hand it out but do not keep it
+            if self._inflight.get(key) is task:
+                self.set(key, value)
+            return value
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def invalidate(self, key: K):
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.negative_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": (
+                round((self.hits + self.stale_hits + self.negative_hits + self.coalesced) / lookups, 4)
+                if lookups else 0.0
+            ),
+        }
+
+
+def get_cache_stats() -> dict[str, dict[str, Any]]:
+    return {name: cache.stats() for name, cache in _caches.items()}
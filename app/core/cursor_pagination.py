@@ -0,0 +1,132 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Generic, Sequence, TypeVar
+
+from fastapi import Query
+from pydantic import BaseModel, Field
+from rfc9457 import BadRequestProblem
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+
+class CursorDirection(str, Enum):
+    NEXT = "next"
+    PREV = "prev"
+
+
+class CursorParams(BaseModel):
+    cursor: str | None = None
+    size: int = Field(5, ge=1, le=1000)
+    include_total: bool = False
+
+
+def get_cursor_params(
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page (next_cursor/prev_cursor)"),
+    size: int = Query(5, ge=1, le=1000),
+    include_total: bool = Query(False, description="Also count all matching rows (slower on large tables)"),
+) -> CursorParams:
+    return CursorParams(cursor=cursor, size=size, include_total=include_total)
+
+
+class CursorPage(BaseModel, Generic[T]):
+    data: list[T]
+    size: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    count: int | None = None
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _from_json(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(direction: CursorDirection, sort: str, keys: Sequence[Any]) -> str:
+    raw = json.dumps({"d": direction.value, "s": sort, "k": [_to_json(key) for key in keys]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, key_count: int) -> tuple[CursorDirection, list[Any]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = CursorDirection(payload["d"])
+        keys = [_from_json(key) for key in payload["k"]]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise BadRequestProblem(detail="Invalid cursor")
+    if payload.get("s") != sort or len(keys) != key_count:
+        raise BadRequestProblem(detail="Cursor does not match the requested sort order")
+    return direction, keys
+
+
+async def paginate_by_cursor(
+    session: AsyncSession,
+    stmt: Select,
+    params: CursorParams,
+    sort: str,
+    sort_columns: Sequence[InstrumentedAttribute],
+) -> CursorPage:
+    """
+    Keyset pagination over ``sort_columns`` in descending order (the last column must be unique).
+
+    Pages are fetched with a row-value comparison against the cursor keys instead of OFFSET,
+    so deep pages cost the same as the first one. The total is only counted when requested.
+    """
+    direction = CursorDirection.NEXT
+    keys: list[Any] | None = None
+    if params.cursor:
+        direction, keys = decode_cursor(params.cursor, sort, len(sort_columns))
+
+    page_stmt = stmt.order_by(None)
+    if keys is not None:
+        row_value = tuple_(*sort_columns)
+        page_stmt = page_stmt.where(row_value < tuple_(*keys) if direction == CursorDirection.NEXT else row_value > tuple_(*keys))
+
+    if direction == CursorDirection.NEXT:
+        page_stmt = page_stmt.order_by(*(column.desc() for column in sort_columns))
+    else:
+        page_stmt = page_stmt.order_by(*(column.asc() for column in sort_columns))
+
+    result = await session.execute(page_stmt.limit(params.size + 1))
+    rows = list(result.scalars().all() if _selects_single_entity(stmt) else result.all())
+
+    has_more = len(rows) > params.size
+    rows = rows[:params.size]
+    if direction == CursorDirection.PREV:
+        rows.reverse()
+
+    def row_keys(row) -> list[Any]:
+        return [getattr(row, column.key) for column in sort_columns]
+
+    next_cursor = None
+    prev_cursor = None
+    if rows:
+        if direction == CursorDirection.PREV or has_more:
+            next_cursor = encode_cursor(CursorDirection.NEXT, sort, row_keys(rows[-1]))
+        if (direction == CursorDirection.NEXT and keys is not None) or (direction == CursorDirection.PREV and has_more):
+            prev_cursor = encode_cursor(CursorDirection.PREV, sort, row_keys(rows[0]))
+
+    count = None
+    if params.include_total:
+        count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+        count = (await session.execute(count_stmt)).scalar_one()
+
+    return CursorPage(data=rows, size=params.size, next_cursor=next_cursor, prev_cursor=prev_cursor, count=count)
+
+
+def _selects_single_entity(stmt: Select) -> bool:
+    descriptions = stmt.column_descriptions
+    return len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
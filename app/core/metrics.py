@@ -0,0 +1,124 @@
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Every label value below comes from a closed set (route templates, proto methods, status codes,
+# bound routing keys, SQL verbs) so series stay bounded whatever clients or payloads send.
+
+_FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+_HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+_SQL_OPERATIONS = frozenset({
+    "select", "with", "insert", "update", "delete", "begin", "commit", "rollback", "savepoint", "create", "alter", "drop",
+})
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+RPC_CALL_SECONDS = Histogram(
+    "rpc_client_call_duration_seconds",
+    "Outgoing gRPC call latency including retries and hedged attempts",
+    ["method", "code"],
+)
+RPC_RETRIES = Counter("rpc_client_retries_total", "Retried outgoing gRPC attempts", ["method"])
+DB_STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement latency by statement class",
+    ["operation"],
+    buckets=_FAST_BUCKETS,
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=_FAST_BUCKETS,
+)
+DB_POOL_IN_USE = Gauge("db_pool_connections_in_use", "Checked out database connections")
+DB_POOL_SATURATION = Gauge(
+    "db_pool_saturation_ratio",
+    "Checked out database connections over pool_size + max_overflow",
+)
+AMQP_CONSUME_SECONDS = Histogram(
+    "amqp_consume_duration_seconds",
+    "Processing time of consumed messages by routing key",
+    ["consumer", "routing_key", "outcome"],
+)
+AMQP_PUBLISHED = Counter(
+    "amqp_published_messages_total",
+    "Published messages by routing key",
+    ["routing_key", "outcome"],
+)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a free connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+
+
+def _sql_operation(statement: str) -> str:
+    operation = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    return operation if operation in _SQL_OPERATIONS else "other"
+
+
+def instrument_engine(engine: AsyncEngine, max_connections: int):
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(_conn, _cursor, _statement, _parameters, context, _executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _observe(_conn, _cursor, statement, _parameters, context, _executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is not None:
+            DB_STATEMENT_SECONDS.labels(_sql_operation(statement)).observe(time.perf_counter() - started)
+
+    # Read at scrape time, so no bookkeeping happens on the checkout path
+    DB_POOL_IN_USE.set_function(lambda: sync_engine.pool.checkedout())
+    DB_POOL_SATURATION.set_function(lambda: sync_engine.pool.checkedout() / max_connections)
+
+
+class PrometheusMiddleware:
+    """Observes every HTTP request under its route template; unmatched paths share one label."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"] if scope["method"] in _HTTP_METHODS else "other"
+            HTTP_REQUEST_SECONDS.labels(method, route, f"{status_code // 100}xx").observe(
+                time.perf_counter() - started
+            )
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,6 @@
+from rfc9457 import ServerProblem
+
+
+class ServiceUnavailableProblem(ServerProblem):
+    title = "Service Unavailable"
+    status = 503
@@ -3,3 +3,5 @@ from .custom_invoice import CustomInvoiceService
 from .invoice_items import InvoiceItemService
 from .order import OrderService
 from .order_status_history import OrderStatusHistoryService
+from .outbox import OutboxEventService
+from .processed_message import ProcessedMessageService
@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -25,6 +27,28 @@ class AuctionInvoiceService(BaseService[AuctionInvoice, AuctionInvoiceCreate, Au
                 return invoice
         return None
 
+    async def get_by_order_ids(self, order_ids: Sequence[int]) -> dict[int, AuctionInvoice]:
+        """Same pick as ``get_by_order_id`` (newest available, else newest pending) for many orders at once."""
+        if not order_ids:
+            return {}
+        query = (
+            select(AuctionInvoice)
+            .where(
+                AuctionInvoice.order_id.in_(order_ids),
+                AuctionInvoice.status.in_((FileInvoiceStatus.AVAILABLE, FileInvoiceStatus.PENDING)),
+            )
+            .order_by(AuctionInvoice.created_at.desc())
+        )
+        result = await self.session.execute(query)
+        invoices: dict[int, AuctionInvoice] = {}
+        for invoice in result.scalars():
+            current = invoices.get(invoice.order_id)
+            if current is None or (
+                current.status != FileInvoiceStatus.AVAILABLE and invoice.status == FileInvoiceStatus.AVAILABLE
+            ):
+                invoices[invoice.order_id] = invoice
+        return invoices
+
     async def get_by_file_id(self, file_id: int) -> AuctionInvoice | None:
         query = select(AuctionInvoice).where(AuctionInvoice.file_id == file_id)
         result = await self.session.execute(query)
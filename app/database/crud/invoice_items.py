@@ -1,6 +1,6 @@
 from typing import Sequence, Any, Coroutine
 
-from sqlalchemy import select, Select, Row, RowMapping
+from sqlalchemy import select, Select, Row, RowMapping, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.crud.base import BaseService
@@ -33,3 +33,39 @@ class InvoiceItemService(BaseService[InvoiceItems, InvoiceItemCreate, InvoiceIte
             return query
         result = await self.session.execute(query)
         return result.scalars().all()
+
+    async def replace_calculated_items(self, items_by_order: dict[int, Sequence[InvoiceItemCreate]]) -> list[int]:
+        """
+        Replace calculator-priced invoice items of several orders in one transaction.
+        Lines added by hand are kept. Orders without any calculated line predate the flag and are
+        left alone, since their calculated lines cannot be told apart. Returns the replaced order ids.
+        """
+        if not items_by_order:
+            return []
+
+        result = await self.session.execute(
+            select(InvoiceItems.order_id)
+            .where(
+                InvoiceItems.order_id.in_(items_by_order.keys()),
+                InvoiceItems.is_calculated.is_(True),
+            )
+            .distinct()
+        )
+        order_ids = list(result.scalars().all())
+        if not order_ids:
+            return []
+
+        await self.session.execute(
+            delete(InvoiceItems).where(
+                InvoiceItems.order_id.in_(order_ids),
+                InvoiceItems.is_calculated.is_(True),
+            )
+        )
+        invoice_items = [
+            InvoiceItems(**item.model_dump())
+            for order_id in order_ids
+            for item in items_by_order[order_id]
+        ]
+        self.session.add_all(invoice_items)
+        await self.session.commit()
+        return order_ids
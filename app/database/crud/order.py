@@ -1,20 +1,56 @@
+from datetime import datetime
 from typing import Sequence, Any, Coroutine
 
-from sqlalchemy import select, or_, Select, Row, RowMapping, cast, String
+from sqlalchemy import or_, select, update, Select, Row, RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, selectinload
 
 from app.database.crud.base import BaseService
 from app.database.crud.invoice_items import InvoiceItemService
+from app.database.crud.order_search import build_order_search_clause
 from app.database.models import Order
 from app.database.models.order import Order, InvoiceItems
 from app.database.schemas import InvoiceItemCreate
-from app.database.schemas.order import OrderCreate, OrderUpdate
+from app.database.schemas.order import OrderCreate, OrderRead, OrderUpdate
+from app.enums.order import OrderStatusEnum
+
+# Columns serialized by OrderRead; list endpoints select these as plain rows instead of ORM objects
+ORDER_READ_COLUMNS = tuple(getattr(Order, name) for name in OrderRead.model_fields)
+
+ORDER_RELATIONSHIPS = (
+    Order.invoice_items,
+    Order.status_history,
+    Order.custom_invoice,
+    Order.auction_invoice,
+)
 
 
 class OrderService(BaseService[Order, OrderCreate, OrderUpdate]):
     def __init__(self, session: AsyncSession):
         super().__init__(Order, session)
 
+    async def get_with_relationships(
+        self,
+        order_id: int,
+        *relationships: InstrumentedAttribute,
+    ) -> Order | None:
+        stmt = (
+            select(Order)
+            .where(Order.id == order_id)
+            .options(*(selectinload(relationship) for relationship in relationships))
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def delete(self, obj_id: int) -> bool:
+        # Cascaded children have to be in the session before the order is deleted
+        order = await self.get_with_relationships(obj_id, *ORDER_RELATIONSHIPS)
+        if not order:
+            return False
+        await self.session.delete(order)
+        await self.session.commit()
+        return True
+
     async def exists_by_lot_id(self, lot_id: int) -> bool:
         query = select(Order.id).where(Order.lot_id == lot_id)
         result = await self.session.execute(query)
@@ -45,22 +81,110 @@ class OrderService(BaseService[Order, OrderCreate, OrderUpdate]):
         search: str | None = None,
         get_stmt: bool = True,
         user_uuid: str | None = None,
-    ) -> Select[tuple[Order]] | Sequence[Order]:
-        stmt = select(Order)
+        as_rows: bool = False,
+    ) -> Select | Sequence[Order] | Sequence[Row]:
+        stmt = select(*ORDER_READ_COLUMNS) if as_rows else select(Order)
 
         if user_uuid:
             stmt = stmt.where(Order.user_uuid == user_uuid)
 
         if search:
-            stmt = stmt.where(
-                or_(
-                    Order.vin.ilike(f"%{search}%"),
-                    cast(Order.auction, String).ilike(f"%{search}%"),
-                    cast(Order.lot_id, String).ilike(f"%{search}%"),
-                    Order.vehicle_name.ilike(f"%{search}%"),
-                )
-            )
+            search_clause = build_order_search_clause(search)
+            if search_clause is not None:
+                stmt = stmt.where(search_clause)
         if get_stmt:
             return stmt
         result = await self.session.execute(stmt)
+        return result.all() if as_rows else result.scalars().all()
+
+    @staticmethod
+    def _apply_filters(
+        stmt: Select,
+        statuses: Sequence[OrderStatusEnum] | None = None,
+        user_uuid: str | None = None,
+        location_id: int | None = None,
+        order_ids: Sequence[int] | None = None,
+        order_date_from: datetime | None = None,
+        order_date_to: datetime | None = None,
+    ) -> Select:
+        if statuses:
+            stmt = stmt.where(Order.delivery_status.in_(statuses))
+        if user_uuid:
+            stmt = stmt.where(Order.user_uuid == user_uuid)
+        if location_id is not None:
+            stmt = stmt.where(Order.location_id == location_id)
+        if order_ids is not None:
+            stmt = stmt.where(Order.id.in_(order_ids))
+        if order_date_from is not None:
+            stmt = stmt.where(Order.order_date >= order_date_from)
+        if order_date_to is not None:
+            stmt = stmt.where(Order.order_date < order_date_to)
+        return stmt
+
+    async def get_all_with_filters(
+        self,
+        statuses: Sequence[OrderStatusEnum] | None = None,
+        user_uuid: str | None = None,
+        location_id: int | None = None,
+        order_ids: Sequence[int] | None = None,
+        order_date_from: datetime | None = None,
+        order_date_to: datetime | None = None,
+        relationships: Sequence[InstrumentedAttribute] = (),
+    ) -> Sequence[Order]:
+        stmt = self._apply_filters(
+            select(Order).order_by(Order.id),
+            statuses, user_uuid, location_id, order_ids, order_date_from, order_date_to,
+        ).options(*(selectinload(relationship) for relationship in relationships))
+        result = await self.session.execute(stmt)
         return result.scalars().all()
+
+    async def get_ids_with_filters(
+        self,
+        statuses: Sequence[OrderStatusEnum] | None = None,
+        user_uuid: str | None = None,
+        location_id: int | None = None,
+        order_ids: Sequence[int] | None = None,
+        order_date_from: datetime | None = None,
+        order_date_to: datetime | None = None,
+    ) -> Sequence[int]:
+        stmt = self._apply_filters(
+            select(Order.id).order_by(Order.id),
+            statuses, user_uuid, location_id, order_ids, order_date_from, order_date_to,
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_rows_with_filters(
+        self,
+        columns: Sequence[InstrumentedAttribute],
+        statuses: Sequence[OrderStatusEnum] | None = None,
+        order_ids: Sequence[int] | None = None,
+    ) -> Sequence[Row]:
+        """Only ``columns`` of the matching orders, for bulk jobs that do not need whole entities."""
+        stmt = self._apply_filters(
+            select(*columns).order_by(Order.id),
+            statuses, order_ids=order_ids,
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def get_user_uuids(self, user_uuid: str | None = None) -> Sequence[str]:
+        stmt = select(Order.user_uuid).distinct().order_by(Order.user_uuid)
+        if user_uuid:
+            stmt = stmt.where(Order.user_uuid == user_uuid)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def update_user_identity(self, user_uuid: str, user_name: str, user_email: str) -> int:
+        """Rewrite the cached name/email on every order of ``user_uuid``; returns how many orders changed."""
+        stmt = (
+            update(Order)
+            .where(
+                Order.user_uuid == user_uuid,
+                or_(Order.user_name != user_name, Order.user_email != user_email),
+            )
+            .values(user_name=user_name, user_email=user_email)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
@@ -0,0 +1,64 @@
+import re
+
+from sqlalchemy import ColumnElement, String, cast, or_
+
+from app.database.models import Order
+from app.enums.auction import AuctionEnum
+
+# ISO 3779 VIN: 17 characters, letters I, O and Q are never used
+VIN_PATTERN = re.compile(r"^[A-HJ-NPR-Z0-9]{17}$", re.IGNORECASE)
+NUMERIC_PATTERN = re.compile(r"^\d+$")
+
+# lot_id is a 32-bit INTEGER column; larger numbers can only match as text
+_MAX_LOT_ID = 2 ** 31 - 1
+
+# Must stay identical to the expression of ix_order_lot_id_text_trgm so PostgreSQL can use the index
+LOT_ID_TEXT = cast(Order.lot_id, String)
+
+
+def _contains(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def build_order_search_clause(search: str) -> ColumnElement[bool] | None:
+    """
+    Build the WHERE clause for a free-text order search.
+
+    - VIN-shaped input (17 characters, no I/O/Q) is an exact match on the unique ``vin`` index.
+    - Numeric input also gets an exact ``lot_id`` match, on top of the substring matches on lot id
+      text, VIN (people often search by the numeric VIN tail) and vehicle name (model years).
+    - Anything else is a substring match over VIN, vehicle name and lot id text, plus the auctions
+      whose name contains the term.
+
+    Substring matches are plain ``ILIKE`` so they work on SQLite in DEBUG mode; on PostgreSQL they
+    are served by the ``pg_trgm`` GIN indexes for terms of three or more characters.
+    """
+    term = search.strip()
+    if not term:
+        return None
+
+    if VIN_PATTERN.match(term):
+        return Order.vin.in_({term, term.upper()})
+
+    pattern = _contains(term)
+
+    if NUMERIC_PATTERN.match(term):
+        clauses = [
+            LOT_ID_TEXT.ilike(pattern, escape="\\"),
+            Order.vin.ilike(pattern, escape="\\"),
+            Order.vehicle_name.ilike(pattern, escape="\\"),
+        ]
+        if int(term) <= _MAX_LOT_ID:
+            clauses.insert(0, Order.lot_id == int(term))
+        return or_(*clauses)
+
+    clauses = [
+        Order.vin.ilike(pattern, escape="\\"),
+        Order.vehicle_name.ilike(pattern, escape="\\"),
+        LOT_ID_TEXT.ilike(pattern, escape="\\"),
+    ]
+    auctions = [auction for auction in AuctionEnum if term.upper() in auction.value]
+    if auctions:
+        clauses.append(Order.auction.in_(auctions))
+    return or_(*clauses)
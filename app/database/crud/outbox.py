@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.database.crud.base import BaseService
+from app.database.models import OutboxEvent
+from app.database.schemas.outbox import OutboxEventCreate, OutboxEventUpdate
+
+
+class OutboxEventService(BaseService[OutboxEvent, OutboxEventCreate, OutboxEventUpdate]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(OutboxEvent, session)
+
+    def add(self, data: OutboxEventCreate) -> OutboxEvent:
+        """Stage an event in the current transaction; it is written by the caller's commit."""
+        event = OutboxEvent(**data.model_dump(mode="json"))
+        self.session.add(event)
+        return event
+
+    async def get_pending(self, limit: int, now: datetime) -> Sequence[OutboxEvent]:
+        """
+        Events due for publishing, oldest first.
+
+        An event is skipped while an earlier pending event of the same order is still backing off,
+        so backed-off events neither fill the batch nor let later events of their order overtake them.
+        """
+        earlier = aliased(OutboxEvent)
+        earlier_backing_off = exists().where(
+            earlier.order_id == OutboxEvent.order_id,
+            earlier.id < OutboxEvent.id,
+            earlier.published_at.is_(None),
+            earlier.failed_at.is_(None),
+            earlier.available_at > now,
+        )
+        stmt = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.published_at.is_(None),
+                OutboxEvent.failed_at.is_(None),
+                OutboxEvent.available_at <= now,
+                ~earlier_backing_off,
+            )
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def mark_published(self, event_ids: Sequence[int]):
+        if not event_ids:
+            return
+        await self.session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(event_ids))
+            .values(published_at=datetime.now(timezone.utc), last_error=None)
+        )
+
+    async def mark_failed(self, event_id: int, error: str, retry_in: timedelta):
+        await self.session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(
+                attempts=OutboxEvent.attempts + 1,
+                last_error=error[:1000],
+                available_at=datetime.now(timezone.utc) + retry_in,
+            )
+        )
+
+    async def mark_parked(self, event_id: int, error: str):
+        await self.session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(
+                attempts=OutboxEvent.attempts + 1,
+                last_error=error[:1000],
+                failed_at=datetime.now(timezone.utc),
+            )
+        )
+
+    async def delete_published_before(self, cutoff: datetime) -> int:
+        result = await self.session.execute(
+            delete(OutboxEvent).where(
+                OutboxEvent.published_at.is_not(None),
+                OutboxEvent.published_at < cutoff,
+            )
+        )
+        return result.rowcount or 0
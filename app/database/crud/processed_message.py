@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.crud.base import BaseService
+from app.database.models import ProcessedMessage
+from app.database.schemas.processed_message import ProcessedMessageCreate, ProcessedMessageUpdate
+
+
+class ProcessedMessageService(BaseService[ProcessedMessage, ProcessedMessageCreate, ProcessedMessageUpdate]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(ProcessedMessage, session)
+
+    async def is_processed(self, message_key: str) -> bool:
+        query = select(ProcessedMessage.message_key).where(ProcessedMessage.message_key == message_key)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    def record_on_commit(self, data: ProcessedMessageCreate):
+        """
+        Add the ledger entry to whatever the session commits next.
+
+        The entry is only written together with the message's side effects: a handler that ends
+        without committing (nothing to do, or an error) leaves no entry behind.
+        """
+        event.listen(
+            self.session.sync_session,
+            "before_commit",
+            lambda session: session.add(ProcessedMessage(**data.model_dump())),
+            once=True,
+        )
+
+    async def delete_processed_before(self, cutoff: datetime) -> int:
+        result = await self.session.execute(
+            delete(ProcessedMessage).where(ProcessedMessage.processed_at < cutoff)
+        )
+        return result.rowcount or 0
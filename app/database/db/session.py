@@ -4,6 +4,7 @@ from typing import Any, AsyncGenerator
 from sqlalchemy import Engine, create_engine
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
 from app.config import settings
+from app.core.metrics import InstrumentedAsyncQueuePool, instrument_engine
 from app.core.utils import BASE_DIR
 
 if settings.DEBUG:
@@ -17,14 +18,19 @@ else:
 
 engine: Engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
+POOL_SIZE = 20
+MAX_OVERFLOW = 20
+
 engine_async: AsyncEngine = create_async_engine(
     SQLALCHEMY_ASYNC_DATABASE_URL,
-    pool_size=20,
-    max_overflow=20,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
     pool_timeout=30,
     pool_pre_ping=True,
     echo=False
 )
+instrument_engine(engine_async, max_connections=POOL_SIZE + MAX_OVERFLOW)
 AsyncSessionLocal = async_sessionmaker(
     bind=engine_async,
     expire_on_commit=False,
@@ -7,6 +7,8 @@ from .order import (
     Order,
     OrderStatusHistory,
 )
+from .outbox import OutboxEvent
+from .processed_message import ProcessedMessage
 
 __all__ = [
     "AuctionInvoice",
@@ -16,5 +18,7 @@ __all__ = [
     "InvoiceItems",
     "Order",
     "OrderStatusHistory",
+    "OutboxEvent",
+    "ProcessedMessage",
     "TimestampMixin",
 ]
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, false
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from ..base import Base
@@ -17,7 +17,9 @@ class InvoiceItems(Base):
     name: Mapped[str] = mapped_column(nullable=False)
     amount: Mapped[int] = mapped_column(nullable=False)
     is_extra_fee: Mapped[bool] = mapped_column(nullable=False)
+    # Lines priced by the calculator; re-quoting replaces only these
+    is_calculated: Mapped[bool] = mapped_column(nullable=False, default=False, server_default=false())
 
-    order_id: Mapped[int] = mapped_column(ForeignKey('order.id'), nullable=False)
+    order_id: Mapped[int] = mapped_column(ForeignKey('order.id'), nullable=False, index=True)
 
     order: Mapped["Order"] = relationship('Order', back_populates='invoice_items', lazy='selectin')
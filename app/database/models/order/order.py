@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, Enum
+from sqlalchemy import DateTime, Enum, Index, String, cast
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.enums.auction import AuctionEnum
@@ -40,7 +40,7 @@ class Order(IdMixin, TimestampMixin, Base):
 
     auto_generated: Mapped[bool] = mapped_column(nullable=False, default=False)
     delivery_status: Mapped[OrderStatusEnum] = mapped_column(
-        Enum(OrderStatusEnum), nullable=False, default=OrderStatusEnum.WON
+        Enum(OrderStatusEnum), nullable=False, default=OrderStatusEnum.WON, index=True
     )
 
     # --- external calculator fields ---
@@ -68,18 +68,44 @@ class Order(IdMixin, TimestampMixin, Base):
     user_email: Mapped[str] = mapped_column(nullable=False)
 
     # -- relationships --
+    # Never loaded implicitly: callers opt in with OrderService.get_with_relationships / selectinload
     invoice_items: Mapped[list["InvoiceItems"]] = relationship(
-        "InvoiceItems", back_populates="order", cascade="all, delete-orphan", lazy="selectin"
+        "InvoiceItems", back_populates="order", cascade="all, delete-orphan", lazy="raise"
     )
 
     status_history: Mapped[list["OrderStatusHistory"]] = relationship(
-        "OrderStatusHistory", back_populates="order", cascade="all, delete-orphan", lazy="selectin"
+        "OrderStatusHistory", back_populates="order", cascade="all, delete-orphan", lazy="raise"
     )
 
     custom_invoice: Mapped[Optional["CustomInvoice"]] = relationship(
-        "CustomInvoice", back_populates="order", cascade="all, delete-orphan", uselist=False, lazy="selectin"
+        "CustomInvoice", back_populates="order", cascade="all, delete-orphan", uselist=False, lazy="raise"
     )
 
     auction_invoice: Mapped[Optional["AuctionInvoice"]] = relationship(
-        "AuctionInvoice", back_populates="order", cascade="all, delete-orphan", uselist=False, lazy="selectin"
+        "AuctionInvoice", back_populates="order", cascade="all, delete-orphan", uselist=False, lazy="raise"
     )
+
+
+# Listing sort orders: per-user (also serves plain user_uuid filters) and all orders
+Index("ix_order_user_uuid_order_date", Order.user_uuid, Order.order_date.desc(), Order.id.desc())
+Index("ix_order_order_date_id", Order.order_date.desc(), Order.id.desc())
+
+# Trigram indexes backing order search (PostgreSQL only, see app/database/crud/order_search.py)
+Index(
+    "ix_order_vin_trgm",
+    Order.vin,
+    postgresql_using="gin",
+    postgresql_ops={"vin": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_order_vehicle_name_trgm",
+    Order.vehicle_name,
+    postgresql_using="gin",
+    postgresql_ops={"vehicle_name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_order_lot_id_text_trgm",
+    cast(Order.lot_id, String).label("lot_id_text"),
+    postgresql_using="gin",
+    postgresql_ops={"lot_id_text": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
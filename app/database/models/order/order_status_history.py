@@ -15,7 +15,7 @@ if TYPE_CHECKING:
 class OrderStatusHistory(IdMixin, Base):
     __tablename__ = "order_status_history"
 
-    order_id: Mapped[int] = mapped_column(ForeignKey("order.id"), nullable=False)
+    order_id: Mapped[int] = mapped_column(ForeignKey("order.id"), nullable=False, index=True)
     status: Mapped[OrderStatusEnum] = mapped_column(Enum(OrderStatusEnum), nullable=False)
     changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False)
 
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .mixins import IdMixin, _utcnow
+
+
+class OutboxEvent(IdMixin, Base):
+    """Event written in the same transaction as the change it describes, published later by the relay."""
+
+    __tablename__ = "outbox_event"
+
+    # No foreign key: pending events must survive the order being deleted
+    order_id: Mapped[int] = mapped_column(nullable=False, index=True)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, nullable=False)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, nullable=False)
+    published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(nullable=True, default=None)
+    # Set once ``OUTBOX_MAX_ATTEMPTS`` is used up; parked events are never retried by the relay
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
+
+    __table_args__ = (
+        Index(
+            "ix_outbox_event_pending",
+            "id",
+            postgresql_where=published_at.is_(None) & failed_at.is_(None),
+            sqlite_where=published_at.is_(None) & failed_at.is_(None),
+        ),
+    )
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .mixins import _utcnow
+
+
+class ProcessedMessage(Base):
+    """Ledger of consumed messages whose side effects were committed."""
+
+    __tablename__ = "processed_message"
+
+    message_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    routing_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    processed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utcnow, nullable=False, index=True
+    )
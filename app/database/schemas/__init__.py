@@ -3,3 +3,5 @@ from .custom_invoice import CustomInvoiceCreate, CustomInvoiceRead, CustomInvoic
 from .invoice_items import InvoiceItemCreate, InvoiceItemRead, InvoiceItemUpdate
 from .order import OrderCreate, OrderRead, OrderUpdate
 from .order_status_history import OrderStatusHistoryCreate, OrderStatusHistoryRead, OrderStatusHistoryUpdate
+from .outbox import OutboxEventCreate, OutboxEventUpdate
+from .processed_message import ProcessedMessageCreate, ProcessedMessageUpdate
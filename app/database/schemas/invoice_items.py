@@ -5,6 +5,7 @@ class InvoiceItemBase(BaseModel):
     name: str = Field(..., min_length=1, description="Service/line item name")
     amount: int = Field(..., ge=0, description="Line cost in the invoice currency")
     is_extra_fee: bool = Field(default=False, description="Marks the line as an extra fee")
+    is_calculated: bool = Field(default=False, description="Line was priced by the calculator")
     order_id: int = Field(..., description="Order ID the item belongs to")
 
 
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from app.enums.outbox import OutboxEventType
+
+
+class OutboxEventCreate(BaseModel):
+    order_id: int = Field(..., description="Order the event belongs to; events of one order are published in order")
+    event_type: OutboxEventType = Field(..., description="Event type, selects the relay handler")
+    payload: dict[str, Any] = Field(..., description="Snapshot the relay builds messages from")
+
+
+class OutboxEventUpdate(BaseModel):
+    available_at: datetime | None = None
+    published_at: datetime | None = None
+    attempts: int | None = None
+    last_error: str | None = None
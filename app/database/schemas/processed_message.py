@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class ProcessedMessageCreate(BaseModel):
+    message_key: str = Field(..., max_length=255, description="Routing key plus message id / correlation id")
+    routing_key: str = Field(..., max_length=255, description="Routing key the message was published with")
+
+
+class ProcessedMessageUpdate(BaseModel):
+    processed_at: datetime | None = None
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class BackgroundRunStatus(str, Enum):
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
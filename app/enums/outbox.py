@@ -0,0 +1,5 @@
+from enum import Enum
+
+
+class OutboxEventType(str, Enum):
+    ORDER_STATUS_CHANGED = 'order_status_changed'
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
-from app.routers.private.v1 import orders
+from app.routers.private.v1 import dead_letters, diagnostics, orders
 
 router = APIRouter(prefix="/v1")
 router.include_router(orders.order_router)
+router.include_router(diagnostics.diagnostics_router)
+router.include_router(dead_letters.dead_letters_router)
 
 __all__ = ["router"]
@@ -10,7 +10,7 @@ from app.database.schemas import OrderRead, OrderUpdate
 from app.enums.order import OrderStatusEnum
 from app.schemas.destination import DestinationOut
 from app.services.create_order_from_lot import GenerateFromLot
-from app.services.send_notification import send_status_change_notifications
+from app.services.send_notification import enqueue_status_change_notifications
 
 choose_destination_router = APIRouter()
 
@@ -49,6 +49,16 @@ async def choose_destination(
     previous_status = order.delivery_status
     previous_destination_id = order.destination_id
 
+    if not previous_destination_id:
+        enqueue_status_change_notifications(
+            db,
+            order,
+            previous_status,
+            OrderStatusEnum.PORT_CHOSEN,
+            user_uuid=user.uuid,
+            is_telegram=True,
+        )
+
     updated_order = await order_service.update(
         order_id,
         OrderUpdate(
@@ -67,13 +77,6 @@ async def choose_destination(
 
         await order_service.create_invoice_items_batch(order_id, invoice_items)
 
-        await send_status_change_notifications(
-            updated_order,
-            previous_status,
-            user_uuid=user.uuid,
-            is_telegram=True,
-        )
-
     return updated_order
 
 
@@ -1,4 +1,3 @@
-import grpc
 import grpc.aio
 from AuthTools import HeaderUser
 from AuthTools.Permissions.dependencies import require_permissions, require_one_of_permissions
@@ -16,6 +15,7 @@ from app.routers.private.v1.status.get_order_mixin import get_order_with_check
 from app.rpc_client.files import FilesRpcClient
 from app.rpc_client.gen.python.files.v1.files_pb2 import FileVisibility, FileKind
 from app.schemas.custom_invoice import PresignedUploadResponse, DownloadUrlResponse
+from app.services.download_urls import DownloadUrlNotFoundError, download_url_resolver
 
 
 async def _get_order_and_invoice(
@@ -128,11 +128,10 @@ async def get_custom_invoice(
             raise BadRequestProblem(detail="Custom invoice is not available yet")
 
     try:
-        async with FilesRpcClient() as client:
-            download = await client.get_download_url(file_id=custom_invoice.file_id)
+        download = await download_url_resolver.get(custom_invoice.file_id)
+    except DownloadUrlNotFoundError:
+        raise NotFoundProblem(detail="Invoice file not found")
     except grpc.aio.AioRpcError as e:
-        if e.code() == grpc.StatusCode.NOT_FOUND:
-            raise NotFoundProblem(detail="Invoice file not found")
         raise BadRequestProblem(detail=e.details())
 
     return DownloadUrlResponse(
@@ -0,0 +1,50 @@
+from AuthTools.Permissions.dependencies import require_permissions
+from fastapi import APIRouter, Body, Depends, Query, Request
+
+from app.config import Permissions
+from app.core.problems import ServiceUnavailableProblem
+from app.schemas.dead_letters import DeadLetterReplayIn, DeadLetterReplayOut, DeadLettersOut
+from app.services.rabbit_service.dead_letters import DeadLetterQueue
+
+dead_letters_router = APIRouter(prefix="/dead-letters", tags=["Dead letters"])
+
+
+def get_dead_letter_queue(request: Request) -> DeadLetterQueue:
+    consumer = getattr(request.app.state, "order_consumer", None)
+    if consumer is None:
+        raise ServiceUnavailableProblem(detail="RabbitMQ consumer is not running")
+    return consumer.dead_letters
+
+
+@dead_letters_router.get(
+    "",
+    response_model=DeadLettersOut,
+    description=(
+        f"Inspect messages that exhausted their retries (left in the queue), "
+        f"required permissions: {Permissions.ORDER_ALL_READ.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_READ))],
+)
+async def get_dead_letters(
+    limit: int = Query(50, ge=1, le=500),
+    dead_letter_queue: DeadLetterQueue = Depends(get_dead_letter_queue),
+):
+    total, items = await dead_letter_queue.peek(limit)
+    return DeadLettersOut(total=total, items=items)
+
+
+@dead_letters_router.post(
+    "/replay",
+    response_model=DeadLetterReplayOut,
+    description=(
+        f"Send dead letters back to the consumer queue with a fresh retry budget, "
+        f"required permissions: {Permissions.ORDER_ALL_WRITE.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_WRITE))],
+)
+async def replay_dead_letters(
+    data: DeadLetterReplayIn = Body(...),
+    dead_letter_queue: DeadLetterQueue = Depends(get_dead_letter_queue),
+):
+    replayed, skipped = await dead_letter_queue.replay(data.limit, routing_key=data.routing_key)
+    return DeadLetterReplayOut(replayed=replayed, skipped=skipped)
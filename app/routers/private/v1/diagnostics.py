@@ -0,0 +1,56 @@
+from AuthTools.Permissions.dependencies import require_permissions
+from fastapi import APIRouter, Depends
+
+from app.config import Permissions
+from app.core.cache import get_cache_stats
+from app.rpc_client.circuit_breaker import get_circuit_breaker_stats
+from app.services.invoice_generator.pdf_cache import invoice_pdf_cache
+from app.services.invoice_generator.render_pool import invoice_render_pool
+from app.services.rabbit_service.metrics import get_consumer_stats
+
+diagnostics_router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@diagnostics_router.get(
+    "/caches",
+    description=f"Hit/miss counters and sizes of in-process caches, required permissions: {Permissions.ORDER_ALL_READ.value}",
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_READ))],
+)
+async def get_caches():
+    return get_cache_stats()
+
+
+@diagnostics_router.get(
+    "/consumers",
+    description=(
+        f"Per routing key throughput, processing time and lag of RabbitMQ consumers, "
+        f"required permissions: {Permissions.ORDER_ALL_READ.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_READ))],
+)
+async def get_consumers():
+    return get_consumer_stats()
+
+
+@diagnostics_router.get(
+    "/invoice-rendering",
+    description=(
+        f"Invoice render pool load and generated PDF cache hit rates, "
+        f"required permissions: {Permissions.ORDER_ALL_READ.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_READ))],
+)
+async def get_invoice_rendering():
+    return {"pool": invoice_render_pool.stats(), "pdf_cache": invoice_pdf_cache.stats()}
+
+
+@diagnostics_router.get(
+    "/rpc-breakers",
+    description=(
+        f"Circuit breaker state and recent failure rate of each RPC target, "
+        f"required permissions: {Permissions.ORDER_ALL_READ.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_READ))],
+)
+async def get_rpc_breakers():
+    return get_circuit_breaker_stats()
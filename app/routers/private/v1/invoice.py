@@ -1,52 +1,34 @@
-from io import BytesIO
-
-import grpc
 import grpc.aio
 from AuthTools import HeaderUser
 from AuthTools.Permissions.dependencies import require_one_of_permissions
-from fastapi import APIRouter, Depends
-from fastapi.responses import RedirectResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import RedirectResponse, Response
 from rfc9457 import ForbiddenProblem, NotFoundProblem, BadRequestProblem
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import Permissions
 from app.core.logger import logger
+from app.core.problems import ServiceUnavailableProblem
 from app.core.utils import uses_legacy_generated_invoice
 from app.database.crud import AuctionInvoiceService, OrderService
 from app.database.db.session import get_async_db
 from app.database.models import Order
 from app.enums.custom_invoice_status import FileInvoiceStatus
 from app.enums.order import OrderStatusEnum
-from app.rpc_client.auth import AuthRpcClient
-from app.rpc_client.calculator import DetailedInfoService
-from app.rpc_client.files import FilesRpcClient
-from app.services.invoice_generator.generator import InvoiceGenerator
+from app.services.download_urls import DownloadUrlNotFoundError, download_url_resolver
+from app.services.invoice_generator.pdf_cache import invoice_pdf_cache
+from app.services.invoice_generator.prefetch import prefetch_invoice_input
+from app.services.invoice_generator.render_pool import InvoiceRenderUnavailableError, invoice_render_pool
 
 
 invoice_router = APIRouter(prefix="/{order_id}/invoice", tags=["Invoice"])
 
 
-async def _get_usd_to_eur_rate(order: Order) -> float | None:
-    try:
-        async with DetailedInfoService() as calculator_client:
-            rate = await calculator_client.get_rate()
-    except grpc.aio.AioRpcError:
-        logger.warning(
-            "Calculator RPC failed while fetching USD/EUR rate",
-            extra={"order_id": order.id},
-        )
-        return None
-    if rate:
-        logger.info(
-            "USD/EUR rate resolved for invoice",
-            extra={"order_id": order.id, "usd_to_eur_rate": rate},
-        )
-    else:
-        logger.warning(
-            "USD/EUR rate not available for invoice",
-            extra={"order_id": order.id},
-        )
-    return rate
+def _etag_matches(if_none_match: str | None, cache_key: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")}
+    return "*" in candidates or cache_key in candidates
 
 
 @invoice_router.get(
@@ -59,6 +41,7 @@ async def _get_usd_to_eur_rate(order: Order) -> float | None:
 )
 async def get_invoice(
     order_id: int,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_async_db),
     user: HeaderUser = Depends(require_one_of_permissions(Permissions.ORDER_OWN_READ, Permissions.ORDER_ALL_READ)),
 ):
@@ -67,7 +50,7 @@ async def get_invoice(
         extra={"order_id": order_id, "user_uuid": user.uuid},
     )
     order_service = OrderService(db)
-    order = await order_service.get(order_id)
+    order = await order_service.get_with_relationships(order_id, Order.invoice_items)
     if not order:
         raise NotFoundProblem(detail="Order not found")
 
@@ -98,32 +81,35 @@ async def get_invoice(
 
     if auction_invoice and auction_invoice.status == FileInvoiceStatus.AVAILABLE:
         try:
-            async with FilesRpcClient() as client:
-                download = await client.get_download_url(file_id=auction_invoice.file_id)
+            download = await download_url_resolver.get(auction_invoice.file_id)
+        except DownloadUrlNotFoundError:
+            raise NotFoundProblem(detail="Invoice file not found")
         except grpc.aio.AioRpcError as e:
-            if e.code() == grpc.StatusCode.NOT_FOUND:
-                raise NotFoundProblem(detail="Invoice file not found")
             raise BadRequestProblem(detail=e.details())
         return RedirectResponse(url=download.download_url)
 
     if not uses_legacy_generated_invoice(order.delivery_status, auction_invoice is not None):
         raise BadRequestProblem(detail="Upload auction invoice to make it available")
 
-    auth_user = None
+    invoice_input = await prefetch_invoice_input(order)
+    cache_key = invoice_input.cache_key()
+    headers = {
+        "ETag": f'"{cache_key}"',
+        # Clients keep the PDF but revalidate, so a changed order is never served stale
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f'attachment; filename=\"invoice_{order.vin}.pdf\"',
+    }
+    if _etag_matches(if_none_match, cache_key):
+        return Response(status_code=304, headers={"ETag": headers["ETag"], "Cache-Control": headers["Cache-Control"]})
+
+    cached = await invoice_pdf_cache.get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/pdf", headers=headers)
+
     try:
-        async with AuthRpcClient() as auth_client:
-            auth_user = await auth_client.get_user(user_uuid=order.user_uuid)
-    except grpc.aio.AioRpcError:
-        # Ignore RPC failures to avoid blocking invoice generation
-        pass
-
-    usd_to_eur_rate = await _get_usd_to_eur_rate(order)
-    generator = InvoiceGenerator(order, user=auth_user, usd_to_eur_rate=usd_to_eur_rate)
-    pdf_bytes = generator.generate_invoice_based_on_invoice_type()
-
-    filename = f"invoice_{order.vin}.pdf"
-    return StreamingResponse(
-        BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename=\"{filename}\"'},
-    )
+        pdf_bytes = await invoice_render_pool.render(invoice_input)
+    except InvoiceRenderUnavailableError:
+        raise ServiceUnavailableProblem(detail="Invoice rendering is busy, please retry shortly")
+    await invoice_pdf_cache.put(order.id, cache_key, pdf_bytes)
+
+    return Response(pdf_bytes, media_type="application/pdf", headers=headers)
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from AuthTools.Permissions.dependencies import require_permissions
+from fastapi import APIRouter, Body, Depends
+from fastapi.responses import StreamingResponse
+
+from app.config import Permissions
+from app.schemas.invoice_export import InvoiceExportFilterIn
+from app.services.invoice_export import InvoiceExport
+
+invoice_export_router = APIRouter(tags=["Invoice export"])
+
+
+@invoice_export_router.post(
+    "/invoice-export",
+    response_class=StreamingResponse,
+    description=(
+        "Stream a ZIP with the invoices (uploaded auction invoice or legacy generated PDF) of all orders "
+        f"matching the filter, plus a manifest.csv, required permissions: {Permissions.ORDER_ALL_READ.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_READ))],
+)
+async def export_invoices(data: InvoiceExportFilterIn = Body(...)):
+    filename = f"invoices_{datetime.now(timezone.utc):%Y%m%d_%H%M%S}.zip"
+    return StreamingResponse(
+        InvoiceExport(data).stream(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
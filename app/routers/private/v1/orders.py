@@ -1,3 +1,5 @@
+from enum import Enum
+
 import grpc.aio
 from AuthTools import HeaderUser
 from AuthTools.Permissions.dependencies import require_permissions
@@ -10,13 +12,15 @@ from sqlalchemy.exc import IntegrityError
 from fastapi_pagination.ext.sqlalchemy import paginate
 from app.config import Permissions
 from app.core.logger import logger
+from app.core.cursor_pagination import CursorPage, CursorParams, get_cursor_params, paginate_by_cursor
 from app.core.utils import get_cheapest_terminal_prices, create_pagination_page
 from app.database.crud import OrderService
 from app.database.db.session import get_async_db
+from app.database.models import Order
 from app.database.schemas import OrderCreate, OrderRead, InvoiceItemCreate, OrderUpdate
-from app.routers.private.v1 import choose_destination, custom_invoice, auction_invoice, invoice_items, invoice, status
-from app.services.user_info import fetch_user_identity
-from app.rpc_client.calculator import CalculatorRpcClient, DetailedInfoService
+from app.routers.private.v1 import choose_destination, custom_invoice, auction_invoice, invoice_items, invoice, status, requote, invoice_export, user_identity_refresh
+from app.services.order_lookups import fetch_order_lookups
+from app.rpc_client.calculator import CalculatorRpcClient
 from app.schemas.order import OrderIn
 
 
@@ -27,6 +31,9 @@ order_router.include_router(auction_invoice.auction_invoice_router)
 order_router.include_router(invoice_items.invoice_items_router)
 order_router.include_router(invoice.invoice_router)
 order_router.include_router(status.status_router)
+order_router.include_router(requote.requote_router)
+order_router.include_router(invoice_export.invoice_export_router)
+order_router.include_router(user_identity_refresh.user_identity_refresh_router)
 
 
 
@@ -42,40 +49,18 @@ async def create_order(data: OrderIn = Body(...), db: AsyncSession = Depends(get
     if await order_service.exists_by_vin(data.vin):
         raise BadRequestProblem("Order with this VIN already exists")
 
-    try:
-        user_identity = await fetch_user_identity(data.user_uuid)
-    except grpc.aio.AioRpcError as e:
-        logger.error(
-            "Auth service failed while validating user for order creation",
-            extra={
-                "user_uuid": data.user_uuid,
-                "status_code": e.code().name if e.code() else None,
-                "details": e.details(),
-            },
-        )
-        if e.code() == grpc.StatusCode.NOT_FOUND:
-            raise NotFoundProblem(e.details())
-        raise BadRequestProblem(e.details())
-
-    try:
-        async with DetailedInfoService() as detailed_info_service:
-            location_data = await detailed_info_service.get_detailed_location(location_id=data.location_id)
-            fee_type_data = await detailed_info_service.get_detailed_fee_type(fee_type_id=data.fee_type_id)
-            destination_data = await detailed_info_service.get_detailed_destination(destination_id=data.destination_id)
-    except grpc.aio.AioRpcError as e:
-        logger.error(
-            "Detailed info service failed during order creation",
-            extra={
-                "location_id": data.location_id,
-                "fee_type_id": data.fee_type_id,
-                "destination_id": data.destination_id,
-                "status_code": e.code().name if e.code() else None,
-                "details": e.details(),
-            },
-        )
-        if e.code() == grpc.StatusCode.NOT_FOUND:
-            raise NotFoundProblem(e.details())
-        raise BadRequestProblem(e.details())
+    lookups = await fetch_order_lookups(
+        user_uuid=data.user_uuid,
+        location_id=data.location_id,
+        fee_type_id=data.fee_type_id,
+        destination_id=data.destination_id,
+        log_context={"operation": "create_order", "lot_id": data.lot_id},
+    )
+    user_identity = lookups.user_identity
+    location_data = lookups.location
+    fee_type_data = lookups.fee_type
+    destination_data = lookups.destination
+    requested_destination_name = destination_data.name if destination_data is not None else None
 
     async with CalculatorRpcClient() as calculator_client:
         try:
@@ -85,7 +70,7 @@ async def create_order(data: OrderIn = Body(...), db: AsyncSession = Depends(get
                 vehicle_type=data.vehicle_type,
                 location=location_data.name,
                 fee_type=fee_type_data.fee_type,
-                destination=destination_data.name,
+                destination=requested_destination_name,
             )
         except grpc.aio.AioRpcError as e:
             logger.error(
@@ -93,7 +78,7 @@ async def create_order(data: OrderIn = Body(...), db: AsyncSession = Depends(get
                 extra={
                     "location": location_data.name,
                     "fee_type": fee_type_data.fee_type,
-                    "destination": destination_data.name,
+                    "destination": requested_destination_name,
                     "status_code": e.code().name if e.code() else None,
                     "details": e.details(),
                 },
@@ -119,7 +104,7 @@ async def create_order(data: OrderIn = Body(...), db: AsyncSession = Depends(get
             for destination in detailed_data.available_destinations
             if destination.destination_id == data.destination_id
         ),
-        destination_data.name,
+        requested_destination_name,
     )
 
 
@@ -146,11 +131,14 @@ async def create_order(data: OrderIn = Body(...), db: AsyncSession = Depends(get
                 name=f'{data.vehicle_name} ({data.vin})',
                 amount=data.vehicle_value,
                 order_id=order.id,
+                is_calculated=True,
+            ),
+            InvoiceItemCreate(
+                name='Broker Fee', amount=default_calculator.broker_fee, order_id=order.id, is_calculated=True,
             ),
-            InvoiceItemCreate(name='Broker Fee', amount=default_calculator.broker_fee, order_id=order.id),
         ]
         items.extend(
-            InvoiceItemCreate(name=fee.name, amount=fee.price, order_id=order.id)
+            InvoiceItemCreate(name=fee.name, amount=fee.price, order_id=order.id, is_calculated=True)
             for fee in default_calculator.additional.fees
             if fee.price
         )
@@ -164,6 +152,7 @@ async def create_order(data: OrderIn = Body(...), db: AsyncSession = Depends(get
                     name=f"Transportation ({terminal_name})",
                     amount=transportation_city.price,
                     order_id=order.id,
+                    is_calculated=True,
                 )
             )
             items.append(
@@ -171,6 +160,7 @@ async def create_order(data: OrderIn = Body(...), db: AsyncSession = Depends(get
                     name=f"Ocean Shipping ({terminal_name})",
                     amount=ocean_city.price,
                     order_id=order.id,
+                    is_calculated=True,
                 )
             )
 
@@ -211,53 +201,30 @@ async def update_order(
         if await order_service.exists_by_vin(update_data["vin"]):
             raise BadRequestProblem("Order with this VIN already exists")
 
-    if "user_uuid" in update_data and update_data["user_uuid"] != order.user_uuid:
-        try:
-            user_identity = await fetch_user_identity(update_data["user_uuid"])
-            update_data.update(
-                user_name=user_identity["user_name"],
-                user_email=user_identity["user_email"],
-            )
-        except grpc.aio.AioRpcError as e:
-            logger.error(
-                "Auth service failed while updating user for order",
-                extra={
-                    "order_id": order_id,
-                    "user_uuid": update_data["user_uuid"],
-                    "status_code": e.code().name if e.code() else None,
-                    "details": e.details(),
-                },
-            )
-            if e.code() == grpc.StatusCode.NOT_FOUND:
-                raise NotFoundProblem(e.details())
-            raise BadRequestProblem(e.details())
-
+    should_refresh_user = "user_uuid" in update_data and update_data["user_uuid"] != order.user_uuid
     should_refresh_calculator_fields = any(
         field in update_data for field in ("location_id", "fee_type_id", "vehicle_value", "auction", "vehicle_type")
     )
+    lookups = await fetch_order_lookups(
+        user_uuid=update_data["user_uuid"] if should_refresh_user else None,
+        location_id=update_data.get("location_id", order.location_id) if should_refresh_calculator_fields else None,
+        fee_type_id=update_data.get("fee_type_id", order.fee_type_id) if should_refresh_calculator_fields else None,
+        destination_id=update_data.get("destination_id"),
+        terminal_id=update_data.get("terminal_id"),
+        log_context={"operation": "update_order", "order_id": order_id},
+    )
+
+    if lookups.user_identity is not None:
+        update_data.update(
+            user_name=lookups.user_identity["user_name"],
+            user_email=lookups.user_identity["user_email"],
+        )
+
     calculator_data = None
     terminal_name = None
     if should_refresh_calculator_fields:
-        location_id = update_data.get("location_id", order.location_id)
-        fee_type_id = update_data.get("fee_type_id", order.fee_type_id)
-        try:
-            async with DetailedInfoService() as detailed_info_service:
-                location_data = await detailed_info_service.get_detailed_location(location_id=location_id)
-                fee_type_data = await detailed_info_service.get_detailed_fee_type(fee_type_id=fee_type_id)
-        except grpc.aio.AioRpcError as e:
-            logger.error(
-                "Detailed info service failed during order update",
-                extra={
-                    "order_id": order_id,
-                    "location_id": location_id,
-                    "fee_type_id": fee_type_id,
-                    "status_code": e.code().name if e.code() else None,
-                    "details": e.details(),
-                },
-            )
-            if e.code() == grpc.StatusCode.NOT_FOUND:
-                raise NotFoundProblem(e.details())
-            raise BadRequestProblem(e.details())
+        location_data = lookups.location
+        fee_type_data = lookups.fee_type
 
         async with CalculatorRpcClient() as calculator_client:
             try:
@@ -308,45 +275,11 @@ async def update_order(
         if terminal_name_from_calc:
             update_data["terminal_name"] = terminal_name_from_calc
 
-    if "destination_id" in update_data:
-        try:
-            async with DetailedInfoService() as detailed_info_service:
-                destination_data = await detailed_info_service.get_detailed_destination(
-                    destination_id=update_data["destination_id"]
-                )
-            update_data["destination_name"] = destination_data.name
-        except grpc.aio.AioRpcError as e:
-            logger.error(
-                "Detailed info service failed while updating destination",
-                extra={
-                    "order_id": order_id,
-                    "destination_id": update_data["destination_id"],
-                    "status_code": e.code().name if e.code() else None,
-                    "details": e.details(),
-                },
-            )
-            if e.code() == grpc.StatusCode.NOT_FOUND:
-                raise NotFoundProblem("Destination not found")
-            raise BadRequestProblem(e.details())
+    if lookups.destination is not None:
+        update_data["destination_name"] = lookups.destination.name
 
-    if "terminal_id" in update_data:
-        try:
-            async with DetailedInfoService() as detailed_info_service:
-                terminal_data = await detailed_info_service.get_detailed_terminal(terminal_id=update_data["terminal_id"])
-            terminal_name = terminal_data.name
-        except grpc.aio.AioRpcError as e:
-            logger.error(
-                "Detailed info service failed while updating terminal",
-                extra={
-                    "order_id": order_id,
-                    "terminal_id": update_data["terminal_id"],
-                    "status_code": e.code().name if e.code() else None,
-                    "details": e.details(),
-                },
-            )
-            if e.code() == grpc.StatusCode.NOT_FOUND:
-                raise NotFoundProblem("Terminal not found")
-            raise BadRequestProblem(e.details())
+    if lookups.terminal is not None:
+        terminal_name = lookups.terminal.name
 
     if terminal_name:
         update_data["terminal_name"] = terminal_name
@@ -367,11 +300,35 @@ async def update_order(
 
 
 OrdersPage = create_pagination_page(OrderRead)
+OrdersCursorPage = CursorPage[OrderRead]
 
 class OrderSearch(BaseModel):
     search: str | None = None
 
 
+class OrderCursorSort(str, Enum):
+    ORDER_DATE = "order_date"
+    ID = "id"
+
+
+_CURSOR_SORT_COLUMNS = {
+    OrderCursorSort.ORDER_DATE: (Order.order_date, Order.id),
+    OrderCursorSort.ID: (Order.id,),
+}
+
+
+async def _paginate_orders_by_cursor(
+    db: AsyncSession,
+    search: str | None,
+    params: CursorParams,
+    sort: OrderCursorSort,
+    user_uuid: str | None = None,
+) -> CursorPage:
+    order_service = OrderService(db)
+    stmt = await order_service.get_all_with_search(search, user_uuid=user_uuid, as_rows=True)
+    return await paginate_by_cursor(db, stmt, params, sort.value, _CURSOR_SORT_COLUMNS[sort])
+
+
 @order_router.get(
     "/my",
     response_model=OrdersPage,
@@ -383,7 +340,7 @@ async def get_user_orders(
     db: AsyncSession = Depends(get_async_db),
 ):
     order_service = OrderService(db)
-    stmt = await order_service.get_all_with_search(data.search, user_uuid=user.uuid)
+    stmt = await order_service.get_all_with_search(data.search, user_uuid=user.uuid, as_rows=True)
     return await paginate(db, stmt)
 
 
@@ -399,7 +356,7 @@ async def get_orders_for_user(
     db: AsyncSession = Depends(get_async_db),
 ):
     order_service = OrderService(db)
-    stmt = await order_service.get_all_with_search(data.search, user_uuid=user_uuid)
+    stmt = await order_service.get_all_with_search(data.search, user_uuid=user_uuid, as_rows=True)
     return await paginate(db, stmt)
 
 
@@ -411,10 +368,65 @@ async def get_orders_for_user(
 )
 async def get_orders(data: OrderSearch = Depends(), db: AsyncSession = Depends(get_async_db)):
     order_service = OrderService(db)
-    smtp = await order_service.get_all_with_search(data.search)
+    smtp = await order_service.get_all_with_search(data.search, as_rows=True)
     return await paginate(db, smtp)
 
 
+@order_router.get(
+    "/my/cursor",
+    response_model=OrdersCursorPage,
+    description=(
+        f"Get user's own orders with cursor pagination (newest first), "
+        f"required permissions: {Permissions.ORDER_OWN_READ.value}"
+    ),
+)
+async def get_user_orders_by_cursor(
+    data: OrderSearch = Depends(),
+    params: CursorParams = Depends(get_cursor_params),
+    sort: OrderCursorSort = Query(OrderCursorSort.ORDER_DATE),
+    user: HeaderUser = Depends(require_permissions(Permissions.ORDER_OWN_READ)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _paginate_orders_by_cursor(db, data.search, params, sort, user_uuid=user.uuid)
+
+
+@order_router.get(
+    "/for-user/cursor",
+    response_model=OrdersCursorPage,
+    description=(
+        f"Get orders for user with cursor pagination (newest first), "
+        f"required permissions: {Permissions.ORDER_ALL_READ.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_READ))],
+)
+async def get_orders_for_user_by_cursor(
+    user_uuid: str = Query(...),
+    data: OrderSearch = Depends(),
+    params: CursorParams = Depends(get_cursor_params),
+    sort: OrderCursorSort = Query(OrderCursorSort.ORDER_DATE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _paginate_orders_by_cursor(db, data.search, params, sort, user_uuid=user_uuid)
+
+
+@order_router.get(
+    "/cursor",
+    response_model=OrdersCursorPage,
+    description=(
+        f"Get all orders with cursor pagination (newest first), "
+        f"required permissions: {Permissions.ORDER_ALL_READ.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_READ))],
+)
+async def get_orders_by_cursor(
+    data: OrderSearch = Depends(),
+    params: CursorParams = Depends(get_cursor_params),
+    sort: OrderCursorSort = Query(OrderCursorSort.ORDER_DATE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _paginate_orders_by_cursor(db, data.search, params, sort)
+
+
 @order_router.get(
     "/{order_id}",
     response_model=OrderRead,
@@ -0,0 +1,40 @@
+from AuthTools.Permissions.dependencies import require_permissions
+from fastapi import APIRouter, Body, Depends
+from rfc9457 import NotFoundProblem
+
+from app.config import Permissions
+from app.schemas.requote import RequoteFilterIn, RequoteRunOut
+from app.services.requote_orders import requote_runs
+
+requote_router = APIRouter(tags=["Requote"])
+
+
+@requote_router.post(
+    "/requote",
+    response_model=RequoteRunOut,
+    status_code=202,
+    description=(
+        "Start re-quoting orders still in won/port_chosen status with batched calculator requests "
+        "and refreshing their invoice items; returns the run to poll, "
+        f"required permissions: {Permissions.ORDER_ALL_WRITE.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_WRITE))],
+)
+async def requote_orders(data: RequoteFilterIn = Body(...)):
+    return requote_runs.start(data)
+
+
+@requote_router.get(
+    "/requote/{run_id}",
+    response_model=RequoteRunOut,
+    description=(
+        "Status and progress of a re-quote started on this instance, "
+        f"required permissions: {Permissions.ORDER_ALL_WRITE.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_WRITE))],
+)
+async def get_requote(run_id: str):
+    run = requote_runs.get(run_id)
+    if run is None:
+        raise NotFoundProblem(detail="Re-quote run not found")
+    return run
@@ -10,7 +10,7 @@ from app.database.schemas import OrderRead, OrderUpdate
 from app.enums.custom_invoice_status import FileInvoiceStatus
 from app.enums.order import OrderStatusEnum
 from app.routers.private.v1.status.get_order_mixin import get_order_with_check
-from app.services.send_notification import send_status_change_notifications
+from app.services.send_notification import enqueue_status_change_notifications
 
 auction_invoice_added_router = APIRouter(
     prefix="/{order_id}/auction-invoice",
@@ -44,11 +44,12 @@ async def set_auction_invoice_added(
         raise BadRequestProblem(detail="Auction invoice file is not uploaded yet")
 
     previous_status = order.delivery_status
+    enqueue_status_change_notifications(
+        db, order, previous_status, OrderStatusEnum.INVOICE_ADDED, order.user_uuid
+    )
     updated_order = await order_service.update(
         order_id,
         OrderUpdate(delivery_status=OrderStatusEnum.INVOICE_ADDED),
     )
 
-    await send_status_change_notifications(updated_order, previous_status, order.user_uuid)
-
     return updated_order
@@ -12,7 +12,7 @@ from app.enums.custom_invoice_status import FileInvoiceStatus
 from app.enums.order import OrderStatusEnum
 from app.routers.private.v1.status.get_order_mixin import get_order_with_check
 from app.rpc_client.auth import AuthRpcClient
-from app.services.send_notification import send_status_change_notifications
+from app.services.send_notification import enqueue_status_change_notifications
 
 custom_invoice_added_router = APIRouter(
     prefix="/{order_id}/custom-invoice-added",
@@ -43,11 +43,12 @@ async def set_custom_invoice_added(
         raise BadRequestProblem(detail="Custom invoice file is not uploaded yet")
 
     previous_status = order.delivery_status
+    enqueue_status_change_notifications(
+        db, order, previous_status, OrderStatusEnum.CUSTOM_INVOICE_ADDED, order.user_uuid
+    )
     updated_order = await order_service.update(
         order_id,
         OrderUpdate(delivery_status=OrderStatusEnum.CUSTOM_INVOICE_ADDED),
     )
 
-    await send_status_change_notifications(updated_order, previous_status, order.user_uuid)
-
     return updated_order
@@ -4,7 +4,7 @@ from app.database.crud import OrderService
 from app.database.models import Order
 from app.database.schemas import OrderUpdate
 from app.enums.order import OrderStatusEnum
-from app.services.send_notification import send_status_change_notifications
+from app.services.send_notification import enqueue_status_change_notifications
 
 
 async def get_order_with_check(
@@ -36,8 +36,10 @@ async def update_status_with_notifications(
     order = await get_order_with_check(order_id, order_service, previous_status)
     previous_delivery_status = order.delivery_status
 
+    # Committed together with the status change by order_service.update
+    enqueue_status_change_notifications(
+        order_service.session, order, previous_delivery_status, new_status, order.user_uuid
+    )
     updated_order = await order_service.update(order_id, OrderUpdate(delivery_status=new_status))
 
-    await send_status_change_notifications(updated_order, previous_delivery_status, order.user_uuid)
-
     return updated_order
@@ -10,7 +10,7 @@ from app.database.db.session import get_async_db
 from app.database.schemas import OrderRead, OrderUpdate
 from app.enums.order import OrderStatusEnum
 from app.routers.private.v1.status.get_order_mixin import get_order_with_check
-from app.services.send_notification import send_status_change_notifications
+from app.services.send_notification import enqueue_status_change_notifications
 
 tracking_link_router = APIRouter(
     prefix="/{order_id}/tracking-link",
@@ -40,6 +40,9 @@ async def add_tracking_link(
 
     previous_status = order.delivery_status
 
+    enqueue_status_change_notifications(
+        db, order, previous_status, OrderStatusEnum.TRACKING_ADDED, order.user_uuid
+    )
     updated_order = await order_service.update(
         order_id,
         OrderUpdate(
@@ -48,6 +51,4 @@ async def add_tracking_link(
         ),
     )
 
-    await send_status_change_notifications(updated_order, previous_status, order.user_uuid)
-
     return updated_order
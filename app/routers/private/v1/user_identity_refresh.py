@@ -0,0 +1,40 @@
+from AuthTools.Permissions.dependencies import require_permissions
+from fastapi import APIRouter, Body, Depends
+from rfc9457 import NotFoundProblem
+
+from app.config import Permissions
+from app.schemas.user_identity_refresh import UserIdentityRefreshIn, UserIdentityRefreshRunOut
+from app.services.refresh_user_identities import user_identity_refresh_runs
+
+user_identity_refresh_router = APIRouter(tags=["User identity refresh"])
+
+
+@user_identity_refresh_router.post(
+    "/user-identity-refresh",
+    response_model=UserIdentityRefreshRunOut,
+    status_code=202,
+    description=(
+        "Start re-reading order owners from the auth service in batches and refreshing the cached "
+        "user name/email on their orders; returns the run to poll, "
+        f"required permissions: {Permissions.ORDER_ALL_WRITE.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_WRITE))],
+)
+async def refresh_user_identities(data: UserIdentityRefreshIn = Body(...)):
+    return user_identity_refresh_runs.start(data)
+
+
+@user_identity_refresh_router.get(
+    "/user-identity-refresh/{run_id}",
+    response_model=UserIdentityRefreshRunOut,
+    description=(
+        "Status and progress of a user identity refresh started on this instance, "
+        f"required permissions: {Permissions.ORDER_ALL_WRITE.value}"
+    ),
+    dependencies=[Depends(require_permissions(Permissions.ORDER_ALL_WRITE))],
+)
+async def get_user_identity_refresh(run_id: str):
+    run = user_identity_refresh_runs.get(run_id)
+    if run is None:
+        raise NotFoundProblem(detail="User identity refresh run not found")
+    return run
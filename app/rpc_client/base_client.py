@@ -1,10 +1,35 @@
 import asyncio
+import random
+import time
 from abc import abstractmethod, ABC
 from typing import TypeVar, Generic, Optional, Callable, Any, Dict
 import grpc
 
+from app.config import RpcCallPolicy, settings
+from app.core.logger import logger
+from app.core.metrics import RPC_CALL_SECONDS, RPC_RETRIES
+from app.rpc_client.channel_pool import channel_registry
+from app.rpc_client.circuit_breaker import FAILURE_CODES, CircuitOpenError, get_circuit_breaker
 
 T = TypeVar('T')
+
+
+def method_name(method: Callable) -> str:
+    """``package.Service/Method`` of a stub method."""
+    name = getattr(method, "_method", None)
+    if isinstance(name, bytes):
+        name = name.decode()
+    return name.lstrip("/") if name else getattr(method, "__name__", repr(method))
+
+
+def get_call_policy(name: str) -> RpcCallPolicy:
+    return (
+        settings.RPC_CALL_POLICIES.get(name)
+        or settings.RPC_CALL_POLICIES.get(name.partition("/")[0])
+        or settings.RPC_DEFAULT_CALL_POLICY
+    )
+
+
 class BaseRpcClient(Generic[T], ABC):
     def __init__(
             self,
@@ -18,6 +43,8 @@ class BaseRpcClient(Generic[T], ABC):
         self.timeout = timeout
         self.channel: Optional[grpc.aio.Channel] = None
         self.stub: Optional[T] = None
+        self._owns_channel = False
+        self.breaker = get_circuit_breaker(server_url)
 
         self.channel_options = [
             ('grpc.max_receive_message_length', max_receive_message_length),
@@ -32,11 +59,29 @@ class BaseRpcClient(Generic[T], ABC):
     async def connect(self):
         if self.channel is not None:
             return
+        # Fail fast instead of waiting up to ``timeout`` for a target that is known to be down
+        self.breaker.raise_if_open()
+        try:
+            await self._open_channel()
+        except Exception:
+            self.breaker.record(failed=True)
+            raise
+
+    async def _open_channel(self):
+        if channel_registry.is_running:
+            self.channel = await channel_registry.acquire(
+                self.server_url,
+                self.channel_options,
+                timeout=self.timeout
+            )
+            self.stub = self._create_stub(self.channel)
+            return
         try:
             self.channel = grpc.aio.insecure_channel(
                 self.server_url,
                 options=self.channel_options
             )
+            self._owns_channel = True
             self.stub = self._create_stub(self.channel)
 
             await asyncio.wait_for(
@@ -50,10 +95,13 @@ class BaseRpcClient(Generic[T], ABC):
     async def disconnect(self):
         if self.channel:
             try:
-                await self.channel.close()
+                # Pooled channels belong to the registry and outlive the client
+                if self._owns_channel:
+                    await self.channel.close()
             finally:
                 self.channel = None
                 self.stub = None
+                self._owns_channel = False
 
     async def __aenter__(self):
         await self.connect()
@@ -75,22 +123,112 @@ class BaseRpcClient(Generic[T], ABC):
             metadata: Optional[Dict[str, str]] = None,
             timeout: Optional[float] = None
     ) -> Any:
+        """
+        Call ``method`` under its ``RpcCallPolicy``.
+
+        ``timeout`` overrides the policy deadline. Retryable failures are retried with jittered
+        exponential backoff while attempts and deadline last.
+        """
         self._ensure_connected()
 
         rpc_metadata = []
         if metadata:
             rpc_metadata = [(key, value) for key, value in metadata.items()]
 
-        request_timeout = timeout or self.timeout
+        name = method_name(method)
+        policy = get_call_policy(name)
+        started = time.perf_counter()
+        code = "UNKNOWN"
+        try:
+            response = await self._call_with_policy(method, name, policy, request, rpc_metadata, timeout)
+            code = "OK"
+            return response
+        except grpc.aio.AioRpcError as e:
+            code = e.code().name
+            raise
+        except CircuitOpenError:
+            code = "CIRCUIT_OPEN"
+            raise
+        finally:
+            RPC_CALL_SECONDS.labels(name, code).observe(time.perf_counter() - started)
 
+    async def _call_with_policy(
+            self,
+            method: Callable,
+            name: str,
+            policy: RpcCallPolicy,
+            request: Any,
+            rpc_metadata: list,
+            timeout: Optional[float],
+    ) -> Any:
+        deadline = time.monotonic() + (timeout or policy.deadline_s)
 
-        response = await asyncio.wait_for(
-            method(
-                request,
-                metadata=rpc_metadata,
-                compression=self.compression
-            ),
-            timeout=request_timeout
-        )
+        attempt = 1
+        while True:
+            try:
+                if policy.hedge_after_s is not None and policy.hedge_after_s < deadline - time.monotonic():
+                    return await self._hedged_call(method, request, rpc_metadata, deadline, policy.hedge_after_s)
+                return await self._call(method, request, rpc_metadata, deadline)
+            except grpc.aio.AioRpcError as e:
+                if attempt >= policy.max_attempts or e.code().name not in policy.retryable_codes:
+                    raise
+                delay = random.uniform(0, min(policy.backoff_max_s, policy.backoff_base_s * 2 ** attempt))
+                if time.monotonic() + delay >= deadline:
+                    raise
+                logger.warning(
+                    "RPC call failed, retrying",
+                    extra={"method": name, "attempt": attempt, "status_code": e.code().name, "delay_s": round(delay, 3)},
+                )
+            attempt += 1
+            RPC_RETRIES.labels(name).inc()
+            await asyncio.sleep(delay)
+
+    async def _call(self, method: Callable, request: Any, metadata: list, deadline: float) -> Any:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            raise grpc.aio.AioRpcError(
+                grpc.StatusCode.DEADLINE_EXCEEDED, grpc.aio.Metadata(), grpc.aio.Metadata(), "Deadline exceeded",
+            )
+        probe = self.breaker.before_call()
+        failed = None
+        try:
+            # Passed as the gRPC deadline so the server stops working on calls nobody waits for
+            response = await method(request, metadata=metadata, compression=self.compression, timeout=timeout)
+        except grpc.aio.AioRpcError as e:
+            failed = e.code() in FAILURE_CODES
+            raise
+        except Exception:
+            failed = True
+            raise
+        else:
+            failed = False
+            return response
+        finally:
+            self.breaker.after_call(probe, failed)
 
-        return response
\ No newline at end of file
+    async def _hedged_call(
+            self,
+            method: Callable,
+            request: Any,
+            metadata: list,
+            deadline: float,
+            hedge_after: float,
+    ) -> Any:
+        """First answer of the call and, if it is still running after ``hedge_after``, one identical attempt."""
+        attempts = {asyncio.ensure_future(self._call(method, request, metadata, deadline))}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+            if not done:
+                attempts.add(asyncio.ensure_future(self._call(method, request, metadata, deadline)))
+            error: BaseException | None = None
+            pending = attempts
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
@@ -1,16 +1,53 @@
 import os
 import sys
-from typing import Sequence
+from typing import Awaitable, Callable, Sequence
 
 import grpc
 
 from app.config import settings
+from app.core.cache import AsyncTTLCache
 from app.rpc_client.base_client import BaseRpcClient, T
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'gen', 'python'))
 
 from app.rpc_client.gen.python.calculator.v1 import calculator_pb2, calculator_pb2_grpc
 
+# Locations, fee types, destinations and terminals are near-static, keyed by (kind, id)
+reference_data_cache: AsyncTTLCache[tuple[str, int], object] = AsyncTTLCache(
+    "reference_data",
+    max_size=settings.REFERENCE_DATA_CACHE_SIZE,
+    ttl=settings.REFERENCE_DATA_CACHE_TTL_S,
+    negative_ttl=settings.REFERENCE_DATA_CACHE_NEGATIVE_TTL_S,
+)
+
+# Quotes for identical inputs are reused for a short time, keyed by the serialized request
+calculator_quote_cache: AsyncTTLCache[bytes, calculator_pb2.GetCalculatorWithDataResponse] = AsyncTTLCache(
+    "calculator_quotes",
+    max_size=settings.CALCULATOR_QUOTE_CACHE_SIZE,
+    ttl=settings.CALCULATOR_QUOTE_CACHE_TTL_S,
+)
+
+
+def _is_not_found(error: BaseException) -> bool:
+    return isinstance(error, grpc.aio.AioRpcError) and error.code() == grpc.StatusCode.NOT_FOUND
+
+
+def _loader(
+        client_factory: Callable[[], BaseRpcClient],
+        method: str,
+        request,
+) -> Callable[[], Awaitable]:
+    """
+    Cache loader running ``method`` on a client of its own.
+
+    A load can outlive the caller that started it (other callers join it, stale values refresh in
+    the background), so it must not borrow the caller's client and channel.
+    """
+    async def load():
+        async with client_factory() as client:
+            return await client._execute_request(getattr(client.stub, method), request)
+    return load
+
 
 class CalculatorRpcClient(BaseRpcClient[calculator_pb2_grpc.CalculatorServiceStub]):
     def __init__(self):
@@ -45,7 +82,10 @@ class CalculatorRpcClient(BaseRpcClient[calculator_pb2_grpc.CalculatorServiceStu
         if destination is not None:
             request.destination = destination
 
-        return await self._execute_request(self.stub.GetCalculatorWithData, request)
+        return await calculator_quote_cache.get_or_load(
+            request.SerializeToString(deterministic=True),
+            _loader(CalculatorRpcClient, "GetCalculatorWithData", request),
+        )
 
     async def get_calculator_with_ids(
         self,
@@ -106,13 +146,20 @@ class DetailedInfoService(BaseRpcClient[calculator_pb2_grpc.DetailedInfoServiceS
     def _create_stub(self, channel: grpc.aio.Channel) -> T:
         return calculator_pb2_grpc.DetailedInfoServiceStub(channel)
 
+    def _reference_client(self) -> "DetailedInfoService":
+        return DetailedInfoService(server_url=self.server_url)
+
     async def get_detailed_location(
         self,
         *,
         location_id: int,
     ) -> calculator_pb2.GetDetailedLocationResponse:
         request = calculator_pb2.GetDetailedLocationRequest(id=location_id)
-        return await self._execute_request(self.stub.GetDetailedLocation, request)
+        return await reference_data_cache.get_or_load(
+            ("location", location_id),
+            _loader(self._reference_client, "GetDetailedLocation", request),
+            cache_error=_is_not_found,
+        )
 
     async def get_detailed_terminal(
         self,
@@ -120,7 +167,11 @@ class DetailedInfoService(BaseRpcClient[calculator_pb2_grpc.DetailedInfoServiceS
         terminal_id: int,
     ) -> calculator_pb2.GetDetailedTerminalResponse:
         request = calculator_pb2.GetDetailedTerminalRequest(id=terminal_id)
-        return await self._execute_request(self.stub.GetDetailedTerminal, request)
+        return await reference_data_cache.get_or_load(
+            ("terminal", terminal_id),
+            _loader(self._reference_client, "GetDetailedTerminal", request),
+            cache_error=_is_not_found,
+        )
 
     async def get_detailed_destination(
         self,
@@ -128,7 +179,11 @@ class DetailedInfoService(BaseRpcClient[calculator_pb2_grpc.DetailedInfoServiceS
         destination_id: int,
     ) -> calculator_pb2.GetDetailedDestinationResponse:
         request = calculator_pb2.GetDetailedDestinationRequest(id=destination_id)
-        return await self._execute_request(self.stub.GetDetailedDestination, request)
+        return await reference_data_cache.get_or_load(
+            ("destination", destination_id),
+            _loader(self._reference_client, "GetDetailedDestination", request),
+            cache_error=_is_not_found,
+        )
 
     async def get_detailed_fee_type(
         self,
@@ -136,7 +191,11 @@ class DetailedInfoService(BaseRpcClient[calculator_pb2_grpc.DetailedInfoServiceS
         fee_type_id: int,
     ) -> calculator_pb2.GetDetailedFeeTypeResponse:
         request = calculator_pb2.GetDetailedFeeTypeRequest(id=fee_type_id)
-        return await self._execute_request(self.stub.GetDetailedFeeType, request)
+        return await reference_data_cache.get_or_load(
+            ("fee_type", fee_type_id),
+            _loader(self._reference_client, "GetDetailedFeeType", request),
+            cache_error=_is_not_found,
+        )
 
     async def get_rate(self) -> float:
         request = calculator_pb2.GetRatesRequest()
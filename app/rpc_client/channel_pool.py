@@ -0,0 +1,150 @@
+import asyncio
+import itertools
+from typing import Sequence
+
+import grpc
+
+from app.config import settings
+from app.core.logger import logger
+
+
+ChannelOptions = Sequence[tuple[str, int | str]]
+
+
+class _TargetPool:
+    def __init__(self, target: str, options: ChannelOptions, size: int):
+        self.target = target
+        self.options = list(options)
+        self.size = size
+        self.channels: list[grpc.aio.Channel] = []
+        self._cursor = itertools.count()
+
+    def fill(self):
+        while len(self.channels) < self.size:
+            self.channels.append(self._dial())
+
+    def _dial(self) -> grpc.aio.Channel:
+        return grpc.aio.insecure_channel(self.target, options=self.options)
+
+    def next_channel(self) -> grpc.aio.Channel:
+        return self.channels[next(self._cursor) % len(self.channels)]
+
+    def check(self):
+        for index, channel in enumerate(self.channels):
+            state = channel.get_state(try_to_connect=True)
+            if state == grpc.ChannelConnectivity.SHUTDOWN:
+                logger.warning(
+                    "Pooled gRPC channel is shut down, redialing",
+                    extra={"target": self.target, "index": index},
+                )
+                self.channels[index] = self._dial()
+            elif state == grpc.ChannelConnectivity.TRANSIENT_FAILURE:
+                logger.warning(
+                    "Pooled gRPC channel in transient failure",
+                    extra={"target": self.target, "index": index},
+                )
+
+    async def close(self):
+        channels, self.channels = self.channels, []
+        for channel in channels:
+            try:
+                await channel.close()
+            except Exception as e:
+                logger.warning(
+                    "Failed to close pooled gRPC channel",
+                    extra={"target": self.target, "error": str(e)},
+                )
+
+
+class ChannelRegistry:
+    """
+    Process-wide registry of long-lived gRPC channels, one small round-robin pool per target.
+
+    Started and closed by the app lifespan. While it is not running (scripts, one-off jobs)
+    ``BaseRpcClient`` keeps dialing its own short-lived channel.
+    """
+
+    def __init__(
+            self,
+            pool_size: int = settings.RPC_CHANNEL_POOL_SIZE,
+            health_check_interval: float = settings.RPC_CHANNEL_HEALTH_CHECK_INTERVAL_S,
+            keepalive_time_ms: int = settings.RPC_CHANNEL_KEEPALIVE_TIME_MS,
+    ):
+        self.pool_size = max(1, pool_size)
+        self.health_check_interval = health_check_interval
+        self.keepalive_time_ms = keepalive_time_ms
+
+        self._pools: dict[tuple, _TargetPool] = {}
+        self._health_task: asyncio.Task | None = None
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    async def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._health_task = asyncio.create_task(self._health_loop())
+        logger.info(
+            "gRPC channel registry started",
+            extra={"pool_size": self.pool_size, "health_check_interval": self.health_check_interval},
+        )
+
+    async def close(self):
+        self._running = False
+        if self._health_task:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.close()
+        logger.info("gRPC channel registry closed", extra={"targets": len(pools)})
+
+    def _pool_options(self, options: ChannelOptions) -> list[tuple[str, int | str]]:
+        pooled_options = list(options) + [
+            ("grpc.keepalive_time_ms", self.keepalive_time_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+        ]
+        if self.pool_size > 1:
+            # Without a local subchannel pool every channel to the same target would share one connection
+            pooled_options.append(("grpc.use_local_subchannel_pool", 1))
+        return pooled_options
+
+    async def acquire(self, target: str, options: ChannelOptions, timeout: float) -> grpc.aio.Channel:
+        if not self._running:
+            raise RuntimeError("gRPC channel registry is not running")
+
+        key = (target, tuple(options))
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = _TargetPool(target, self._pool_options(options), self.pool_size)
+            pool.fill()
+            self._pools[key] = pool
+            logger.debug("gRPC channel pool created", extra={"target": target, "size": pool.size})
+
+        channel = pool.next_channel()
+        if channel.get_state(try_to_connect=True) != grpc.ChannelConnectivity.READY:
+            await asyncio.wait_for(channel.channel_ready(), timeout=timeout)
+        return channel
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            for pool in list(self._pools.values()):
+                try:
+                    pool.check()
+                except Exception as e:
+                    logger.error(
+                        "gRPC channel health check failed",
+                        extra={"target": pool.target, "error": str(e)},
+                    )
+
+
+channel_registry = ChannelRegistry()
@@ -0,0 +1,166 @@
+import time
+from collections import deque
+from enum import Enum
+from typing import Any
+
+import grpc
+
+from app.config import settings
+from app.core.logger import logger
+
+# Codes that say the target is unhealthy; anything else is an answer and counts as a success
+FAILURE_CODES = frozenset({
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.INTERNAL,
+    grpc.StatusCode.UNKNOWN,
+})
+
+_breakers: dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a target whose breaker is open."""
+
+    def __init__(self, target: str, retry_after: float):
+        super().__init__(f"RPC target {target} is unavailable, circuit breaker is open")
+        self.target = target
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker of one RPC target.
+
+    Closed, it counts call outcomes over the last ``window`` seconds and opens once at least
+    ``min_calls`` were seen and ``failure_rate`` of them failed. Open, every call fails at once for
+    ``open_for`` seconds. Half-open, up to ``half_open_calls`` probes go through: that many
+    successes close it again, any failure reopens it.
+    """
+
+    def __init__(
+            self,
+            target: str,
+            window: float = settings.RPC_BREAKER_WINDOW_S,
+            min_calls: int = settings.RPC_BREAKER_MIN_CALLS,
+            failure_rate: float = settings.RPC_BREAKER_FAILURE_RATE,
+            open_for: float = settings.RPC_BREAKER_OPEN_S,
+            half_open_calls: int = settings.RPC_BREAKER_HALF_OPEN_CALLS,
+    ):
+        self.target = target
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_for = open_for
+        self.half_open_calls = half_open_calls
+
+        self.state = CircuitState.CLOSED
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _prune(self, now: float):
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def _transition(self, state: CircuitState):
+        previous, self.state = self.state, state
+        self._outcomes.clear()
+        self._failures = 0
+        self._probe_successes = 0
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+        log = logger.warning if state == CircuitState.OPEN else logger.info
+        log(
+            "RPC circuit breaker state changed",
+            extra={"target": self.target, "from": previous.value, "to": state.value},
+        )
+
+    def _reject(self):
+        self.rejected += 1
+        retry_after = max(0.0, self._opened_at + self.open_for - time.monotonic())
+        raise CircuitOpenError(self.target, retry_after)
+
+    def raise_if_open(self):
+        if self.state != CircuitState.OPEN:
+            return
+        if time.monotonic() - self._opened_at < self.open_for:
+            self._reject()
+        self._transition(CircuitState.HALF_OPEN)
+
+    def before_call(self) -> bool:
+        """Admit a call or raise ``CircuitOpenError``; returns whether the call is a half-open probe."""
+        self.raise_if_open()
+        if self.state != CircuitState.HALF_OPEN:
+            return False
+        if self._probes_in_flight >= self.half_open_calls:
+            self._reject()
+        self._probes_in_flight += 1
+        return True
+
+    def after_call(self, probe: bool, failed: bool | None):
+        """Record the outcome of an admitted call; ``failed=None`` for calls that were abandoned."""
+        if probe:
+            self._probes_in_flight -= 1
+        if failed is not None:
+            self.record(failed)
+
+    def record(self, failed: bool):
+        if self.state == CircuitState.HALF_OPEN:
+            if failed:
+                self._transition(CircuitState.OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._transition(CircuitState.CLOSED)
+            return
+        if self.state == CircuitState.OPEN:
+            return
+
+        now = time.monotonic()
+        self._prune(now)
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        if len(self._outcomes) >= self.min_calls and self._failures / len(self._outcomes) >= self.failure_rate:
+            self._transition(CircuitState.OPEN)
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        self._prune(now)
+        calls = len(self._outcomes)
+        return {
+            "state": self.state.value,
+            "calls_in_window": calls,
+            "failure_rate": round(self._failures / calls, 4) if calls else 0.0,
+            "retry_after_s": (
+                round(max(0.0, self._opened_at + self.open_for - now), 3)
+                if self.state == CircuitState.OPEN else None
+            ),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+def get_circuit_breaker(target: str) -> CircuitBreaker:
+    breaker = _breakers.get(target)
+    if breaker is None:
+        breaker = _breakers[target] = CircuitBreaker(target)
+    return breaker
+
+
+def get_circuit_breaker_stats() -> dict[str, dict[str, Any]]:
+    return {target: breaker.stats() for target, breaker in _breakers.items()}
@@ -0,0 +1,28 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class DeadLetterOut(BaseModel):
+    message_id: str | None = Field(None, description="AMQP message id")
+    correlation_id: str | None = Field(None, description="AMQP correlation id")
+    routing_key: str = Field(..., description="Routing key the message was originally published with")
+    attempts: int = Field(..., description="Processing attempts made before dead-lettering")
+    error: str | None = Field(None, description="Error of the last attempt")
+    failed_at: str | None = Field(None, description="When the last attempt failed")
+    body: Any = Field(None, description="Message body (decoded JSON when possible)")
+
+
+class DeadLettersOut(BaseModel):
+    total: int = Field(..., description="Messages currently in the dead-letter queue")
+    items: list[DeadLetterOut]
+
+
+class DeadLetterReplayIn(BaseModel):
+    limit: int = Field(100, ge=1, le=1000, description="Maximum number of dead letters to replay")
+    routing_key: str | None = Field(None, description="Only replay messages originally sent with this routing key")
+
+
+class DeadLetterReplayOut(BaseModel):
+    replayed: int = Field(..., description="Messages sent back to the consumer queue")
+    skipped: int = Field(..., description="Messages left in the dead-letter queue by the routing key filter")
@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.enums.order import OrderStatusEnum
+
+
+class InvoiceExportFilterIn(BaseModel):
+    statuses: list[OrderStatusEnum] | None = Field(None, description="Only export orders in these statuses")
+    user_uuid: str | None = Field(None, description="Only export orders of this user")
+    location_id: int | None = Field(None, description="Only export orders from this location")
+    order_ids: list[int] | None = Field(None, description="Only export these orders")
+    order_date_from: datetime | None = Field(None, description="Only export orders placed at or after this moment")
+    order_date_to: datetime | None = Field(None, description="Only export orders placed before this moment")
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.enums.background_run_status import BackgroundRunStatus
+from app.enums.order import OrderStatusEnum
+
+
+class RequoteFilterIn(BaseModel):
+    statuses: list[OrderStatusEnum] | None = Field(
+        None,
+        description="Only re-quote orders in these statuses (intersected with won/port_chosen)",
+    )
+    user_uuid: str | None = Field(None, description="Only re-quote orders of this user")
+    location_id: int | None = Field(None, description="Only re-quote orders from this location")
+    batch_size: int | None = Field(None, ge=1, le=500, description="Orders per calculator batch request")
+
+
+class RequoteResultOut(BaseModel):
+    matched: int = Field(0, description="Orders matching the filter")
+    requoted: int = Field(0, description="Orders whose invoice items were refreshed")
+    skipped: int = Field(0, description="Orders missing from calculator response or no longer re-quotable")
+    failed_batches: int = Field(0, description="Batches whose calculator call failed")
+
+
+class RequoteRunOut(RequoteResultOut):
+    run_id: str
+    status: BackgroundRunStatus
+    started_at: datetime
+    finished_at: datetime | None = None
+    error: str | None = None
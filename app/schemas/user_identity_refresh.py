@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.enums.background_run_status import BackgroundRunStatus
+
+
+class UserIdentityRefreshIn(BaseModel):
+    user_uuid: str | None = Field(None, description="Only refresh orders of this user")
+    batch_size: int | None = Field(None, ge=1, le=5000, description="Users looked up per auth batch")
+
+
+class UserIdentityRefreshOut(BaseModel):
+    users: int = Field(0, description="Distinct users owning matching orders")
+    refreshed_users: int = Field(0, description="Users resolved by the auth service")
+    updated_orders: int = Field(0, description="Orders whose cached user name or email changed")
+    failed_users: int = Field(0, description="Users the auth service failed to return")
+
+
+class UserIdentityRefreshRunOut(UserIdentityRefreshOut):
+    run_id: str
+    status: BackgroundRunStatus
+    started_at: datetime
+    finished_at: datetime | None = None
+    error: str | None = None
@@ -1,7 +1,11 @@
 import asyncio
+from contextlib import nullcontext
+
 import grpc.aio
 from datetime import datetime, timezone
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.utils import get_cheapest_terminal_prices
 from app.database.crud import OrderService
 from app.database.db.session import get_db_context
@@ -54,10 +58,10 @@ class GenerateFromLot:
             )
         return calculator
 
-    async def generate(self):
-
+    async def generate(self, db: AsyncSession | None = None):
+        """Create the order; pass ``db`` to commit it in the caller's transaction."""
         lot = await self._get_lot()
-        async with get_db_context() as db:
+        async with (get_db_context() if db is None else nullcontext(db)) as db:
             order_service = OrderService(db)
             if await order_service.exists_by_lot_id(lot.lot_id):
                 raise ValueError("Order with this lot_id already exists")
@@ -152,16 +156,18 @@ class GenerateFromLot:
                 name=f"{order.vehicle_name.upper()} ({order.vin})",
                 amount=order.vehicle_value,
                 order_id=order.id,
+                is_calculated=True,
             ),
             InvoiceItemCreate(
                 name="Broker Fee",
                 amount=default_calculator.broker_fee,
                 order_id=order.id,
+                is_calculated=True,
             ),
         ]
 
         items.extend(
-            InvoiceItemCreate(name=fee.name, amount=fee.price, order_id=order.id)
+            InvoiceItemCreate(name=fee.name, amount=fee.price, order_id=order.id, is_calculated=True)
             for fee in default_calculator.additional.fees
             if fee.price
         )
@@ -174,6 +180,7 @@ class GenerateFromLot:
                     name=f"Transportation ({order.terminal_name})",
                     amount=transportation_city.price if transportation_city else 0,
                     order_id=order.id,
+                    is_calculated=True,
                 )
             )
             items.append(
@@ -181,6 +188,7 @@ class GenerateFromLot:
                     name=f"Ocean Shipping ({order.destination_name})",
                     amount=ocean_city.price if ocean_city else 0,
                     order_id=order.id,
+                    is_calculated=True,
                 )
             )
 
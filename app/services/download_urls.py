@@ -0,0 +1,177 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+import grpc
+import grpc.aio
+
+from app.config import settings
+from app.core.cache import AsyncTTLCache
+from app.core.logger import logger
+from app.rpc_client.files import FilesRpcClient
+
+
+class DownloadUrlNotFoundError(LookupError):
+    def __init__(self, file_id: int):
+        super().__init__(f"File {file_id} not found")
+        self.file_id = file_id
+
+
+@dataclass(frozen=True)
+class DownloadUrl:
+    file_id: int
+    download_url: str
+    expires_at: float
+
+    @property
+    def expires_in(self) -> int:
+        """Seconds the URL stays valid from now."""
+        return max(0, int(self.expires_at - time.monotonic()))
+
+
+class DownloadUrlResolver:
+    """
+    Presigned download URLs from the files service, cached and fetched in batches.
+
+    A URL is cached until ``refresh_margin`` seconds before the files service says it expires, so
+    every URL handed out stays valid at least that long. Misses arriving within ``batch_window``
+    seconds of each other are resolved by one ``GetBatchDownloadUrls`` call, and concurrent
+    lookups of the same file share one pending result.
+    """
+
+    def __init__(
+            self,
+            batch_window: float = settings.DOWNLOAD_URL_BATCH_WINDOW_S,
+            max_batch: int = settings.DOWNLOAD_URL_MAX_BATCH,
+            refresh_margin: float = settings.DOWNLOAD_URL_REFRESH_MARGIN_S,
+            cache_size: int = settings.DOWNLOAD_URL_CACHE_SIZE,
+    ):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.refresh_margin = refresh_margin
+        # Entries get the TTL of their own URL; there is no default
+        self._cache: AsyncTTLCache[int, DownloadUrl] = AsyncTTLCache("download_urls", max_size=cache_size, ttl=0.0)
+
+        self._pending: dict[int, asyncio.Future[DownloadUrl]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def get(self, file_id: int) -> DownloadUrl:
+        """
+        URL of ``file_id``.
+
+        Raises ``DownloadUrlNotFoundError`` for unknown files and ``grpc.aio.AioRpcError`` when the
+        files service fails.
+        """
+        cached = self._cache.get(file_id)
+        if cached is not None:
+            return cached
+        # Shield so a cancelled caller does not cancel the lookup other callers are waiting on
+        return await asyncio.shield(self._enqueue(file_id))
+
+    async def get_many(self, file_ids: Iterable[int]) -> dict[int, DownloadUrl]:
+        """URLs keyed by file id; files that could not be resolved are left out and logged."""
+        file_ids = list(dict.fromkeys(file_ids))
+        results = await asyncio.gather(*(self.get(file_id) for file_id in file_ids), return_exceptions=True)
+        urls = {}
+        for file_id, result in zip(file_ids, results):
+            if isinstance(result, DownloadUrl):
+                urls[file_id] = result
+            else:
+                logger.warning("Failed to resolve download URL", extra={"file_id": file_id, "error": str(result)})
+        return urls
+
+    def invalidate(self, file_id: int):
+        self._cache.invalidate(file_id)
+
+    def _enqueue(self, file_id: int) -> asyncio.Future[DownloadUrl]:
+        future = self._pending.get(file_id)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = self._pending[file_id] = loop.create_future()
+        # Callers may all have been cancelled; do not report their errors as never retrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._resolve_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _resolve_batch(self, batch: dict[int, asyncio.Future[DownloadUrl]]):
+        logger.debug("Resolving download URLs", extra={"files": len(batch)})
+        try:
+            try:
+                resolved = await self._fetch(list(batch))
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.NOT_FOUND:
+                    raise
+                # One unknown file fails the whole batch call; look the files up one by one instead
+                resolved = await self._fetch_each(list(batch)) if len(batch) > 1 else {}
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        for file_id, future in batch.items():
+            if future.done():
+                continue
+            result = resolved.get(file_id)
+            if result is None:
+                future.set_exception(DownloadUrlNotFoundError(file_id))
+            elif isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(batch: dict[int, asyncio.Future[DownloadUrl]], error: BaseException):
+        for future in batch.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _fetch(self, file_ids: list[int]) -> dict[int, DownloadUrl]:
+        async with FilesRpcClient() as client:
+            if len(file_ids) == 1:
+                downloads = [await client.get_download_url(file_id=file_ids[0])]
+            else:
+                downloads = (await client.get_batch_download_urls(file_ids=file_ids)).download_urls
+        return {download.file_id: self._store(download) for download in downloads}
+
+    async def _fetch_each(self, file_ids: list[int]) -> dict[int, DownloadUrl | BaseException]:
+        resolved: dict[int, DownloadUrl | BaseException] = {}
+
+        async def fetch_one(file_id: int):
+            try:
+                resolved.update(await self._fetch([file_id]))
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.NOT_FOUND:
+                    resolved[file_id] = e
+
+        await asyncio.gather(*(fetch_one(file_id) for file_id in file_ids))
+        return resolved
+
+    def _store(self, download) -> DownloadUrl:
+        url = DownloadUrl(
+            file_id=download.file_id,
+            download_url=download.download_url,
+            expires_at=time.monotonic() + download.expires_in,
+        )
+        ttl = download.expires_in - self.refresh_margin
+        if ttl > 0:
+            self._cache.set(download.file_id, url, ttl=ttl)
+        return url
+
+
+download_url_resolver = DownloadUrlResolver()
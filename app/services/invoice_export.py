@@ -0,0 +1,197 @@
+import asyncio
+import csv
+import io
+import urllib.request
+import zipfile
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Sequence
+
+from app.config import settings
+from app.core.logger import logger
+from app.core.utils import uses_legacy_generated_invoice
+from app.database.crud import AuctionInvoiceService, OrderService
+from app.database.db.session import get_db_context
+from app.database.models import Order
+from app.enums.custom_invoice_status import FileInvoiceStatus
+from app.schemas.invoice_export import InvoiceExportFilterIn
+from app.services.download_urls import download_url_resolver
+from app.services.invoice_generator.pdf_cache import invoice_pdf_cache
+from app.services.invoice_generator.prefetch import prefetch_invoice_inputs
+from app.services.invoice_generator.render_pool import InvoiceRenderUnavailableError, invoice_render_pool
+from app.services.invoice_generator.snapshot import InvoiceInput
+
+MANIFEST_NAME = "manifest.csv"
+_RENDER_RETRIES = 5
+
+
+@dataclass
+class _Entry:
+    order_id: int
+    vin: str
+    source: str
+    file_name: str | None = None
+    data: bytes | None = None
+    error: str | None = None
+
+
+class _ZipSink:
+    """Write-only, non-seekable target: zipfile streams entries with data descriptors into it."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _download(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=settings.INVOICE_EXPORT_DOWNLOAD_TIMEOUT_S) as response:
+        return response.read()
+
+
+class InvoiceExport:
+    """
+    Streams the invoices of every order matching a filter as one ZIP archive.
+
+    Orders are processed in chunks: each chunk resolves its auction invoice URLs with one
+    ``GetBatchDownloadUrls`` call and prefetches its legacy invoice inputs in one go. At most
+    ``concurrency`` files are downloaded or rendered (in the render pool) at a time and written out
+    as soon as they are next in line, so memory is bounded by the window, not by the archive.
+    ``manifest.csv`` at the end lists what was included or skipped for every order.
+    """
+
+    def __init__(
+        self,
+        filters: InvoiceExportFilterIn,
+        chunk_size: int = settings.INVOICE_EXPORT_CHUNK_SIZE,
+        concurrency: int = settings.INVOICE_EXPORT_CONCURRENCY,
+    ):
+        self.filters = filters
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        async with get_db_context() as db:
+            order_ids = await OrderService(db).get_ids_with_filters(**self.filters.model_dump())
+        logger.info("Invoice export started", extra={"orders": len(order_ids), "filters": self.filters.model_dump(mode="json")})
+
+        sink = _ZipSink()
+        manifest = io.StringIO()
+        manifest_writer = csv.writer(manifest)
+        manifest_writer.writerow(["order_id", "vin", "source", "file_name", "error"])
+        included = 0
+
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for start in range(0, len(order_ids), self.chunk_size):
+                async for entry in self._chunk_entries(order_ids[start:start + self.chunk_size]):
+                    manifest_writer.writerow([entry.order_id, entry.vin, entry.source, entry.file_name or "", entry.error or ""])
+                    if entry.data is None:
+                        continue
+                    archive.writestr(self._zip_info(entry.file_name), entry.data)
+                    included += 1
+                    yield sink.drain()
+            archive.writestr(self._zip_info(MANIFEST_NAME), manifest.getvalue())
+        yield sink.drain()
+
+        logger.info("Invoice export finished", extra={"orders": len(order_ids), "included": included})
+
+    @staticmethod
+    def _zip_info(file_name: str) -> zipfile.ZipInfo:
+        return zipfile.ZipInfo(file_name, date_time=datetime.now().timetuple()[:6])
+
+    async def _chunk_entries(self, order_ids: Sequence[int]) -> AsyncIterator[_Entry]:
+        async with get_db_context() as db:
+            orders = await OrderService(db).get_all_with_filters(
+                order_ids=order_ids, relationships=(Order.invoice_items,)
+            )
+            auction_invoices = await AuctionInvoiceService(db).get_by_order_ids(order_ids)
+
+        download_urls = await self._download_urls(auction_invoices.values())
+        legacy_orders = [
+            order for order in orders
+            if order.id not in auction_invoices and uses_legacy_generated_invoice(order.delivery_status, False)
+        ]
+        inputs = {
+            invoice_input.order.id: invoice_input
+            for invoice_input in await prefetch_invoice_inputs(legacy_orders)
+        }
+
+        jobs: list[Awaitable[_Entry]] = []
+        for order in orders:
+            auction_invoice = auction_invoices.get(order.id)
+            if order.id in inputs:
+                jobs.append(self._render_entry(inputs[order.id]))
+            elif auction_invoice is not None and auction_invoice.status == FileInvoiceStatus.AVAILABLE:
+                jobs.append(self._download_entry(order, download_urls.get(auction_invoice.file_id)))
+            else:
+                error = "Auction invoice upload pending" if auction_invoice else "No invoice available in this status"
+                jobs.append(self._skipped_entry(order, error))
+
+        # Sliding window: files are produced concurrently but written strictly in order
+        window: deque[asyncio.Task[_Entry]] = deque()
+        try:
+            for job in jobs:
+                window.append(asyncio.ensure_future(job))
+                if len(window) >= self.concurrency:
+                    yield await window.popleft()
+            while window:
+                yield await window.popleft()
+        finally:
+            for task in window:
+                task.cancel()
+
+    @staticmethod
+    async def _download_urls(auction_invoices) -> dict[int, str]:
+        file_ids = [invoice.file_id for invoice in auction_invoices if invoice.status == FileInvoiceStatus.AVAILABLE]
+        urls = await download_url_resolver.get_many(file_ids)
+        return {file_id: url.download_url for file_id, url in urls.items()}
+
+    @staticmethod
+    async def _skipped_entry(order: Order, error: str) -> _Entry:
+        return _Entry(order_id=order.id, vin=order.vin, source="none", error=error)
+
+    @staticmethod
+    async def _download_entry(order: Order, url: str | None) -> _Entry:
+        entry = _Entry(order_id=order.id, vin=order.vin, source="auction", file_name=f"auction_invoice_{order.vin}.pdf")
+        if not url:
+            entry.error = "Download URL not resolved"
+            return entry
+        try:
+            entry.data = await asyncio.to_thread(_download, url)
+        except OSError as e:
+            entry.error = f"Download failed: {e}"
+        return entry
+
+    @staticmethod
+    async def _render_entry(invoice_input: InvoiceInput) -> _Entry:
+        order = invoice_input.order
+        entry = _Entry(order_id=order.id, vin=order.vin, source="generated", file_name=f"invoice_{order.vin}.pdf")
+        cached = await invoice_pdf_cache.get(invoice_input.cache_key())
+        if cached is not None:
+            entry.data = cached
+            return entry
+
+        for attempt in range(1, _RENDER_RETRIES + 1):
+            try:
+                entry.data = await invoice_render_pool.render(invoice_input)
+                return entry
+            except InvoiceRenderUnavailableError as e:
+                # Interactive downloads share the pool; back off instead of failing the export
+                entry.error = str(e)
+                await asyncio.sleep(0.5 * attempt)
+            except Exception as e:
+                logger.error("Invoice export render failed", extra={"order_id": order.id, "error": str(e)})
+                entry.error = f"Render failed: {e}"
+                return entry
+        return entry
@@ -0,0 +1,105 @@
+"""
+Cost of each part of an invoice render, timed separately.
+
+    python -m app.services.invoice_generator.benchmark --renders 50
+
+Every render used to compile its template (fonts parsed, styles built) and load the full size logo.
+Now the template is compiled once per process, and its logo is resampled to print resolution at
+that point. The one-time steps are reported on their own and are not part of any per-invoice figure.
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from app.enums.auction import AuctionEnum
+from app.enums.order import InvoiceTypeEnum
+from app.services.invoice_generator.generator import InvoiceGenerator
+from app.services.invoice_generator.snapshot import (
+    InvoiceInput,
+    InvoiceItemSnapshot,
+    InvoiceOrderSnapshot,
+    InvoiceUserSnapshot,
+)
+from app.services.invoice_generator.template import (
+    INVOICE_INFO,
+    LOGO_DPI,
+    InvoiceTemplate,
+    _build_styles,
+    _load_logo,
+    _register_fonts,
+)
+
+
+def _sample_generator() -> InvoiceGenerator:
+    invoice_input = InvoiceInput(
+        order=InvoiceOrderSnapshot(
+            id=1,
+            invoice_type=InvoiceTypeEnum.DEFAULT,
+            vin="TESTVIN1234567890",
+            created_at=datetime.now(timezone.utc),
+            auction=AuctionEnum.COPART,
+            lot_id=123456,
+            vehicle_name="Test Vehicle",
+            location_name="Test Location",
+            user_uuid="c2ead8a4-36b5-49ba-b884-4ee818ec8ce9",
+        ),
+        items=tuple(InvoiceItemSnapshot(name=f"Item {i}", amount=100 * i) for i in range(1, 13)),
+        user=InvoiceUserSnapshot(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            phone_number="37060000000",
+        ),
+        usd_to_eur_rate=0.92,
+    )
+    return InvoiceGenerator(invoice_input)
+
+
+def _compile_fonts_and_styles():
+    _register_fonts.cache_clear()
+    _build_styles(*_register_fonts())
+
+
+def _measure(step: Callable[[], object], repeats: int) -> float:
+    step()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        step()
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=20)
+    args = parser.parse_args()
+
+    generator = _sample_generator()
+    info = INVOICE_INFO[InvoiceTypeEnum.DEFAULT]()
+    source_template = InvoiceTemplate.compile(info, logo_dpi=None)
+    resampled_template = InvoiceTemplate.compile(info)
+
+    compile_ms = _measure(_compile_fonts_and_styles, args.renders)
+    source_logo_ms = _measure(lambda: _load_logo(info.logo_path, None), args.renders)
+    resample_logo_ms = _measure(lambda: _load_logo(info.logo_path, LOGO_DPI), args.renders)
+    source_render_ms = _measure(lambda: generator.generate_pdf(source_template), args.renders)
+    resampled_render_ms = _measure(lambda: generator.generate_pdf(resampled_template), args.renders)
+    source_size = len(generator.generate_pdf(source_template))
+    resampled_size = len(generator.generate_pdf(resampled_template))
+
+    rows = [
+        ("template compile (fonts, styles)", compile_ms, ""),
+        ("logo load, source size", source_logo_ms, ""),
+        (f"logo load, resampled to {LOGO_DPI} dpi", resample_logo_ms, "  (once per process)"),
+        ("render, source size logo", source_render_ms, f"  {source_size / 1024:7.1f} KiB"),
+        ("render, resampled logo", resampled_render_ms, f"  {resampled_size / 1024:7.1f} KiB"),
+    ]
+    for label, ms, note in rows:
+        print(f"{label + ':':<36}{ms:8.1f} ms{note}")
+    print()
+    print(f"per invoice before: {compile_ms + source_logo_ms + source_render_ms:8.1f} ms (compile + logo load + render)")
+    print(f"per invoice now:    {resampled_render_ms:8.1f} ms (render)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,30 @@
-import asyncio
 from datetime import datetime, timezone
 from io import BytesIO
 from pathlib import Path
 
-from app.database.models import Order
+from app.enums.auction import AuctionEnum
 from app.enums.order import InvoiceTypeEnum
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from app.rpc_client.auth import AuthRpcClient
-from app.services.invoice_generator.invoice_types import InvoiceTypes, BaseInvoice
+from app.services.invoice_generator.snapshot import (
+    InvoiceInput,
+    InvoiceItemSnapshot,
+    InvoiceOrderSnapshot,
+)
+from app.services.invoice_generator.template import LOGO_SIZE_PT, InvoiceTemplate, get_invoice_template
 
 
 class InvoiceGenerator:
-    def __init__(self, order: Order, user=None, usd_to_eur_rate: float | None = None):
-        self.order = order
-        self.user = user
-        self.usd_to_eur_rate = usd_to_eur_rate
+    """Renders an invoice PDF from a fully resolved ``InvoiceInput``; does no I/O besides ``save_path``."""
 
-    def _load_user_via_rpc(self):
-
-        async def _fetch():
-            async with AuthRpcClient() as client:
-                return await client.get_user(user_uuid=self.order.user_uuid)
-
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
-
-        if loop and loop.is_running():
-            # Avoid nesting event loops; skip RPC in this edge case.
-            return None
-
-        try:
-            return asyncio.run(_fetch())
-        except Exception:
-            return None
+    def __init__(self, invoice_input: InvoiceInput):
+        self.input = invoice_input
+        self.order = invoice_input.order
 
     def _build_invoice_to_lines(self) -> list[str]:
         lines: list[str] = []
-        user = self.user or self._load_user_via_rpc()
+        user = self.input.user
         if user:
             full_name = f"{user.first_name} {user.last_name}".strip()
             if full_name:
@@ -54,28 +34,13 @@ class InvoiceGenerator:
             if user.phone_number:
                 lines.append('+' + user.phone_number)
 
-        elif getattr(self.order, "user_uuid", None):
+        elif self.order.user_uuid:
             lines.append(f"User UUID: {self.order.user_uuid}")
 
         return [line for line in lines if line]
 
-    def generate_invoice_based_on_invoice_type(
-        self,
-        invoice_type: InvoiceTypeEnum | None = None,
-        save_path: str | Path | None = None,
-    ) -> bytes:
-        info_mapping = {
-            InvoiceTypeEnum.DEFAULT: InvoiceTypes.get_default_info,
-        }
-        if not invoice_type:
-            invoice_type = self.order.invoice_type
-
-        info_getter = info_mapping.get(invoice_type)
-        if not info_getter:
-            raise ValueError(f"Unsupported invoice type: {invoice_type}")
-
-        info = info_getter()
-        pdf_bytes = self.generate_pdf(info)
+    def generate_invoice_based_on_invoice_type(self, save_path: str | Path | None = None) -> bytes:
+        pdf_bytes = self.generate_pdf(get_invoice_template(self.input.invoice_type))
 
         if save_path:
             output_path = Path(save_path)
@@ -84,28 +49,14 @@ class InvoiceGenerator:
 
         return pdf_bytes
 
-    def generate_pdf(self, info: BaseInvoice) -> bytes:
+    def generate_pdf(self, template: InvoiceTemplate) -> bytes:
         """
-        Build invoice PDF bytes using BaseInvoice metadata and the current order data.
+        Build invoice PDF bytes from a compiled invoice template and the current order data.
         """
         buffer = BytesIO()
-
-        # Fonts: attempt to load DejaVu, fallback to Helvetica
-        font_name = "Helvetica"
-        font_bold = "Helvetica-Bold"
-        try:
-            font_dir = Path(__file__).resolve().parent
-            regular_font = font_dir / "fonts" / "dejavu-sans.ttf"
-            bold_font = font_dir / "fonts" / "dejavu-sans-bold.ttf"
-            if regular_font.exists() and bold_font.exists():
-                pdfmetrics.registerFont(TTFont("DejaVuSans", str(regular_font)))
-                pdfmetrics.registerFont(TTFont("DejaVuSans-Bold", str(bold_font)))
-                font_name = "DejaVuSans"
-                font_bold = "DejaVuSans-Bold"
-        except Exception:
-            # fall back silently to Helvetica
-            font_name = "Helvetica"
-            font_bold = "Helvetica-Bold"
+        info = template.info
+        font_name = template.font_name
+        font_bold = template.font_bold
 
         pdf = SimpleDocTemplate(
             buffer,
@@ -116,116 +67,28 @@ class InvoiceGenerator:
             bottomMargin=40,
         )
 
-        styles = getSampleStyleSheet()
-        header_title_style = ParagraphStyle(
-            "HeaderTitleStyle",
-            parent=styles["Heading1"],
-            fontSize=36,
-            textColor=colors.black,
-            fontName=font_bold,
-            leading=40,
-            spaceAfter=0,
-            spaceBefore=0,
-            leftIndent=10,
-        )
-        header_subtitle_style = ParagraphStyle(
-            "HeaderSubtitleStyle",
-            parent=styles["Normal"],
-            fontSize=9,
-            textColor=colors.black,
-            fontName=font_name,
-            leading=10,
-            spaceAfter=0,
-            spaceBefore=0,
-            leftIndent=10,
-            rightIndent=10,
-        )
-        title_center_style = ParagraphStyle(
-            "HeaderTitleCenterStyle",
-            parent=header_title_style,
-            alignment=TA_CENTER,
-            leftIndent=0,
-        )
-        subtitle_center_style = ParagraphStyle(
-            "HeaderSubtitleCenterStyle",
-            parent=header_subtitle_style,
-            alignment=TA_CENTER,
-            leftIndent=0,
-        )
-        invoice_title_style = ParagraphStyle(
-            "InvoiceTitleStyle",
-            parent=styles["Heading1"],
-            fontSize=18,
-            alignment=1,
-            spaceBefore=1,
-            spaceAfter=1,
-            fontName=font_bold,
-            textColor=colors.black,
-        )
-        bold_style = ParagraphStyle(
-            "BoldStyle",
-            parent=styles["Heading4"],
-            fontSize=10,
-            fontName=font_bold,
-            textColor=colors.black,
-        )
-        ten_style = ParagraphStyle(
-            "TenStyle",
-            parent=styles["Normal"],
-            fontSize=10,
-            fontName=font_name,
-            textColor=colors.black,
-        )
-        ten_style_center = ParagraphStyle(
-            "TenStyleCenter",
-            parent=ten_style,
-            alignment=1,
-        )
-        normal_style = ParagraphStyle(
-            "NormalStyle",
-            parent=styles["Normal"],
-            fontSize=8,
-            fontName=font_name,
-            textColor=colors.black,
-        )
-        bold_descriptions_style = ParagraphStyle(
-            "BoldDescriptionsStyle",
-            parent=styles["Normal"],
-            fontSize=8,
-            fontName=font_bold,
-            textColor=colors.black,
-        )
-        delivery_terms_style = ParagraphStyle(
-            "DeliveryTerms",
-            fontName=font_name,
-            fontSize=7,
-            textColor=colors.black,
-            leftIndent=0,
-        )
-        item_text_style = ParagraphStyle(
-            "ItemTextStyle",
-            parent=styles["Normal"],
-            fontSize=9,
-            fontName=font_name,
-            textColor=colors.black,
-        )
-        thank_you_style = ParagraphStyle(
-            "ThankYouStyle",
-            parent=styles["Normal"],
-            fontSize=8,
-            fontName=font_name,
-            alignment=1,
-            textColor=colors.black,
-        )
+        styles = template.styles
+        header_title_style = styles["header_title"]
+        header_subtitle_style = styles["header_subtitle"]
+        title_center_style = styles["title_center"]
+        subtitle_center_style = styles["subtitle_center"]
+        invoice_title_style = styles["invoice_title"]
+        bold_style = styles["bold"]
+        ten_style = styles["ten"]
+        ten_style_center = styles["ten_center"]
+        normal_style = styles["normal"]
+        bold_descriptions_style = styles["bold_descriptions"]
+        delivery_terms_style = styles["delivery_terms"]
+        item_text_style = styles["item_text"]
+        thank_you_style = styles["thank_you"]
 
         elements = []
 
         # Header with optional logo, mirrored from legacy template proportions
         subtitle = info.header_subtitle or ""
-        logo_path = Path(info.logo_path) if info.logo_path else None
-        if logo_path and logo_path.exists():
+        if template.logo_png:
             try:
-                logo = Image(str(logo_path), width=80, height=80)
+                logo = Image(BytesIO(template.logo_png), width=LOGO_SIZE_PT, height=LOGO_SIZE_PT)
                 title_text = Paragraph("VINAS.LT", header_title_style)
                 subtitle_text = Paragraph(str(subtitle), header_subtitle_style) if subtitle else Spacer(1, 0)
                 header_data = [
@@ -364,7 +227,7 @@ class InvoiceGenerator:
         ]
 
         total_amount = 0.0
-        for item in self.order.invoice_items or []:
+        for item in self.input.items:
             quantity = 1
             amount = float(item.amount)
             total_amount += amount
@@ -385,8 +248,8 @@ class InvoiceGenerator:
                 Paragraph(f"${total_amount:.2f}", bold_style),
             ]
         )
-        if self.usd_to_eur_rate:
-            total_amount_eur = total_amount * self.usd_to_eur_rate
+        if self.input.usd_to_eur_rate:
+            total_amount_eur = total_amount * self.input.usd_to_eur_rate
             items_table_data.append(
                 [
                     "",
@@ -446,39 +309,37 @@ class InvoiceGenerator:
 
 
 if __name__ == "__main__":
-    class _DummyItem:
-        def __init__(self, name: str, amount: int):
-            self.name = name
-            self.amount = amount
-            self.is_extra_fee = False
-
-    class _DummyOrder:
-        def __init__(self):
-            self.invoice_type = InvoiceTypeEnum.DEFAULT
-            self.vin = "TESTVIN1234567890"
-            self.created_at = datetime.now(timezone.utc)
-            self.auction = "COPART"
-            self.lot_id = 123456
-            self.vehicle_name = "Test Vehicle"
-            self.location_name = "Test Location"
-            self.user_uuid = "c2ead8a4-36b5-49ba-b884-4ee818ec8ce9"
-            self.invoice_items = [
-                _DummyItem("Vehicle Price", 10000),
-                _DummyItem("Broker Fee", 500),
-                _DummyItem("Insurance", 1000),
-                _DummyItem("Shipping", 100),
-                _DummyItem("Taxes", 100),
-                _DummyItem("Extra Fee", 100),
-                _DummyItem("Total", 12000),
-                _DummyItem('test', 324),
-                _DummyItem('test2', 324),
-                _DummyItem('test3', 324),
-                _DummyItem('test4', 324),
-                _DummyItem('test5', 324),
+    sample_input = InvoiceInput(
+        order=InvoiceOrderSnapshot(
+            id=1,
+            invoice_type=InvoiceTypeEnum.DEFAULT,
+            vin="TESTVIN1234567890",
+            created_at=datetime.now(timezone.utc),
+            auction=AuctionEnum.COPART,
+            lot_id=123456,
+            vehicle_name="Test Vehicle",
+            location_name="Test Location",
+            user_uuid="c2ead8a4-36b5-49ba-b884-4ee818ec8ce9",
+        ),
+        items=tuple(
+            InvoiceItemSnapshot(name=name, amount=amount)
+            for name, amount in [
+                ("Vehicle Price", 10000),
+                ("Broker Fee", 500),
+                ("Insurance", 1000),
+                ("Shipping", 100),
+                ("Taxes", 100),
+                ("Extra Fee", 100),
+                ("Total", 12000),
+                ('test', 324),
+                ('test2', 324),
+                ('test3', 324),
+                ('test4', 324),
+                ('test5', 324),
             ]
-
-    dummy_order = _DummyOrder()
-    generator = InvoiceGenerator(dummy_order)  # type: ignore[arg-type]
+        ),
+    )
+    generator = InvoiceGenerator(sample_input)
     output_file = Path(__file__).resolve().parent / "test_invoice.pdf"
     generator.generate_invoice_based_on_invoice_type(save_path=output_file)
     print(f"Invoice generated at {output_file}")
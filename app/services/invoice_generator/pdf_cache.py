@@ -0,0 +1,231 @@
+import asyncio
+import os
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.logger import logger
+from app.database.models import InvoiceItems, Order
+
+_TOUCHED_ORDERS_KEY = "invoice_pdf_cache_orders"
+
+
+def _write_atomically(path: Path, data: bytes):
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _scan_disk_dir(disk_dir: Path) -> list[tuple[float, str, int, int]]:
+    """``(mtime, key, order_id, size)`` of every cached PDF in ``disk_dir``."""
+    disk_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for entry in os.scandir(disk_dir):
+        order_id, _, key = entry.name.removesuffix(".pdf").partition("-")
+        if not entry.name.endswith(".pdf") or not order_id.isdigit() or not key:
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, key, int(order_id), stat.st_size))
+    return files
+
+
+def _unlink_all(paths: list[Path]):
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+class InvoicePdfCache:
+    """
+    Two tier cache of generated invoice PDFs keyed by ``InvoiceInput.cache_key``.
+
+    Recent PDFs stay in a byte-bounded in-memory LRU; every PDF is also written to a byte-bounded
+    directory so it can be served as a file after it fell out of memory or the process restarted.
+    Keys are content addressed, so stale entries are never served; ``invalidate_order`` only
+    reclaims the space of PDFs whose order or invoice items changed. All file system work runs in
+    worker threads, and a file that disappeared under a disk hit counts as a miss.
+    """
+
+    def __init__(
+            self,
+            memory_max_bytes: int = settings.INVOICE_PDF_CACHE_MEMORY_BYTES,
+            disk_max_bytes: int = settings.INVOICE_PDF_CACHE_DISK_BYTES,
+            disk_dir: str = settings.INVOICE_PDF_CACHE_DIR,
+    ):
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_dir = Path(disk_dir)
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (order_id, size); file names carry both so the index survives restarts
+        self._disk: OrderedDict[str, tuple[int, int]] | None = None
+        self._disk_bytes = 0
+        self._disk_index_lock = asyncio.Lock()
+        self._keys_by_order: dict[int, set[str]] = defaultdict(set)
+        self._unlinks: set[asyncio.Task] = set()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, order_id: int, key: str) -> Path:
+        return self.disk_dir / f"{order_id}-{key}.pdf"
+
+    async def _load_disk_index(self) -> OrderedDict[str, tuple[int, int]]:
+        if self._disk is not None:
+            return self._disk
+        async with self._disk_index_lock:
+            if self._disk is not None:
+                return self._disk
+            files = []
+            if self.disk_max_bytes > 0:
+                files = await asyncio.to_thread(_scan_disk_dir, self.disk_dir)
+            disk = OrderedDict()
+            for _, key, order_id, size in sorted(files):
+                disk[key] = (order_id, size)
+                self._disk_bytes += size
+                self._keys_by_order[order_id].add(key)
+            self._disk = disk
+        return self._disk
+
+    async def get(self, key: str) -> bytes | None:
+        """PDF bytes from memory or the disk cache, or ``None`` on a miss."""
+        pdf_bytes = self._memory.get(key)
+        if pdf_bytes is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return pdf_bytes
+
+        disk = await self._load_disk_index()
+        entry = disk.get(key)
+        if entry is not None:
+            order_id = entry[0]
+            try:
+                pdf_bytes = await asyncio.to_thread(self._path(order_id, key).read_bytes)
+            except OSError:
+                # Evicted or invalidated while we were reading; the caller renders it again
+                if key in disk:
+                    self._forget_disk(key)
+            else:
+                if key in disk:
+                    disk.move_to_end(key)
+                self.disk_hits += 1
+                self._store_memory(key, pdf_bytes)
+                self._keys_by_order[order_id].add(key)
+                return pdf_bytes
+
+        self.misses += 1
+        return None
+
+    async def put(self, order_id: int, key: str, pdf_bytes: bytes):
+        self._store_memory(key, pdf_bytes)
+        self._keys_by_order[order_id].add(key)
+
+        disk = await self._load_disk_index()
+        if self.disk_max_bytes <= 0 or len(pdf_bytes) > self.disk_max_bytes or key in disk:
+            return
+        path = self._path(order_id, key)
+        try:
+            await asyncio.to_thread(_write_atomically, path, pdf_bytes)
+        except OSError as e:
+            logger.warning("Failed to write invoice PDF to disk cache", extra={"order_id": order_id, "error": str(e)})
+            return
+        if key in disk:
+            return
+        disk[key] = (order_id, len(pdf_bytes))
+        self._disk_bytes += len(pdf_bytes)
+        evicted = []
+        while self._disk_bytes > self.disk_max_bytes:
+            evicted.append(self._forget_disk(next(iter(disk))))
+            self.evictions += 1
+        if evicted:
+            await asyncio.to_thread(_unlink_all, evicted)
+
+    def _store_memory(self, key: str, pdf_bytes: bytes):
+        if len(pdf_bytes) > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = pdf_bytes
+        self._memory_bytes += len(pdf_bytes)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _forget_disk(self, key: str) -> Path:
+        """Drop ``key`` from the disk index and return the path of its file, left for the caller to unlink."""
+        order_id, size = self._disk.pop(key)
+        self._disk_bytes -= size
+        self._keys_by_order[order_id].discard(key)
+        return self._path(order_id, key)
+
+    def _unlink_in_background(self, paths: list[Path]):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _unlink_all(paths)
+            return
+        task = loop.create_task(asyncio.to_thread(_unlink_all, paths))
+        self._unlinks.add(task)
+        task.add_done_callback(self._unlinks.discard)
+
+    def invalidate_order(self, order_id: int):
+        keys = self._keys_by_order.pop(order_id, set())
+        removed = []
+        for key in keys:
+            pdf_bytes = self._memory.pop(key, None)
+            if pdf_bytes is not None:
+                self._memory_bytes -= len(pdf_bytes)
+            if self._disk is not None and key in self._disk:
+                removed.append(self._forget_disk(key))
+        # Called from a synchronous commit hook, so the files go in a worker thread
+        if removed:
+            self._unlink_in_background(removed)
+        if keys:
+            logger.debug("Invoice PDF cache invalidated", extra={"order_id": order_id, "entries": len(keys)})
+
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._disk or ()),
+            "disk_bytes": self._disk_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+invoice_pdf_cache = InvoicePdfCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_touched_orders(session: Session, _flush_context):
+    touched = session.info.setdefault(_TOUCHED_ORDERS_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Order):
+            touched.add(obj.id)
+        elif isinstance(obj, InvoiceItems):
+            touched.add(obj.order_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_touched_orders(session: Session):
+    for order_id in session.info.pop(_TOUCHED_ORDERS_KEY, ()):
+        invoice_pdf_cache.invalidate_order(order_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_touched_orders(session: Session, _previous_transaction):
+    session.info.pop(_TOUCHED_ORDERS_KEY, None)
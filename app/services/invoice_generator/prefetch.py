@@ -0,0 +1,69 @@
+import asyncio
+from typing import Sequence
+
+import grpc.aio
+
+from app.core.logger import logger
+from app.database.models import Order
+from app.rpc_client.calculator import DetailedInfoService
+from app.rpc_client.circuit_breaker import CircuitOpenError
+from app.services.invoice_generator.snapshot import (
+    InvoiceInput,
+    InvoiceItemSnapshot,
+    InvoiceOrderSnapshot,
+    InvoiceUserSnapshot,
+)
+from app.services.user_info import get_user_profile
+
+
+async def get_usd_to_eur_rate() -> float | None:
+    try:
+        async with DetailedInfoService() as calculator_client:
+            rate = await calculator_client.get_rate()
+    except (grpc.aio.AioRpcError, CircuitOpenError):
+        logger.warning("Calculator RPC failed while fetching USD/EUR rate")
+        return None
+    if not rate:
+        logger.warning("USD/EUR rate not available for invoice")
+    return rate or None
+
+
+async def get_invoice_user(user_uuid: str) -> InvoiceUserSnapshot | None:
+    try:
+        user = await get_user_profile(user_uuid)
+    except (grpc.aio.AioRpcError, CircuitOpenError):
+        # Ignore RPC failures to avoid blocking invoice generation; the invoice names the user uuid
+        logger.warning("Auth RPC failed while fetching invoice user", extra={"user_uuid": user_uuid})
+        return None
+    return InvoiceUserSnapshot.model_validate(user)
+
+
+def build_invoice_input(
+        order: Order,
+        user: InvoiceUserSnapshot | None,
+        usd_to_eur_rate: float | None,
+) -> InvoiceInput:
+    """``order`` must have its ``invoice_items`` loaded."""
+    return InvoiceInput(
+        order=InvoiceOrderSnapshot.model_validate(order),
+        items=tuple(InvoiceItemSnapshot.model_validate(item) for item in order.invoice_items),
+        user=user,
+        usd_to_eur_rate=usd_to_eur_rate,
+    )
+
+
+async def prefetch_invoice_input(order: Order) -> InvoiceInput:
+    user, usd_to_eur_rate = await asyncio.gather(get_invoice_user(order.user_uuid), get_usd_to_eur_rate())
+    logger.info("Invoice input prefetched", extra={"order_id": order.id, "usd_to_eur_rate": usd_to_eur_rate})
+    return build_invoice_input(order, user, usd_to_eur_rate)
+
+
+async def prefetch_invoice_inputs(orders: Sequence[Order]) -> list[InvoiceInput]:
+    """Inputs for several orders: the rate is fetched once and every distinct user once, concurrently."""
+    user_uuids = list({order.user_uuid for order in orders})
+    usd_to_eur_rate, *users = await asyncio.gather(
+        get_usd_to_eur_rate(),
+        *(get_invoice_user(user_uuid) for user_uuid in user_uuids),
+    )
+    users_by_uuid = dict(zip(user_uuids, users))
+    return [build_invoice_input(order, users_by_uuid[order.user_uuid], usd_to_eur_rate) for order in orders]
@@ -0,0 +1,101 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.config import settings
+from app.core.logger import logger
+from app.services.invoice_generator.generator import InvoiceGenerator
+from app.services.invoice_generator.snapshot import InvoiceInput
+from app.services.invoice_generator.template import warm_up_invoice_templates
+
+
+class InvoiceRenderUnavailableError(Exception):
+    """The render pool is saturated or lost its workers; the caller should retry later."""
+
+
+def _render(invoice_input: InvoiceInput) -> bytes:
+    return InvoiceGenerator(invoice_input).generate_invoice_based_on_invoice_type()
+
+
+class InvoiceRenderPool:
+    """
+    Renders invoice PDFs in worker processes so ReportLab never blocks the event loop.
+
+    Workers receive a picklable ``InvoiceInput`` and send back the PDF bytes. At most ``workers + max_queue`` renders are admitted at once; further calls fail fast with
+    ``InvoiceRenderUnavailableError`` instead of piling up behind busy workers.
+    """
+
+    def __init__(
+            self,
+            workers: int = settings.INVOICE_RENDER_WORKERS,
+            max_queue: int = settings.INVOICE_RENDER_MAX_QUEUE,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: ProcessPoolExecutor | None = None
+        self._admitted = 0
+
+        self.rendered = 0
+        self.rejected = 0
+
+    def start(self):
+        if self._executor is not None:
+            return
+        # spawn: forking would copy the event loop, gRPC channels and the DB pool into the workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            # Fonts, styles and logo are prepared once per worker, not on the first request it serves
+            initializer=warm_up_invoice_templates,
+        )
+        logger.info("Invoice render pool started", extra={"workers": self.workers, "max_queue": self.max_queue})
+
+    def close(self):
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        logger.info("Invoice render pool stopped", extra={"rendered": self.rendered, "rejected": self.rejected})
+
+    async def render(self, invoice_input: InvoiceInput) -> bytes:
+        if self._admitted >= self.workers + self.max_queue:
+            self.rejected += 1
+            logger.warning(
+                "Invoice render pool saturated, rejecting render",
+                extra={"order_id": invoice_input.order.id, "admitted": self._admitted},
+            )
+            raise InvoiceRenderUnavailableError("Invoice render pool is saturated")
+
+        # Scripts and one-off jobs render without the app lifespan having started the pool
+        self.start()
+        executor = self._executor
+        self._admitted += 1
+        try:
+            pdf_bytes = await asyncio.get_running_loop().run_in_executor(
+                executor, _render, invoice_input
+            )
+        except BrokenProcessPool as e:
+            logger.error("Invoice render worker died, restarting pool", extra={"order_id": invoice_input.order.id})
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            raise InvoiceRenderUnavailableError("Invoice render worker died") from e
+        finally:
+            self._admitted -= 1
+
+        self.rendered += 1
+        return pdf_bytes
+
+    def stats(self) -> dict:
+        return {
+            "running": self._executor is not None,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "admitted": self._admitted,
+            "rendered": self.rendered,
+            "rejected": self.rejected,
+        }
+
+
+invoice_render_pool = InvoiceRenderPool()
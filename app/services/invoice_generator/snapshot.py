@@ -0,0 +1,64 @@
+import hashlib
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.enums.auction import AuctionEnum
+from app.enums.order import InvoiceTypeEnum
+from app.services.invoice_generator.template import LAYOUT_VERSION
+
+
+class InvoiceItemSnapshot(BaseModel):
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    name: str
+    amount: int
+
+
+class InvoiceOrderSnapshot(BaseModel):
+    """Detached, picklable copy of the order fields an invoice is rendered from."""
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    id: int
+    invoice_type: InvoiceTypeEnum
+    vin: str
+    created_at: datetime | None = None
+    auction: AuctionEnum | None = None
+    lot_id: int
+    vehicle_name: str
+    location_name: str
+    user_uuid: str
+
+
+class InvoiceUserSnapshot(BaseModel):
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    first_name: str = ""
+    last_name: str = ""
+    email: str = ""
+    phone_number: str = ""
+
+
+class InvoiceInput(BaseModel):
+    """
+    Everything one invoice render consumes, resolved up front by the prefetch stage.
+
+    Rendering an ``InvoiceInput`` performs no I/O, so it can run in any process and be cached by
+    ``cache_key``.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    order: InvoiceOrderSnapshot
+    items: tuple[InvoiceItemSnapshot, ...] = ()
+    user: InvoiceUserSnapshot | None = None
+    usd_to_eur_rate: float | None = None
+
+    @property
+    def invoice_type(self) -> InvoiceTypeEnum:
+        return self.order.invoice_type
+
+    def cache_key(self) -> str:
+        """Hash of exactly what gets rendered; any change to the inputs yields a new key."""
+        digest = hashlib.sha256(f"{LAYOUT_VERSION}:".encode())
+        digest.update(self.model_dump_json().encode())
+        return digest.hexdigest()
@@ -0,0 +1,205 @@
+from dataclasses import dataclass
+from functools import cache
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image as PILImage
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from app.enums.order import InvoiceTypeEnum
+from app.services.invoice_generator.invoice_types import BaseInvoice, InvoiceTypes
+
+FONT_DIR = Path(__file__).resolve().parent / "fonts"
+
+# Part of every cached invoice's key: bump whenever the rendered output changes
+LAYOUT_VERSION = 1
+
+LOGO_SIZE_PT = 80
+# Print resolution the logo is resampled to; the source PNG is far larger than it is drawn
+LOGO_DPI = 300
+
+INVOICE_INFO = {
+    InvoiceTypeEnum.DEFAULT: InvoiceTypes.get_default_info,
+}
+
+
+@cache
+def _register_fonts() -> tuple[str, str]:
+    """Parse and register the DejaVu TTFs once per process, falling back to Helvetica."""
+    regular_font = FONT_DIR / "dejavu-sans.ttf"
+    bold_font = FONT_DIR / "dejavu-sans-bold.ttf"
+    try:
+        if regular_font.exists() and bold_font.exists():
+            pdfmetrics.registerFont(TTFont("DejaVuSans", str(regular_font)))
+            pdfmetrics.registerFont(TTFont("DejaVuSans-Bold", str(bold_font)))
+            return "DejaVuSans", "DejaVuSans-Bold"
+    except Exception:
+        # fall back silently to Helvetica
+        pass
+    return "Helvetica", "Helvetica-Bold"
+
+
+def _build_styles(font_name: str, font_bold: str) -> dict[str, ParagraphStyle]:
+    styles = getSampleStyleSheet()
+    header_title = ParagraphStyle(
+        "HeaderTitleStyle",
+        parent=styles["Heading1"],
+        fontSize=36,
+        textColor=colors.black,
+        fontName=font_bold,
+        leading=40,
+        spaceAfter=0,
+        spaceBefore=0,
+        leftIndent=10,
+    )
+    header_subtitle = ParagraphStyle(
+        "HeaderSubtitleStyle",
+        parent=styles["Normal"],
+        fontSize=9,
+        textColor=colors.black,
+        fontName=font_name,
+        leading=10,
+        spaceAfter=0,
+        spaceBefore=0,
+        leftIndent=10,
+        rightIndent=10,
+    )
+    ten = ParagraphStyle(
+        "TenStyle",
+        parent=styles["Normal"],
+        fontSize=10,
+        fontName=font_name,
+        textColor=colors.black,
+    )
+    return {
+        "header_title": header_title,
+        "header_subtitle": header_subtitle,
+        "title_center": ParagraphStyle(
+            "HeaderTitleCenterStyle",
+            parent=header_title,
+            alignment=TA_CENTER,
+            leftIndent=0,
+        ),
+        "subtitle_center": ParagraphStyle(
+            "HeaderSubtitleCenterStyle",
+            parent=header_subtitle,
+            alignment=TA_CENTER,
+            leftIndent=0,
+        ),
+        "invoice_title": ParagraphStyle(
+            "InvoiceTitleStyle",
+            parent=styles["Heading1"],
+            fontSize=18,
+            alignment=1,
+            spaceBefore=1,
+            spaceAfter=1,
+            fontName=font_bold,
+            textColor=colors.black,
+        ),
+        "bold": ParagraphStyle(
+            "BoldStyle",
+            parent=styles["Heading4"],
+            fontSize=10,
+            fontName=font_bold,
+            textColor=colors.black,
+        ),
+        "ten": ten,
+        "ten_center": ParagraphStyle(
+            "TenStyleCenter",
+            parent=ten,
+            alignment=1,
+        ),
+        "normal": ParagraphStyle(
+            "NormalStyle",
+            parent=styles["Normal"],
+            fontSize=8,
+            fontName=font_name,
+            textColor=colors.black,
+        ),
+        "bold_descriptions": ParagraphStyle(
+            "BoldDescriptionsStyle",
+            parent=styles["Normal"],
+            fontSize=8,
+            fontName=font_bold,
+            textColor=colors.black,
+        ),
+        "delivery_terms": ParagraphStyle(
+            "DeliveryTerms",
+            fontName=font_name,
+            fontSize=7,
+            textColor=colors.black,
+            leftIndent=0,
+        ),
+        "item_text": ParagraphStyle(
+            "ItemTextStyle",
+            parent=styles["Normal"],
+            fontSize=9,
+            fontName=font_name,
+            textColor=colors.black,
+        ),
+        "thank_you": ParagraphStyle(
+            "ThankYouStyle",
+            parent=styles["Normal"],
+            fontSize=8,
+            fontName=font_name,
+            alignment=1,
+            textColor=colors.black,
+        ),
+    }
+
+
+def _load_logo(logo_path: str | None, dpi: int | None) -> bytes | None:
+    """PNG bytes of the logo, resampled to ``dpi`` at its drawn size (``None`` keeps the source)."""
+    if not logo_path or not Path(logo_path).exists():
+        return None
+    try:
+        with PILImage.open(logo_path) as image:
+            if dpi:
+                side = round(LOGO_SIZE_PT / 72 * dpi)
+                if max(image.size) > side:
+                    image = image.resize((side, side), PILImage.Resampling.LANCZOS)
+            buffer = BytesIO()
+            image.save(buffer, format="PNG")
+    except Exception:
+        return None
+    return buffer.getvalue()
+
+
+@dataclass(frozen=True)
+class InvoiceTemplate:
+    """Everything about an invoice that does not depend on the order: layout info, fonts, styles and logo."""
+
+    info: BaseInvoice
+    font_name: str
+    font_bold: str
+    styles: dict[str, ParagraphStyle]
+    logo_png: bytes | None
+
+    @classmethod
+    def compile(cls, info: BaseInvoice, logo_dpi: int | None = LOGO_DPI) -> "InvoiceTemplate":
+        font_name, font_bold = _register_fonts()
+        return cls(
+            info=info,
+            font_name=font_name,
+            font_bold=font_bold,
+            styles=_build_styles(font_name, font_bold),
+            logo_png=_load_logo(info.logo_path, logo_dpi),
+        )
+
+
+@cache
+def get_invoice_template(invoice_type: InvoiceTypeEnum) -> InvoiceTemplate:
+    """Template for ``invoice_type``, compiled on first use and reused for every later render."""
+    info_getter = INVOICE_INFO.get(invoice_type)
+    if not info_getter:
+        raise ValueError(f"Unsupported invoice type: {invoice_type}")
+    return InvoiceTemplate.compile(info_getter())
+
+
+def warm_up_invoice_templates():
+    for invoice_type in INVOICE_INFO:
+        get_invoice_template(invoice_type)
@@ -0,0 +1,127 @@
+import asyncio
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import Any, Awaitable
+
+import grpc
+import grpc.aio
+from rfc9457 import BadRequestProblem, NotFoundProblem
+
+from app.core.logger import logger
+from app.rpc_client.calculator import DetailedInfoService
+from app.rpc_client.circuit_breaker import CircuitOpenError
+from app.rpc_client.gen.python.calculator.v1 import calculator_pb2
+from app.services.user_info import fetch_user_identity
+
+
+@dataclass
+class OrderLookups:
+    user_identity: dict[str, str] | None = None
+    location: calculator_pb2.GetDetailedLocationResponse | None = None
+    fee_type: calculator_pb2.GetDetailedFeeTypeResponse | None = None
+    destination: calculator_pb2.GetDetailedDestinationResponse | None = None
+    terminal: calculator_pb2.GetDetailedTerminalResponse | None = None
+
+
+class _LookupFailed(Exception):
+    def __init__(self, name: str, error: Exception, not_found_detail: str | None = None):
+        super().__init__(name)
+        self.name = name
+        self.error = error
+        self.not_found_detail = not_found_detail
+
+
+async def _lookup(name: str, call: Awaitable[Any], not_found_detail: str | None = None) -> Any:
+    try:
+        return await call
+    except (grpc.aio.AioRpcError, CircuitOpenError, TimeoutError) as e:
+        raise _LookupFailed(name, e, not_found_detail) from e
+
+
+def _raise_lookup_problem(failures: tuple[_LookupFailed, ...], log_context: dict[str, Any]):
+    # An open breaker wins: it is answered with 503 + Retry-After by the app's problem handler
+    failure = next((f for f in failures if isinstance(f.error, CircuitOpenError)), failures[0])
+    error = failure.error
+    if isinstance(error, CircuitOpenError):
+        logger.warning(
+            "Reference lookup skipped, circuit breaker open",
+            extra={**log_context, "lookup": failure.name, "target": error.target},
+        )
+        raise error
+    if isinstance(error, TimeoutError):
+        logger.error("Reference lookup timed out", extra={**log_context, "lookup": failure.name})
+        raise BadRequestProblem(f"Lookup of {failure.name} timed out")
+    logger.error(
+        "Reference lookup failed",
+        extra={
+            **log_context,
+            "lookup": failure.name,
+            "status_code": error.code().name if error.code() else None,
+            "details": error.details(),
+        },
+    )
+    if error.code() == grpc.StatusCode.NOT_FOUND:
+        raise NotFoundProblem(failure.not_found_detail or error.details())
+    raise BadRequestProblem(error.details())
+
+
+async def fetch_order_lookups(
+    *,
+    user_uuid: str | None = None,
+    location_id: int | None = None,
+    fee_type_id: int | None = None,
+    destination_id: int | None = None,
+    terminal_id: int | None = None,
+    log_context: dict[str, Any] | None = None,
+) -> OrderLookups:
+    """
+    Resolve the auth and detailed-info data an order needs, issuing all requested lookups concurrently.
+
+    Lookups whose argument is ``None`` are skipped. The first failed lookup cancels the rest and is
+    mapped to ``NotFoundProblem`` (gRPC NOT_FOUND) or ``BadRequestProblem`` (other RPC errors and
+    timeouts); an open circuit breaker is re-raised as ``CircuitOpenError`` so it becomes a 503.
+    """
+    tasks: dict[str, asyncio.Task] = {}
+    needs_detailed_info = any(
+        value is not None for value in (location_id, fee_type_id, destination_id, terminal_id)
+    )
+
+    async with AsyncExitStack() as stack:
+        detailed_info_service = None
+        if needs_detailed_info:
+            detailed_info_service = await stack.enter_async_context(DetailedInfoService())
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                if user_uuid is not None:
+                    tasks["user_identity"] = tg.create_task(
+                        _lookup("user_identity", fetch_user_identity(user_uuid))
+                    )
+                if location_id is not None:
+                    tasks["location"] = tg.create_task(
+                        _lookup("location", detailed_info_service.get_detailed_location(location_id=location_id))
+                    )
+                if fee_type_id is not None:
+                    tasks["fee_type"] = tg.create_task(
+                        _lookup("fee_type", detailed_info_service.get_detailed_fee_type(fee_type_id=fee_type_id))
+                    )
+                if destination_id is not None:
+                    tasks["destination"] = tg.create_task(
+                        _lookup(
+                            "destination",
+                            detailed_info_service.get_detailed_destination(destination_id=destination_id),
+                            not_found_detail="Destination not found",
+                        )
+                    )
+                if terminal_id is not None:
+                    tasks["terminal"] = tg.create_task(
+                        _lookup(
+                            "terminal",
+                            detailed_info_service.get_detailed_terminal(terminal_id=terminal_id),
+                            not_found_detail="Terminal not found",
+                        )
+                    )
+        except* _LookupFailed as group:
+            _raise_lookup_problem(group.exceptions, log_context or {})
+
+    return OrderLookups(**{name: task.result() for name, task in tasks.items()})
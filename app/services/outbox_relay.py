@@ -0,0 +1,233 @@
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.logger import logger
+from app.database.crud import OutboxEventService
+from app.database.db.session import AsyncSessionLocal
+from app.database.models import OutboxEvent
+from app.database.schemas import OutboxEventCreate
+from app.enums.outbox import OutboxEventType
+from app.services.rabbit_service.service import PooledRabbitMQPublisher, rabbit_publisher
+
+OutboxHandler = Callable[[OutboxEvent, PooledRabbitMQPublisher], Awaitable[None]]
+
+# Arbitrary constant shared by all replicas; only the holder of this advisory lock relays
+_RELAY_LOCK_KEY = 0x6F7574626F78
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class OutboxRelay:
+    """
+    Background task draining ``outbox_event`` to RabbitMQ in batches.
+
+    Events of one order are published strictly in id order: a failed event is retried with
+    exponential backoff and holds back the later events of the same order, while other orders
+    keep flowing. After ``max_attempts`` failures the event is parked (``failed_at``) and the
+    order's later events go ahead. Events are marked published only after the broker confirmed
+    them, so delivery is at-least-once; every message carries a stable ``message_id`` for
+    deduplication downstream. On PostgreSQL an advisory lock keeps a single relay active across replicas.
+    """
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+            publisher: PooledRabbitMQPublisher = rabbit_publisher,
+            batch_size: int = settings.OUTBOX_BATCH_SIZE,
+            poll_interval: float = settings.OUTBOX_POLL_INTERVAL_S,
+            max_backoff: float = settings.OUTBOX_MAX_BACKOFF_S,
+            max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+            retention: float = settings.OUTBOX_RETENTION_S,
+            cleanup_interval: float = settings.OUTBOX_CLEANUP_INTERVAL_S,
+    ):
+        self.session_factory = session_factory
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self.cleanup_interval = cleanup_interval
+
+        self._handlers: dict[str, OutboxHandler] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._running = False
+        self._last_cleanup = 0.0
+
+        self.published = 0
+        self.failed = 0
+        self.parked = 0
+
+    def handler(self, event_type: OutboxEventType):
+        def register(func: OutboxHandler) -> OutboxHandler:
+            self._handlers[event_type.value] = func
+            return func
+        return register
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    async def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "Outbox relay started",
+            extra={"batch_size": self.batch_size, "poll_interval": self.poll_interval},
+        )
+
+    async def close(self):
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=settings.RABBITMQ_PUBLISH_TIMEOUT_S)
+        except TimeoutError:
+            logger.warning("Outbox relay did not stop in time, cancelling")
+        self._task = None
+        logger.info("Outbox relay stopped", extra={"published": self.published, "failed": self.failed})
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def _run(self):
+        while self._running:
+            drained = 0
+            try:
+                drained = await self.drain_once()
+                await self._cleanup_if_due()
+            except Exception as e:
+                logger.error("Outbox relay iteration failed", extra={"error": str(e)}, exc_info=True)
+
+            if drained < self.batch_size and self._running:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+
+    async def _acquire_lock(self, session: AsyncSession) -> bool:
+        if session.bind.dialect.name != "postgresql":
+            return True
+        result = await session.execute(select(func.pg_try_advisory_xact_lock(_RELAY_LOCK_KEY)))
+        return bool(result.scalar_one())
+
+    async def drain_once(self) -> int:
+        """Publish one batch of pending events; returns how many events were published."""
+        async with self.session_factory() as session:
+            if not await self._acquire_lock(session):
+                return 0
+
+            outbox_service = OutboxEventService(session)
+            now = datetime.now(timezone.utc)
+            events = await outbox_service.get_pending(self.batch_size, now)
+            if not events:
+                await session.commit()
+                return 0
+
+            chains: dict[int, list[OutboxEvent]] = defaultdict(list)
+            for outbox_event in events:
+                chains[outbox_event.order_id].append(outbox_event)
+
+            results = await asyncio.gather(*(self._publish_chain(chain, now) for chain in chains.values()))
+
+            published_ids = [event_id for chain_ids, _ in results for event_id in chain_ids]
+            await outbox_service.mark_published(published_ids)
+            for _, failure in results:
+                if failure is None:
+                    continue
+                failed_event, error = failure
+                if failed_event.attempts + 1 >= self.max_attempts:
+                    self.parked += 1
+                    logger.error(
+                        "Outbox event parked after exhausting its attempts",
+                        extra={
+                            "event_id": failed_event.id,
+                            "order_id": failed_event.order_id,
+                            "event_type": failed_event.event_type,
+                            "attempts": failed_event.attempts + 1,
+                            "error": error,
+                        },
+                    )
+                    await outbox_service.mark_parked(failed_event.id, error)
+                    continue
+                retry_in = timedelta(seconds=min(self.max_backoff, 2 ** failed_event.attempts))
+                await outbox_service.mark_failed(failed_event.id, error, retry_in)
+            # Committing also releases the advisory lock
+            await session.commit()
+
+        self.published += len(published_ids)
+        return len(published_ids)
+
+    async def _publish_chain(
+            self,
+            chain: list[OutboxEvent],
+            now: datetime,
+    ) -> tuple[list[int], tuple[OutboxEvent, str] | None]:
+        published_ids: list[int] = []
+        for outbox_event in chain:
+            if _as_utc(outbox_event.available_at) > now:
+                break
+
+            handler = self._handlers.get(outbox_event.event_type)
+            try:
+                if handler is None:
+                    raise LookupError(f"No outbox handler for event type {outbox_event.event_type!r}")
+                await handler(outbox_event, self.publisher)
+            except Exception as e:
+                self.failed += 1
+                logger.warning(
+                    "Outbox event publish failed, holding back later events of the order",
+                    extra={
+                        "event_id": outbox_event.id,
+                        "order_id": outbox_event.order_id,
+                        "event_type": outbox_event.event_type,
+                        "attempts": outbox_event.attempts + 1,
+                        "error": str(e),
+                    },
+                )
+                return published_ids, (outbox_event, str(e))
+            published_ids.append(outbox_event.id)
+        return published_ids, None
+
+    async def _cleanup_if_due(self):
+        if time.monotonic() - self._last_cleanup < self.cleanup_interval:
+            return
+        self._last_cleanup = time.monotonic()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.retention)
+        async with self.session_factory() as session:
+            deleted = await OutboxEventService(session).delete_published_before(cutoff)
+            await session.commit()
+        if deleted:
+            logger.info("Published outbox events cleaned up", extra={"deleted": deleted})
+
+    def stats(self) -> dict:
+        return {"running": self._running, "published": self.published, "failed": self.failed, "parked": self.parked}
+
+
+outbox_relay = OutboxRelay()
+
+
+def add_outbox_event(session: AsyncSession, data: OutboxEventCreate) -> OutboxEvent:
+    """
+    Stage an outbox event in ``session``'s current transaction.
+
+    Nothing is written until the caller commits; the relay is woken right after that commit.
+    """
+    outbox_event = OutboxEventService(session).add(data)
+    event.listen(session.sync_session, "after_commit", lambda _: outbox_relay.notify(), once=True)
+    return outbox_event
@@ -1,21 +1,85 @@
+import asyncio
+import json
+import time
 from abc import abstractmethod, ABC
-from typing import Optional
+from contextlib import asynccontextmanager
+from datetime import datetime, UTC
+from typing import Hashable, Optional
 
-from aio_pika.abc import AbstractRobustConnection, AbstractRobustExchange, AbstractRobustQueue, \
+from aio_pika.abc import AbstractRobustChannel, AbstractRobustConnection, AbstractRobustExchange, AbstractRobustQueue, \
     AbstractIncomingMessage, ConsumerTag, ExchangeType
 
 from app.config import settings
 from app.core.logger import logger
+from app.services.rabbit_service.dead_letters import (
+    FAILED_AT_HEADER,
+    LAST_ERROR_HEADER,
+    RETRY_ATTEMPT_HEADER,
+    DeadLetterQueue,
+    attempt_of,
+    copy_message,
+    routing_key_of,
+)
+from app.services.rabbit_service.metrics import ConsumerMetrics
+
+
+class _KeyedLocks:
+    """One asyncio.Lock per key, dropped once nobody holds or waits for it."""
+
+    def __init__(self):
+        self._locks: dict[Hashable, tuple[asyncio.Lock, list[int]]] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable | None):
+        if key is None:
+            yield
+            return
+        lock, users = self._locks.setdefault(key, (asyncio.Lock(), [0]))
+        users[0] += 1
+        try:
+            async with lock:
+                yield
+        finally:
+            users[0] -= 1
+            if users[0] == 0:
+                del self._locks[key]
+
+
+def _message_lag_s(message: AbstractIncomingMessage) -> float | None:
+    sent_at = message.timestamp
+    if sent_at is None:
+        try:
+            sent_at = datetime.fromisoformat(json.loads(message.body).get("timestamp"))
+        except (TypeError, ValueError, AttributeError):
+            return None
+    if sent_at.tzinfo is None:
+        sent_at = sent_at.replace(tzinfo=UTC)
+    return max(0.0, (datetime.now(UTC) - sent_at).total_seconds())
 
 
 class RabbitBaseService(ABC):
+    """
+    Queue consumer base.
+
+    aio-pika runs every delivery in its own task, so up to ``prefetch_count`` messages are in
+    flight. On top of that each routing key gets its own concurrency limit, and messages sharing a
+    ``serialization_key`` are processed one at a time.
+
+    A failed message is acked and republished to a delay queue (TTL, then dead-lettered back to
+    this queue) with its attempt count in a header; after ``max_retries`` attempts it is parked
+    in the ``<queue>.dead`` queue, from where it can be inspected and replayed.
+    """
+
     def __init__(self, connection: AbstractRobustConnection,
                  routing_keys: list[str],
                  exchange_name: str = settings.RABBITMQ_EXCHANGE_NAME,
-                 prefetch_count: int = 10,
+                 prefetch_count: int = settings.RABBITMQ_PREFETCH_COUNT,
                  durable: bool = True,
                  queue_name: str = settings.RABBITMQ_QUEUE_NAME,
-                 max_retries: int = 3):
+                 max_retries: int = settings.RABBITMQ_MAX_RETRIES,
+                 retry_delays: list[float] | None = None,
+                 concurrency: dict[str, int] | None = None,
+                 default_concurrency: int = settings.RABBITMQ_CONSUMER_DEFAULT_CONCURRENCY):
 
         self.queue_name = queue_name
         self.connection = connection
@@ -24,11 +88,29 @@ class RabbitBaseService(ABC):
         self.durable = durable
         self.routing_keys = routing_keys
         self.max_retries = max_retries
-
+        self.retry_delays = retry_delays or settings.RABBITMQ_RETRY_DELAYS_S
+        self.dead_letter_queue_name = f"{queue_name}.dead"
+        self.concurrency = settings.RABBITMQ_CONSUMER_CONCURRENCY if concurrency is None else concurrency
+        self.default_concurrency = default_concurrency
+        # Routing keys a delivery can legitimately carry; anything else is reported as "other"
+        self._known_routing_keys = frozenset([
+            *routing_keys,
+            queue_name,
+            self.dead_letter_queue_name,
+            *(self._delay_queue_name(delay) for delay in self.retry_delays),
+        ])
+
+        self.channel: Optional[AbstractRobustChannel] = None
         self.exchange: Optional[AbstractRobustExchange] = None
         self.queue: Optional[AbstractRobustQueue] = None
         self.consumer_tag: Optional[ConsumerTag] = None
 
+        self.metrics = ConsumerMetrics(queue_name)
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._serial_locks = _KeyedLocks()
+        self._depth_task: asyncio.Task | None = None
+        self.dead_letters = DeadLetterQueue(connection, self.dead_letter_queue_name, queue_name)
+
         logger.info(
             "RabbitService initialized",
             extra={
@@ -36,7 +118,9 @@ class RabbitBaseService(ABC):
                 "exchange_name": self.exchange_name,
                 "routing_keys": self.routing_keys,
                 "prefetch_count": self.prefetch_count,
-                "max_retries": self.max_retries
+                "max_retries": self.max_retries,
+                "concurrency": self.concurrency,
+                "default_concurrency": self.default_concurrency,
             }
         )
 
@@ -52,6 +136,7 @@ class RabbitBaseService(ABC):
 
             channel = await self.connection.channel()
             await channel.set_qos(prefetch_count=self.prefetch_count)
+            self.channel = channel
 
             self.exchange = await channel.declare_exchange(
                 self.exchange_name,
@@ -85,12 +170,26 @@ class RabbitBaseService(ABC):
                     }
                 )
 
+            for delay in self.retry_delays:
+                await channel.declare_queue(
+                    self._delay_queue_name(delay),
+                    durable=self.durable,
+                    arguments={
+                        "x-message-ttl": int(delay * 1000),
+                        # Expired messages go straight back to this queue via the default exchange
+                        "x-dead-letter-exchange": "",
+                        "x-dead-letter-routing-key": self.queue_name,
+                    },
+                )
+            await channel.declare_queue(self.dead_letter_queue_name, durable=self.durable)
+
             logger.info(
                 "RabbitMQ setup completed successfully",
                 extra={
                     "exchange_name": self.exchange_name,
                     "queue_name": self.queue_name,
-                    "routing_keys": self.routing_keys
+                    "routing_keys": self.routing_keys,
+                    "retry_delays": self.retry_delays,
                 }
             )
 
@@ -113,6 +212,7 @@ class RabbitBaseService(ABC):
         )
 
         self.consumer_tag = await self.queue.consume(self.process_message_wrapper, no_ack=False)
+        self._depth_task = asyncio.create_task(self._sample_queue_depth())
 
         logger.debug(
             "Consumer started",
@@ -124,13 +224,53 @@ class RabbitBaseService(ABC):
 
         logger.info("Consumer is running. Waiting for messages...")
 
+    async def _sample_queue_depth(self):
+        while True:
+            try:
+                declared = await self.channel.declare_queue(self.queue_name, passive=True)
+                self.metrics.queue_depth = declared.declaration_result.message_count
+            except Exception as e:
+                logger.warning("Failed to sample queue depth", extra={"queue_name": self.queue_name, "error": str(e)})
+            await asyncio.sleep(settings.RABBITMQ_QUEUE_DEPTH_SAMPLE_INTERVAL_S)
+
     @abstractmethod
     async def process_message(self, message: AbstractIncomingMessage):
         ...
 
+    def serialization_key(self, message: AbstractIncomingMessage) -> Hashable | None:
+        """Messages with the same non-None key are never processed concurrently."""
+        return None
+
+    def _semaphore(self, routing_key: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(routing_key)
+        if semaphore is None:
+            limit = self.concurrency.get(routing_key, self.default_concurrency)
+            semaphore = self._semaphores[routing_key] = asyncio.Semaphore(max(1, limit))
+        return semaphore
+
+    def _delay_queue_name(self, delay: float) -> str:
+        return f"{self.queue_name}.retry.{delay:g}s"
+
+    def _metric_routing_key(self, message: AbstractIncomingMessage) -> str:
+        """Routing key to label metrics with, clamped so publishers cannot create unbounded series."""
+        routing_key = routing_key_of(message)
+        return routing_key if routing_key in self._known_routing_keys else "other"
+
     async def process_message_wrapper(self, message: AbstractIncomingMessage):
+        routing_key = self._metric_routing_key(message)
+        # Take the serialization lock first so waiting duplicates do not hold a concurrency slot
+        async with self._serial_locks.hold(self.serialization_key(message)), self._semaphore(routing_key):
+            self.metrics.message_started(routing_key, _message_lag_s(message))
+            started = time.perf_counter()
+            succeeded = False
+            try:
+                succeeded = await self._handle_message(message)
+            finally:
+                self.metrics.message_finished(routing_key, time.perf_counter() - started, succeeded)
+
+    async def _handle_message(self, message: AbstractIncomingMessage) -> bool:
         message_id = message.message_id or "unknown"
-        routing_key = message.routing_key
+        routing_key = routing_key_of(message)
         delivery_tag = message.delivery_tag
 
         logger.debug(
@@ -156,6 +296,7 @@ class RabbitBaseService(ABC):
                     "delivery_tag": delivery_tag
                 }
             )
+            return True
 
         except Exception as e:
             logger.error(
@@ -170,33 +311,59 @@ class RabbitBaseService(ABC):
                 exc_info=True
             )
 
-            if message.redelivered or delivery_tag >= self.max_retries:
-                await message.reject(requeue=False)
-                logger.warning(
-                    "Message rejected permanently (max retries reached or redelivered)",
-                    extra={
-                        "message_id": message_id,
-                        "routing_key": routing_key,
-                        "delivery_tag": delivery_tag,
-                        "redelivered": message.redelivered,
-                        "max_retries": self.max_retries
-                    }
-                )
-            else:
-                await message.reject(requeue=True)
-                logger.warning(
-                    "Message rejected and requeued for retry",
-                    extra={
-                        "message_id": message_id,
-                        "routing_key": routing_key,
-                        "delivery_tag": delivery_tag,
-                        "retry_count": delivery_tag
-                    }
-                )
+            await self._retry_or_dead_letter(message, routing_key, e)
+            return False
+
+    async def _retry_or_dead_letter(self, message: AbstractIncomingMessage, routing_key: str, error: Exception):
+        attempt = attempt_of(message) + 1
+        log_extra = {
+            "message_id": message.message_id or "unknown",
+            "routing_key": routing_key,
+            "attempt": attempt,
+            "max_retries": self.max_retries,
+        }
+        if attempt <= self.max_retries:
+            delay = self.retry_delays[min(attempt, len(self.retry_delays)) - 1]
+            target = self._delay_queue_name(delay)
+            log_extra["delay_s"] = delay
+        else:
+            target = self.dead_letter_queue_name
+
+        try:
+            await self.channel.default_exchange.publish(
+                copy_message(
+                    message,
+                    routing_key,
+                    **{
+                        RETRY_ATTEMPT_HEADER: attempt,
+                        LAST_ERROR_HEADER: str(error)[:500],
+                        FAILED_AT_HEADER: datetime.now(UTC).isoformat(),
+                    },
+                ),
+                routing_key=target,
+            )
+        except Exception as publish_error:
+            # Never lose the message: leave it to the broker to redeliver
+            await message.nack(requeue=True)
+            logger.error(
+                "Failed to schedule message retry, requeued",
+                extra={**log_extra, "error": str(publish_error)},
+            )
+            return
+
+        await message.ack()
+        if target == self.dead_letter_queue_name:
+            logger.warning("Message dead-lettered after max retries", extra=log_extra)
+        else:
+            logger.warning("Message scheduled for retry", extra=log_extra)
 
     async def stop_consuming(self):
         logger.info("Stopping message consumption")
 
+        if self._depth_task:
+            self._depth_task.cancel()
+            self._depth_task = None
+
         try:
             await self.connection.close()
 
@@ -0,0 +1,126 @@
+import json
+from datetime import datetime, UTC
+from typing import Any
+
+from aio_pika import DeliveryMode, Message
+from aio_pika.abc import AbstractChannel, AbstractIncomingMessage, AbstractRobustConnection
+
+from app.core.logger import logger
+
+RETRY_ATTEMPT_HEADER = "x-retry-attempt"
+ORIGINAL_ROUTING_KEY_HEADER = "x-original-routing-key"
+LAST_ERROR_HEADER = "x-last-error"
+FAILED_AT_HEADER = "x-failed-at"
+
+
+def _header(message: AbstractIncomingMessage, name: str) -> Any:
+    value = (message.headers or {}).get(name)
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def routing_key_of(message: AbstractIncomingMessage) -> str:
+    """Routing key the message was originally published with, also after a retry or replay."""
+    return _header(message, ORIGINAL_ROUTING_KEY_HEADER) or message.routing_key
+
+
+def attempt_of(message: AbstractIncomingMessage) -> int:
+    try:
+        return int(_header(message, RETRY_ATTEMPT_HEADER) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def copy_message(message: AbstractIncomingMessage, routing_key: str, **headers: Any) -> Message:
+    """Copy of ``message`` for republishing, remembering its original routing key."""
+    return Message(
+        message.body,
+        headers={**(message.headers or {}), ORIGINAL_ROUTING_KEY_HEADER: routing_key, **headers},
+        content_type=message.content_type,
+        correlation_id=message.correlation_id,
+        message_id=message.message_id,
+        timestamp=message.timestamp,
+        delivery_mode=DeliveryMode.PERSISTENT,
+    )
+
+
+class DeadLetterQueue:
+    """Inspect and replay messages that exhausted their retries."""
+
+    def __init__(self, connection: AbstractRobustConnection, queue_name: str, target_queue_name: str):
+        self.connection = connection
+        self.queue_name = queue_name
+        self.target_queue_name = target_queue_name
+        self._channel: AbstractChannel | None = None
+
+    async def _get_channel(self) -> AbstractChannel:
+        if self._channel is None or self._channel.is_closed:
+            self._channel = await self.connection.channel()
+        return self._channel
+
+    async def _fetch(self, limit: int) -> tuple[int, list[AbstractIncomingMessage]]:
+        channel = await self._get_channel()
+        queue = await channel.declare_queue(self.queue_name, durable=True)
+        total = queue.declaration_result.message_count
+        messages = []
+        # Messages stay unacked while collecting, so the same one is never fetched twice
+        for _ in range(min(limit, total)):
+            message = await queue.get(no_ack=False, fail=False)
+            if message is None:
+                break
+            messages.append(message)
+        return total, messages
+
+    @staticmethod
+    def describe(message: AbstractIncomingMessage) -> dict[str, Any]:
+        try:
+            body = json.loads(message.body)
+        except ValueError:
+            body = message.body.decode(errors="replace")
+        return {
+            "message_id": message.message_id,
+            "correlation_id": message.correlation_id,
+            "routing_key": routing_key_of(message),
+            "attempts": attempt_of(message),
+            "error": _header(message, LAST_ERROR_HEADER),
+            "failed_at": _header(message, FAILED_AT_HEADER),
+            "body": body,
+        }
+
+    async def peek(self, limit: int) -> tuple[int, list[dict[str, Any]]]:
+        total, messages = await self._fetch(limit)
+        try:
+            return total, [self.describe(message) for message in messages]
+        finally:
+            for message in messages:
+                await message.nack(requeue=True)
+
+    async def replay(self, limit: int, routing_key: str | None = None) -> tuple[int, int]:
+        """Send up to ``limit`` dead letters (optionally only one routing key) back to the consumer queue."""
+        _, messages = await self._fetch(limit)
+        channel = await self._get_channel()
+        replayed = skipped = 0
+        for message in messages:
+            original_routing_key = routing_key_of(message)
+            if routing_key is not None and original_routing_key != routing_key:
+                await message.nack(requeue=True)
+                skipped += 1
+                continue
+            try:
+                await channel.default_exchange.publish(
+                    copy_message(
+                        message,
+                        original_routing_key,
+                        **{RETRY_ATTEMPT_HEADER: 0, "x-replayed-at": datetime.now(UTC).isoformat()},
+                    ),
+                    routing_key=self.target_queue_name,
+                )
+            except Exception:
+                await message.nack(requeue=True)
+                raise
+            await message.ack()
+            replayed += 1
+        logger.info(
+            "Dead letters replayed",
+            extra={"queue_name": self.queue_name, "replayed": replayed, "skipped": skipped},
+        )
+        return replayed, skipped
@@ -3,4 +3,5 @@ from enum import Enum
 
 class RoutingKeys(str, Enum):
     FILES_UPLOADED = 'files.uploaded'
-    BID_WON = 'bid.you_won_bid'
\ No newline at end of file
+    BID_WON = 'bid.you_won_bid'
+    USER_UPDATED = 'user.updated'
\ No newline at end of file
@@ -0,0 +1,86 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.metrics import AMQP_CONSUME_SECONDS
+
+_RATE_WINDOW_S = 60.0
+
+_consumers: dict[str, "ConsumerMetrics"] = {}
+
+
+@dataclass
+class _RoutingKeyStats:
+    received: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    processing_s_total: float = 0.0
+    processing_s_max: float = 0.0
+    lag_s_last: float | None = None
+    lag_s_max: float = 0.0
+    completed_at: deque = field(default_factory=deque)
+
+    def rate(self, now: float) -> float:
+        while self.completed_at and self.completed_at[0] < now - _RATE_WINDOW_S:
+            self.completed_at.popleft()
+        return len(self.completed_at) / _RATE_WINDOW_S
+
+
+class ConsumerMetrics:
+    """Per routing key throughput, processing time and queue lag of one consumer."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queue_depth: int | None = None
+        self._keys: dict[str, _RoutingKeyStats] = {}
+        _consumers[name] = self
+
+    def _key(self, routing_key: str) -> _RoutingKeyStats:
+        stats = self._keys.get(routing_key)
+        if stats is None:
+            stats = self._keys[routing_key] = _RoutingKeyStats()
+        return stats
+
+    def message_started(self, routing_key: str, lag_s: float | None):
+        stats = self._key(routing_key)
+        stats.received += 1
+        stats.in_flight += 1
+        if lag_s is not None:
+            stats.lag_s_last = lag_s
+            stats.lag_s_max = max(stats.lag_s_max, lag_s)
+
+    def message_finished(self, routing_key: str, duration_s: float, succeeded: bool):
+        stats = self._key(routing_key)
+        stats.in_flight -= 1
+        if succeeded:
+            stats.succeeded += 1
+        else:
+            stats.failed += 1
+        stats.processing_s_total += duration_s
+        stats.processing_s_max = max(stats.processing_s_max, duration_s)
+        stats.completed_at.append(time.monotonic())
+        AMQP_CONSUME_SECONDS.labels(self.name, routing_key, "succeeded" if succeeded else "failed").observe(duration_s)
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        routing_keys = {}
+        for routing_key, stats in self._keys.items():
+            completed = stats.succeeded + stats.failed
+            routing_keys[routing_key] = {
+                "received": stats.received,
+                "succeeded": stats.succeeded,
+                "failed": stats.failed,
+                "in_flight": stats.in_flight,
+                "messages_per_s_1m": round(stats.rate(now), 3),
+                "processing_s_avg": round(stats.processing_s_total / completed, 4) if completed else 0.0,
+                "processing_s_max": round(stats.processing_s_max, 4),
+                "lag_s_last": round(stats.lag_s_last, 3) if stats.lag_s_last is not None else None,
+                "lag_s_max": round(stats.lag_s_max, 3),
+            }
+        return {"queue_depth": self.queue_depth, "routing_keys": routing_keys}
+
+
+def get_consumer_stats() -> dict[str, dict[str, Any]]:
+    return {name: metrics.stats() for name, metrics in _consumers.items()}
@@ -1,16 +1,21 @@
+import asyncio
 import json
+from datetime import datetime, timedelta, timezone
+from typing import Hashable
 
 from aio_pika.abc import AbstractIncomingMessage
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from sqlalchemy.exc import IntegrityError
 
+from app.config import settings
 from app.core.logger import logger
-from app.database.crud import AuctionInvoiceService, CustomInvoiceService, OrderService
-from app.database.schemas import AuctionInvoiceUpdate, CustomInvoiceUpdate
+from app.database.crud import AuctionInvoiceService, CustomInvoiceService, OrderService, ProcessedMessageService
+from app.database.schemas import AuctionInvoiceUpdate, CustomInvoiceUpdate, ProcessedMessageCreate
 from app.enums.auction import AuctionEnum
 from app.enums.custom_invoice_status import FileInvoiceStatus
 from app.services.create_order_from_lot import GenerateFromLot
 from app.services.rabbit_service.base import RabbitBaseService
+from app.services.rabbit_service.dead_letters import routing_key_of
 from app.services.rabbit_service.file_routing_keys import RoutingKeys
 
 
@@ -18,106 +23,169 @@ class OrderRabbitConsumer(RabbitBaseService):
     def __init__(self, db_session_factory: async_sessionmaker[AsyncSession], *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.db_session_factory = db_session_factory
-
+        self._ledger_cleanup_task: asyncio.Task | None = None
+
+    async def set_up(self):
+        await super().set_up()
+        # Earlier releases bound user.updated here; it is consumed per instance by UserEvictionConsumer
+        await self.queue.unbind(self.exchange, routing_key=RoutingKeys.USER_UPDATED.value)
+
+    async def start_consuming(self):
+        await super().start_consuming()
+        self._ledger_cleanup_task = asyncio.create_task(self._clean_up_processed_messages())
+
+    async def stop_consuming(self):
+        if self._ledger_cleanup_task:
+            self._ledger_cleanup_task.cancel()
+            self._ledger_cleanup_task = None
+        await super().stop_consuming()
+
+    async def _clean_up_processed_messages(self):
+        while True:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.PROCESSED_MESSAGE_TTL_S)
+            try:
+                async with self.db_session_factory() as session:
+                    deleted = await ProcessedMessageService(session).delete_processed_before(cutoff)
+                    await session.commit()
+                if deleted:
+                    logger.info("Expired processed messages cleaned up", extra={"deleted": deleted})
+            except Exception as e:
+                logger.warning("Failed to clean up processed messages", extra={"error": str(e)})
+            await asyncio.sleep(settings.PROCESSED_MESSAGE_CLEANUP_INTERVAL_S)
+
+    def serialization_key(self, message: AbstractIncomingMessage) -> Hashable | None:
+        # Duplicate bid-won events for one lot must not race through order creation
+        if routing_key_of(message) != RoutingKeys.BID_WON:
+            return None
+        try:
+            lot_id = json.loads(message.body).get("payload", {}).get("lot_id")
+        except (ValueError, AttributeError):
+            return None
+        return None if lot_id is None else ("lot", lot_id)
+
+    @staticmethod
+    def message_key(message: AbstractIncomingMessage, routing_key: str, body: dict) -> str | None:
+        message_id = message.message_id or message.correlation_id or body.get("correlation_id")
+        return f"{routing_key}:{message_id}" if message_id else None
 
     async def process_message(self, message: AbstractIncomingMessage):
         message_data = message.body.decode("utf-8")
-        payload = json.loads(message_data).get("payload")
-        routing_key = message.routing_key
-
-        logger.info("Received new message", extra={"payload": payload})
-
-
-        if routing_key == RoutingKeys.FILES_UPLOADED:
-
-            async with self.db_session_factory() as session:
-                logger.info("Processing message", extra={"routing_key": routing_key})
-
-                file_id = payload.get("id")
-                status = payload.get("status", "").upper()
-
-                custom_invoice_service = CustomInvoiceService(session)
-                custom_invoice = await custom_invoice_service.get_by_file_id(file_id)
-                if custom_invoice:
-                    if status == "AVAILABLE":
-                        logger.info("Invoice is available", extra={"invoice_id": custom_invoice.id})
-                        await custom_invoice_service.update(
-                            custom_invoice.id,
-                            CustomInvoiceUpdate(status=FileInvoiceStatus.AVAILABLE),
-                        )
-                    elif status == "FAILED":
-                        logger.info("Invoice is failed", extra={"invoice_id": custom_invoice.id})
-                        await custom_invoice_service.delete(custom_invoice.id)
-                    else:
-                        logger.warning("Unprocessable status received", extra={"status": status})
-                else:
-                    auction_invoice_service = AuctionInvoiceService(session)
-                    auction_invoice = await auction_invoice_service.get_by_file_id(file_id)
-                    if auction_invoice:
-                        if status == "AVAILABLE":
-                            logger.info(
-                                "Auction invoice is available",
-                                extra={"invoice_id": auction_invoice.id},
-                            )
-                            await auction_invoice_service.update(
-                                auction_invoice.id,
-                                AuctionInvoiceUpdate(status=FileInvoiceStatus.AVAILABLE),
-                            )
-                        elif status == "FAILED":
-                            logger.info(
-                                "Auction invoice upload failed",
-                                extra={"invoice_id": auction_invoice.id},
-                            )
-                            await auction_invoice_service.delete(auction_invoice.id)
-                        else:
-                            logger.warning("Unprocessable status received", extra={"status": status})
-        elif routing_key == RoutingKeys.BID_WON:
-            logger.info("Bid won received")
-            user_uuid = payload.get("user_uuid")
-            auction = payload.get("auction")
-
-            lot_id = payload.get("lot_id")
-            bid_amount = payload.get("bid_amount")
-            async with self.db_session_factory() as session:
-                order_service = OrderService(session)
-                if await order_service.exists_by_lot_id(lot_id):
+        body = json.loads(message_data)
+        payload = body.get("payload")
+        routing_key = routing_key_of(message)
+        message_key = self.message_key(message, routing_key, body)
+
+        logger.info("Received new message", extra={"payload": payload, "message_key": message_key})
+
+        async with self.db_session_factory() as session:
+            if message_key is not None:
+                processed_message_service = ProcessedMessageService(session)
+                # Checked before any outbound work: a redelivery costs one primary key lookup
+                if await processed_message_service.is_processed(message_key):
                     logger.info(
-                        "Order already exists for lot, skipping duplicate bid won",
-                        extra={"lot_id": lot_id, "user_uuid": user_uuid},
+                        "Message already processed, skipping",
+                        extra={"message_key": message_key, "routing_key": routing_key},
                     )
                     return
-            try:
-                auction_enum = AuctionEnum(auction.upper() if auction else "UNKNOWN")
-            except Exception:
-                logger.exception(
-                    "Unknown auction site for bid won",
-                    extra={"auction_site": auction, "payload": payload},
+                # Written by the handler's own commit, atomically with its side effects
+                processed_message_service.record_on_commit(
+                    ProcessedMessageCreate(message_key=message_key, routing_key=routing_key)
                 )
-                return
 
-            try:
-                generator = GenerateFromLot(
-                    lot_id=lot_id,
-                    auction=auction_enum,
-                    user_uuid=user_uuid,
-                    bid_amount=bid_amount,
-                )
-                await generator.generate()
-            except IntegrityError:
-                logger.info(
-                    "Order already exists (db constraint), skipping duplicate bid won",
-                    extra={"lot_id": lot_id, "auction": auction, "user_uuid": user_uuid},
-                )
-            except Exception as exc:
-                logger.exception(
-                    "Error processing bid won",
-                    extra={
-                        "error": str(exc),
-                        "lot_id": lot_id,
-                        "auction": auction_enum.value if 'auction_enum' in locals() else auction,
-                        "user_uuid": user_uuid,
-                    },
+            if routing_key == RoutingKeys.FILES_UPLOADED:
+                await self._handle_file_uploaded(session, payload)
+            elif routing_key == RoutingKeys.BID_WON:
+                await self._handle_bid_won(session, payload)
+
+    async def _handle_file_uploaded(self, session: AsyncSession, payload: dict):
+        logger.info("Processing message", extra={"routing_key": RoutingKeys.FILES_UPLOADED})
+
+        file_id = payload.get("id")
+        status = payload.get("status", "").upper()
+
+        custom_invoice_service = CustomInvoiceService(session)
+        custom_invoice = await custom_invoice_service.get_by_file_id(file_id)
+        if custom_invoice:
+            if status == "AVAILABLE":
+                logger.info("Invoice is available", extra={"invoice_id": custom_invoice.id})
+                await custom_invoice_service.update(
+                    custom_invoice.id,
+                    CustomInvoiceUpdate(status=FileInvoiceStatus.AVAILABLE),
                 )
+            elif status == "FAILED":
+                logger.info("Invoice is failed", extra={"invoice_id": custom_invoice.id})
+                await custom_invoice_service.delete(custom_invoice.id)
+            else:
+                logger.warning("Unprocessable status received", extra={"status": status})
+        else:
+            auction_invoice_service = AuctionInvoiceService(session)
+            auction_invoice = await auction_invoice_service.get_by_file_id(file_id)
+            if auction_invoice:
+                if status == "AVAILABLE":
+                    logger.info(
+                        "Auction invoice is available",
+                        extra={"invoice_id": auction_invoice.id},
+                    )
+                    await auction_invoice_service.update(
+                        auction_invoice.id,
+                        AuctionInvoiceUpdate(status=FileInvoiceStatus.AVAILABLE),
+                    )
+                elif status == "FAILED":
+                    logger.info(
+                        "Auction invoice upload failed",
+                        extra={"invoice_id": auction_invoice.id},
+                    )
+                    await auction_invoice_service.delete(auction_invoice.id)
+                else:
+                    logger.warning("Unprocessable status received", extra={"status": status})
+
+    async def _handle_bid_won(self, session: AsyncSession, payload: dict):
+        logger.info("Bid won received")
+        user_uuid = payload.get("user_uuid")
+        auction = payload.get("auction")
+
+        lot_id = payload.get("lot_id")
+        bid_amount = payload.get("bid_amount")
+        if await OrderService(session).exists_by_lot_id(lot_id):
+            logger.info(
+                "Order already exists for lot, skipping duplicate bid won",
+                extra={"lot_id": lot_id, "user_uuid": user_uuid},
+            )
+            return
+        try:
+            auction_enum = AuctionEnum(auction.upper() if auction else "UNKNOWN")
+        except Exception:
+            logger.exception(
+                "Unknown auction site for bid won",
+                extra={"auction_site": auction, "payload": payload},
+            )
+            return
+
+        try:
+            generator = GenerateFromLot(
+                lot_id=lot_id,
+                auction=auction_enum,
+                user_uuid=user_uuid,
+                bid_amount=bid_amount,
+            )
+            await generator.generate(db=session)
+        except IntegrityError:
+            logger.info(
+                "Order already exists (db constraint), skipping duplicate bid won",
+                extra={"lot_id": lot_id, "auction": auction, "user_uuid": user_uuid},
+            )
+        except Exception as exc:
+            logger.error(
+                "Error processing bid won",
+                extra={
+                    "error": str(exc),
+                    "lot_id": lot_id,
+                    "auction": auction_enum.value,
+                    "user_uuid": user_uuid,
+                },
+            )
+            # Let the consumer schedule a retry (lot/calculator RPCs are usually transient)
+            raise
 
 
 
@@ -1,11 +1,32 @@
 import asyncio
 import json
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, UTC
 
 from aio_pika import connect_robust, Message, ExchangeType, DeliveryMode
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractExchange
 
 from app.config import settings
+from app.core.logger import logger
+from app.core.metrics import AMQP_PUBLISHED
+
+
+def build_message(routing_key: str, payload: dict, message_id: str | None = None) -> Message:
+    message_body = json.dumps({
+        "type": routing_key,
+        "payload": payload,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "correlation_id": str(uuid.uuid4())
+    }).encode()
+    return Message(
+        message_body,
+        content_type="application/json",
+        correlation_id=str(uuid.uuid4()),
+        message_id=message_id,
+        timestamp=datetime.now(UTC),
+        delivery_mode=DeliveryMode.PERSISTENT
+    )
 
 
 class RabbitMQPublisher:
@@ -29,26 +50,186 @@ class RabbitMQPublisher:
     async def publish(self, routing_key: str, payload: dict):
         if self.exchange is None:
             await self.connect()
-        message_body = json.dumps({
-            "type": routing_key,
-            "payload": payload,
-            "timestamp": datetime.now(UTC).isoformat(),
-            "correlation_id": str(uuid.uuid4())
-        }).encode()
-        message = Message(
-            message_body,
-            content_type="application/json",
-            correlation_id=str(uuid.uuid4()),
-            delivery_mode=DeliveryMode.PERSISTENT
-
-        )
-        await self.exchange.publish(message, routing_key=routing_key)
+        await self.exchange.publish(build_message(routing_key, payload), routing_key=routing_key)
 
     async def close(self):
         if self.connection:
             await self.connection.close()
 
 
+class PublisherOverloadedError(Exception):
+    pass
+
+
+@dataclass
+class _PendingPublish:
+    routing_key: str
+    message: Message
+    confirmed: asyncio.Future
+
+
+class PooledRabbitMQPublisher:
+    """
+    App-scoped publisher sharing the lifespan RabbitMQ connection.
+
+    Messages are queued and flushed in batches by one worker per pooled channel; each batch is
+    published back to back and its publisher confirms awaited together. ``publish`` returns once
+    the broker confirmed the message. The pending queue is bounded: when it is full, callers wait
+    up to ``publish_timeout`` for room and then get ``PublisherOverloadedError``.
+    """
+
+    def __init__(
+            self,
+            channels: int = settings.RABBITMQ_PUBLISHER_CHANNELS,
+            batch_size: int = settings.RABBITMQ_PUBLISH_BATCH_SIZE,
+            max_pending: int = settings.RABBITMQ_PUBLISH_MAX_PENDING,
+            publish_timeout: float = settings.RABBITMQ_PUBLISH_TIMEOUT_S,
+            exchange_name: str = settings.RABBITMQ_EXCHANGE_NAME,
+            exchange_type: ExchangeType = ExchangeType.TOPIC,
+    ):
+        self.channel_count = max(1, channels)
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max_pending
+        self.publish_timeout = publish_timeout
+        self.exchange_name = exchange_name
+        self.exchange_type = exchange_type
+
+        self._queue: asyncio.Queue[_PendingPublish] | None = None
+        self._channels: list[AbstractChannel] = []
+        self._workers: list[asyncio.Task] = []
+        self._running = False
+
+        self.published = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    async def start(self, connection: AbstractConnection):
+        if self._running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        for index in range(self.channel_count):
+            channel = await connection.channel(publisher_confirms=True)
+            exchange = await channel.declare_exchange(self.exchange_name, type=self.exchange_type, durable=True)
+            self._channels.append(channel)
+            self._workers.append(asyncio.create_task(self._flush_loop(index, exchange)))
+        self._running = True
+        logger.info(
+            "RabbitMQ publisher started",
+            extra={
+                "channels": self.channel_count,
+                "batch_size": self.batch_size,
+                "max_pending": self.max_pending,
+            },
+        )
+
+    async def close(self):
+        if not self._running:
+            return
+        self._running = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.publish_timeout)
+        except TimeoutError:
+            logger.warning(
+                "RabbitMQ publisher closed with unflushed messages",
+                extra={"pending": self._queue.qsize()},
+            )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if not pending.confirmed.done():
+                pending.confirmed.set_exception(RuntimeError("RabbitMQ publisher closed"))
+
+        channels, self._channels = self._channels, []
+        for channel in channels:
+            try:
+                await channel.close()
+            except Exception as e:
+                logger.warning("Failed to close publisher channel", extra={"error": str(e)})
+        logger.info("RabbitMQ publisher closed", extra=self.stats())
+
+    async def publish(self, routing_key: str, payload: dict, message_id: str | None = None):
+        if not self._running:
+            raise RuntimeError("RabbitMQ publisher is not running")
+
+        pending = _PendingPublish(
+            routing_key=routing_key,
+            message=build_message(routing_key, payload, message_id),
+            confirmed=asyncio.get_running_loop().create_future(),
+        )
+        # The caller may have timed out already; do not log its failure as never retrieved
+        pending.confirmed.add_done_callback(lambda future: future.cancelled() or future.exception())
+        try:
+            await asyncio.wait_for(self._queue.put(pending), timeout=self.publish_timeout)
+        except TimeoutError:
+            self.rejected += 1
+            raise PublisherOverloadedError(
+                f"{self.max_pending} messages already waiting to be published"
+            )
+        await asyncio.wait_for(asyncio.shield(pending.confirmed), timeout=self.publish_timeout)
+
+    async def _flush_loop(self, index: int, exchange: AbstractExchange):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                results = await asyncio.gather(
+                    *(exchange.publish(pending.message, routing_key=pending.routing_key) for pending in batch),
+                    return_exceptions=True,
+                )
+            except asyncio.CancelledError:
+                for pending in batch:
+                    if not pending.confirmed.done():
+                        pending.confirmed.set_exception(RuntimeError("RabbitMQ publisher closed"))
+                    self._queue.task_done()
+                raise
+
+            self.batches += 1
+            for pending, result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    self.failed += 1
+                    AMQP_PUBLISHED.labels(pending.routing_key, "failed").inc()
+                    logger.error(
+                        "RabbitMQ publish failed",
+                        extra={"routing_key": pending.routing_key, "channel": index, "error": str(result)},
+                    )
+                    if not pending.confirmed.done():
+                        pending.confirmed.set_exception(result)
+                else:
+                    self.published += 1
+                    AMQP_PUBLISHED.labels(pending.routing_key, "published").inc()
+                    if not pending.confirmed.done():
+                        pending.confirmed.set_result(None)
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "pending": self._queue.qsize() if self._queue else 0,
+            "published": self.published,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "batches": self.batches,
+        }
+
+
+rabbit_publisher = PooledRabbitMQPublisher()
+
+
 if __name__ == "__main__":
     async def main():
         publisher = RabbitMQPublisher()
@@ -0,0 +1,86 @@
+import json
+import time
+from typing import Optional
+
+from aio_pika.abc import AbstractIncomingMessage, AbstractRobustChannel, AbstractRobustConnection, \
+    AbstractRobustQueue, ConsumerTag, ExchangeType
+
+from app.config import settings
+from app.core.logger import logger
+from app.services.rabbit_service.file_routing_keys import RoutingKeys
+from app.services.rabbit_service.metrics import ConsumerMetrics
+from app.services.user_info import evict_user_profile
+
+
+class UserEvictionConsumer:
+    """
+    Evicts cached user profiles on ``user.updated``.
+
+    The profile cache is per process, so every instance needs every event: each one consumes from
+    its own server-named queue that is exclusive to its connection and deleted with it. Work that
+    must run once per event stays on the shared durable queue of ``OrderRabbitConsumer``.
+    """
+
+    def __init__(
+            self,
+            connection: AbstractRobustConnection,
+            exchange_name: str = settings.RABBITMQ_EXCHANGE_NAME,
+            prefetch_count: int = settings.RABBITMQ_PREFETCH_COUNT,
+    ):
+        self.connection = connection
+        self.exchange_name = exchange_name
+        self.prefetch_count = prefetch_count
+        self.routing_key = RoutingKeys.USER_UPDATED.value
+
+        self.channel: Optional[AbstractRobustChannel] = None
+        self.queue: Optional[AbstractRobustQueue] = None
+        self.consumer_tag: Optional[ConsumerTag] = None
+        self.metrics = ConsumerMetrics("user_profile_eviction")
+
+    async def start(self):
+        channel = await self.connection.channel()
+        await channel.set_qos(prefetch_count=self.prefetch_count)
+        self.channel = channel
+
+        exchange = await channel.declare_exchange(self.exchange_name, type=ExchangeType.TOPIC, durable=True)
+        self.queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+        await self.queue.bind(exchange, routing_key=self.routing_key)
+        self.consumer_tag = await self.queue.consume(self.process_message)
+
+        logger.info(
+            "User eviction consumer started",
+            extra={"queue_name": self.queue.name, "routing_key": self.routing_key},
+        )
+
+    async def process_message(self, message: AbstractIncomingMessage):
+        self.metrics.message_started(self.routing_key, None)
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            payload = json.loads(message.body).get("payload") or {}
+            user_uuid = payload.get("user_uuid") or payload.get("uuid")
+            if user_uuid:
+                evict_user_profile(user_uuid)
+                logger.debug("User profile evicted", extra={"user_uuid": user_uuid})
+            else:
+                logger.warning("User updated event without user uuid", extra={"payload": payload})
+            succeeded = True
+        except (ValueError, AttributeError) as e:
+            logger.warning("Malformed user updated event", extra={"error": str(e)})
+        finally:
+            # Eviction is idempotent and cached profiles expire anyway, so nothing is retried
+            await message.ack()
+            self.metrics.message_finished(self.routing_key, time.perf_counter() - started, succeeded)
+
+    async def close(self):
+        if self.channel is None:
+            return
+        try:
+            # Its only consumer goes with the channel, which deletes the auto-delete queue
+            await self.channel.close()
+        except Exception as e:
+            logger.warning("Failed to close user eviction channel", extra={"error": str(e)})
+        finally:
+            self.channel = None
+            self.queue = None
+            self.consumer_tag = None
@@ -0,0 +1,67 @@
+from app.config import settings
+from app.core.background_runs import BackgroundRuns
+from app.core.logger import logger
+from app.database.crud import OrderService
+from app.database.db.session import get_db_context
+from app.schemas.user_identity_refresh import UserIdentityRefreshIn, UserIdentityRefreshOut, UserIdentityRefreshRunOut
+from app.services.user_info import build_user_identity, user_profile_cache
+from app.services.user_loader import UserLoader, user_loader
+
+
+class RefreshUserIdentities:
+    """Re-read every order owner from auth and rewrite the cached ``Order.user_name``/``user_email`` columns."""
+
+    def __init__(
+        self,
+        filters: UserIdentityRefreshIn,
+        batch_size: int = settings.USER_IDENTITY_REFRESH_BATCH_SIZE,
+        loader: UserLoader = user_loader,
+    ):
+        self.filters = filters
+        self.batch_size = filters.batch_size or batch_size
+        self.loader = loader
+        # Updated after every batch so a running job can be polled
+        self.progress = UserIdentityRefreshOut()
+
+    async def run(self) -> UserIdentityRefreshOut:
+        async with get_db_context() as db:
+            user_uuids = await OrderService(db).get_user_uuids(user_uuid=self.filters.user_uuid)
+        progress = self.progress
+        progress.users = len(user_uuids)
+
+        logger.info(
+            "Refreshing order user identities",
+            extra={"users": len(user_uuids), "batch_size": self.batch_size},
+        )
+
+        for start in range(0, len(user_uuids), self.batch_size):
+            # Straight to the loader: the job exists to pick up changes the profile cache may not have seen
+            users = await self.loader.load_many(user_uuids[start:start + self.batch_size])
+
+            async with get_db_context() as db:
+                order_service = OrderService(db)
+                for user_uuid, user in users.items():
+                    if isinstance(user, Exception):
+                        progress.failed_users += 1
+                        logger.warning(
+                            "Auth lookup failed during user identity refresh",
+                            extra={"user_uuid": user_uuid, "error": str(user)},
+                        )
+                        continue
+                    user_profile_cache.set(user_uuid, user)
+                    identity = build_user_identity(user, user_uuid)
+                    progress.updated_orders += await order_service.update_user_identity(
+                        user_uuid, identity["user_name"], identity["user_email"],
+                    )
+                    progress.refreshed_users += 1
+                await db.commit()
+
+            logger.info(
+                "User identity refresh progress",
+                extra={"processed_users": min(start + self.batch_size, len(user_uuids)), **progress.model_dump()},
+            )
+
+        return progress
+
+
+user_identity_refresh_runs = BackgroundRuns("User identity refresh", RefreshUserIdentities, UserIdentityRefreshRunOut)
@@ -0,0 +1,166 @@
+import asyncio
+from typing import Sequence
+
+import grpc.aio
+from sqlalchemy import Row
+
+from app.config import settings
+from app.core.background_runs import BackgroundRuns
+from app.core.logger import logger
+from app.database.crud import InvoiceItemService, OrderService
+from app.database.db.session import get_db_context
+from app.database.models import Order
+from app.enums.order import OrderStatusEnum
+from app.rpc_client.calculator import CalculatorRpcClient
+from app.rpc_client.gen.python.calculator.v1 import calculator_pb2
+from app.schemas.requote import RequoteFilterIn, RequoteResultOut, RequoteRunOut
+from app.services.create_order_from_lot import GenerateFromLot
+
+REQUOTABLE_STATUSES = (OrderStatusEnum.WON, OrderStatusEnum.PORT_CHOSEN)
+
+# What the batch request and the rebuilt invoice items read; orders are never loaded whole
+REQUOTE_COLUMNS = (
+    Order.id,
+    Order.vehicle_value,
+    Order.auction,
+    Order.vehicle_type,
+    Order.location_name,
+    Order.fee_type_name,
+    Order.destination_name,
+    Order.terminal_name,
+    Order.vehicle_name,
+    Order.vin,
+)
+
+
+class RequoteOrders:
+    """Re-price orders after a tariff change using GetCalculatorWithDataBatch instead of one RPC per order."""
+
+    def __init__(
+        self,
+        filters: RequoteFilterIn,
+        batch_size: int = settings.REQUOTE_BATCH_SIZE,
+        concurrency: int = settings.REQUOTE_CONCURRENCY,
+    ):
+        self.filters = filters
+        self.batch_size = filters.batch_size or batch_size
+        self.concurrency = concurrency
+        # Updated after every batch so a running job can be polled
+        self.progress = RequoteResultOut()
+
+    def _statuses(self) -> list[OrderStatusEnum]:
+        if not self.filters.statuses:
+            return list(REQUOTABLE_STATUSES)
+        return [status for status in self.filters.statuses if status in REQUOTABLE_STATUSES]
+
+    @staticmethod
+    def _build_batch_request(order: Row) -> calculator_pb2.GetCalculatorBatchRequest:
+        data = calculator_pb2.GetCalculatorWithDataRequest(
+            price=order.vehicle_value,
+            auction=order.auction,
+            vehicle_type=order.vehicle_type,
+            location=order.location_name,
+        )
+        if order.fee_type_name:
+            data.fee_type = order.fee_type_name
+        if order.destination_name:
+            data.destination = order.destination_name
+        # The quote is priced from data alone and lot_id is only echoed back, so it carries the order id
+        # and each quote maps straight back to its order
+        return calculator_pb2.GetCalculatorBatchRequest(data=data, lot_id=str(order.id))
+
+    async def run(self) -> RequoteResultOut:
+        progress = self.progress
+        statuses = self._statuses()
+        if not statuses:
+            return progress
+
+        async with get_db_context() as db:
+            order_ids = await OrderService(db).get_ids_with_filters(
+                statuses=statuses,
+                user_uuid=self.filters.user_uuid,
+                location_id=self.filters.location_id,
+            )
+        progress.matched = len(order_ids)
+
+        batches = [order_ids[i:i + self.batch_size] for i in range(0, len(order_ids), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        logger.info(
+            "Re-quoting orders",
+            extra={"matched": len(order_ids), "batches": len(batches), "concurrency": self.concurrency},
+        )
+
+        async with CalculatorRpcClient() as client:
+            await asyncio.gather(*(self._requote_batch(client, batch, semaphore) for batch in batches))
+
+        return progress
+
+    async def _requote_batch(
+        self,
+        client: CalculatorRpcClient,
+        order_ids: Sequence[int],
+        semaphore: asyncio.Semaphore,
+    ):
+        """Re-quotes one batch and records it in ``progress``; a failure never escapes."""
+        async with semaphore:
+            requoted = 0
+            try:
+                requoted = await self._requote(client, order_ids)
+            except grpc.aio.AioRpcError as e:
+                self.progress.failed_batches += 1
+                logger.error(
+                    "Calculator batch request failed during re-quote",
+                    extra={
+                        "order_ids": list(order_ids),
+                        "status_code": e.code().name if e.code() else None,
+                        "details": e.details(),
+                    },
+                )
+            except Exception as e:
+                self.progress.failed_batches += 1
+                logger.error(
+                    "Re-quote batch failed",
+                    extra={"order_ids": list(order_ids), "error": str(e)},
+                    exc_info=True,
+                )
+            self.progress.requoted += requoted
+            self.progress.skipped += len(order_ids) - requoted
+            logger.info("Re-quote progress", extra=self.progress.model_dump())
+
+    async def _requote(self, client: CalculatorRpcClient, order_ids: Sequence[int]) -> int:
+        async with get_db_context() as db:
+            orders = await OrderService(db).get_rows_with_filters(
+                REQUOTE_COLUMNS, statuses=REQUOTABLE_STATUSES, order_ids=order_ids,
+            )
+        if not orders:
+            return 0
+
+        response = await client.get_calculator_with_data_batch(
+            [self._build_batch_request(order) for order in orders]
+        )
+        calculators = {
+            int(item.lot_id): item.calculator.calculator
+            for item in response.data
+            if item.calculator.HasField("calculator") and item.lot_id.isdigit()
+        }
+
+        async with get_db_context() as db:
+            # Status may have moved on while the calculator was busy; only touch orders still re-quotable
+            requotable_ids = set(await OrderService(db).get_ids_with_filters(
+                statuses=REQUOTABLE_STATUSES,
+                order_ids=[order.id for order in orders],
+            ))
+            items_by_order = {
+                order.id: GenerateFromLot.build_invoice_items_from_order_data(
+                    order=order,
+                    default_calculator=calculators[order.id],
+                )
+                for order in orders
+                if order.id in requotable_ids and order.id in calculators
+            }
+            requoted_ids = await InvoiceItemService(db).replace_calculated_items(items_by_order)
+        return len(requoted_ids)
+
+
+requote_runs = BackgroundRuns("Re-quote", RequoteOrders, RequoteRunOut)
@@ -1,36 +1,81 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.logger import logger
+from app.database.models import Order, OutboxEvent
+from app.database.schemas import OutboxEventCreate
 from app.enums.order import OrderStatusEnum
-from app.rpc_client.auth import AuthRpcClient
-from app.services.rabbit_service.service import RabbitMQPublisher
+from app.enums.outbox import OutboxEventType
+from app.services.outbox_relay import add_outbox_event, outbox_relay
+from app.services.rabbit_service.service import PooledRabbitMQPublisher
+from app.services.user_info import get_user_profile
+
+STATUS_UPDATED_ROUTING_KEY = "order.status_updated"
+
+HUMAN_READABLE_STATUSES = {
+    OrderStatusEnum.WON: "Bid won",
+    OrderStatusEnum.PORT_CHOSEN: "Port chosen",
+    OrderStatusEnum.INVOICE_ADDED: "Invoice added",
+    OrderStatusEnum.TRACKING_ADDED: "Tracking added",
+    OrderStatusEnum.VEHICLE_IN_CUSTOM_AGENCY: "Vehicle in custom agency",
+    OrderStatusEnum.CUSTOM_INVOICE_ADDED: "Custom invoice added",
+    OrderStatusEnum.DELIVERED: "Delivered",
+}
 
 
-async def send_status_change_notifications(
-    updated_order,
+def human_status(status: OrderStatusEnum) -> str:
+    return HUMAN_READABLE_STATUSES.get(status, status.value)
+
+
+def enqueue_status_change_notifications(
+    session: AsyncSession,
+    order: Order,
     previous_status: OrderStatusEnum,
+    new_status: OrderStatusEnum,
     user_uuid: str,
-    is_telegram: bool = False
-):
-    human_readable_statuses = {
-        OrderStatusEnum.WON: "Bid won",
-        OrderStatusEnum.PORT_CHOSEN: "Port chosen",
-        OrderStatusEnum.INVOICE_ADDED: "Invoice added",
-        OrderStatusEnum.TRACKING_ADDED: "Tracking added",
-        OrderStatusEnum.VEHICLE_IN_CUSTOM_AGENCY: "Vehicle in custom agency",
-        OrderStatusEnum.CUSTOM_INVOICE_ADDED: "Custom invoice added",
-        OrderStatusEnum.DELIVERED: "Delivered",
-    }
+    is_telegram: bool = False,
+) -> OutboxEvent:
+    """
+    Stage the status change notification in the transaction that changes the status.
 
-    def human_status(status: OrderStatusEnum) -> str:
-        return human_readable_statuses.get(status, status.value)
+    Call before the commit that persists the new status; the outbox relay publishes it afterwards.
+    """
+    return add_outbox_event(
+        session,
+        OutboxEventCreate(
+            order_id=order.id,
+            event_type=OutboxEventType.ORDER_STATUS_CHANGED,
+            payload={
+                "user_uuid": user_uuid,
+                "is_telegram": is_telegram,
+                "new_order_status": new_status.value,
+                "previous_order_status": previous_status.value,
+                "order_id": order.id,
+                "vin": order.vin,
+                "vehicle_title": order.vehicle_name,
+                "auction": order.auction.value if order.auction else None,
+                "lot_id": order.lot_id,
+            },
+        ),
+    )
+
+
+@outbox_relay.handler(OutboxEventType.ORDER_STATUS_CHANGED)
+async def publish_status_change_notifications(event: OutboxEvent, publisher: PooledRabbitMQPublisher):
+    data = dict(event.payload)
+    user_uuid = data.pop("user_uuid")
+    is_telegram = data.pop("is_telegram", False)
+    new_status = OrderStatusEnum(data["new_order_status"])
+    previous_status = OrderStatusEnum(data["previous_order_status"])
 
     user_email = ""
     user_phone = ""
     user = None
     try:
-        async with AuthRpcClient() as auth_client:
-            user = await auth_client.get_user(user_uuid=user_uuid)
-            user_email = user.email or ""
-            user_phone = user.phone_number or ""
+        user = await get_user_profile(user_uuid)
+        user_email = user.email or ""
+        user_phone = user.phone_number or ""
     except Exception as exc:
         logger.error(
             "Failed to fetch user info for status change notification",
@@ -39,45 +84,28 @@ async def send_status_change_notifications(
 
     base_payload = {
         'user_uuid': user_uuid,
-        "new_order_status": updated_order.delivery_status.value,
-        "previous_order_status": previous_status.value,
-        "new_order_status_human": human_status(updated_order.delivery_status),
+        **data,
+        "new_order_status_human": human_status(new_status),
         "previous_order_status_human": human_status(previous_status),
-        "order_id": updated_order.id,
-        "vin": updated_order.vin,
-        "vehicle_title": updated_order.vehicle_name,
-        "auction": updated_order.auction.value if updated_order.auction else None,
-        "lot_id": updated_order.lot_id,
         "email": user_email,
         "phone_number": user_phone,
     }
 
-    publisher = RabbitMQPublisher()
-    try:
-        if is_telegram:
-            base_payload["destination"] = "telegram"
-            base_payload['user_email'] = user_email
-            base_payload['user_phone'] = user_phone
-            base_payload['user_name'] = user.first_name + " " + user.last_name
-            await publisher.publish(
-                routing_key="order.status_updated",
-                payload=base_payload,
-            )
-        else:
-            for destination in ("email", "sms"):
-                payload = base_payload | {"destination": destination}
-                await publisher.publish(
-                    routing_key="order.status_updated",
-                    payload=payload,
-                )
-    except Exception as exc:
-        logger.error(
-            "Failed to publish order status update notification",
-            extra={
-                "order_id": updated_order.id,
-                "routing_key": "order.status_updated",
-                "error": str(exc),
-            },
+    if is_telegram:
+        base_payload["destination"] = "telegram"
+        base_payload['user_email'] = user_email
+        base_payload['user_phone'] = user_phone
+        base_payload['user_name'] = f"{user.first_name} {user.last_name}" if user else ""
+        payloads = [base_payload]
+    else:
+        payloads = [base_payload | {"destination": destination} for destination in ("email", "sms")]
+
+    # Published together so they land in the same flush batch; a failure is retried by the relay
+    await asyncio.gather(*(
+        publisher.publish(
+            routing_key=STATUS_UPDATED_ROUTING_KEY,
+            payload=payload,
+            message_id=f"outbox-{event.id}-{payload['destination']}",
         )
-    finally:
-        await publisher.close()
+        for payload in payloads
+    ))
@@ -1,5 +1,36 @@
-from app.rpc_client.auth import AuthRpcClient
+import grpc
+import grpc.aio
+
+from app.config import settings
+from app.core.cache import AsyncTTLCache
 from app.rpc_client.gen.python.auth.v1 import auth_pb2
+from app.services.user_loader import user_loader
+
+# Profiles change rarely; a user-updated event evicts the entry before its TTL runs out
+user_profile_cache: AsyncTTLCache[str, auth_pb2.GetUserResponse] = AsyncTTLCache(
+    "user_profiles",
+    max_size=settings.USER_PROFILE_CACHE_SIZE,
+    ttl=settings.USER_PROFILE_CACHE_TTL_S,
+    negative_ttl=settings.USER_PROFILE_CACHE_NEGATIVE_TTL_S,
+    stale_ttl=settings.USER_PROFILE_CACHE_STALE_TTL_S,
+)
+
+
+def _is_not_found(error: BaseException) -> bool:
+    return isinstance(error, grpc.aio.AioRpcError) and error.code() == grpc.StatusCode.NOT_FOUND
+
+
+async def get_user_profile(user_uuid: str) -> auth_pb2.GetUserResponse:
+    """Auth service profile of ``user_uuid``; use this instead of calling ``AuthRpcClient.get_user``."""
+    return await user_profile_cache.get_or_load(
+        user_uuid,
+        lambda: user_loader.load(user_uuid),
+        cache_error=_is_not_found,
+    )
+
+
+def evict_user_profile(user_uuid: str):
+    user_profile_cache.invalidate(user_uuid)
 
 
 def _build_user_name(user: auth_pb2.GetUserResponse, user_uuid: str) -> str:
@@ -13,10 +44,13 @@ def _build_user_name(user: auth_pb2.GetUserResponse, user_uuid: str) -> str:
     return user_uuid
 
 
-async def fetch_user_identity(user_uuid: str) -> dict[str, str]:
-    async with AuthRpcClient() as auth_client:
-        user = await auth_client.get_user(user_uuid=user_uuid)
+def build_user_identity(user: auth_pb2.GetUserResponse, user_uuid: str) -> dict[str, str]:
+    """The ``user_name``/``user_email`` pair cached on orders."""
     return {
         "user_name": _build_user_name(user, user_uuid),
         "user_email": user.email or "",
     }
+
+
+async def fetch_user_identity(user_uuid: str) -> dict[str, str]:
+    return build_user_identity(await get_user_profile(user_uuid), user_uuid)
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Awaitable, Callable, Iterable, Sequence
+
+from app.config import settings
+from app.core.logger import logger
+from app.rpc_client.auth import AuthRpcClient
+from app.rpc_client.gen.python.auth.v1 import auth_pb2
+
+UserBatchResult = dict[str, auth_pb2.GetUserResponse | Exception]
+UserBatchFn = Callable[[Sequence[str]], Awaitable[UserBatchResult]]
+
+
+async def get_users_concurrently(
+        user_uuids: Sequence[str],
+        concurrency: int = settings.AUTH_USER_LOOKUP_CONCURRENCY,
+) -> UserBatchResult:
+    """
+    One ``GetUser`` per uuid over a single client, at most ``concurrency`` in flight.
+
+    Auth has no bulk lookup yet; once it does, a function with this signature wrapping it can be
+    passed to ``UserLoader`` instead.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results: UserBatchResult = {}
+
+    async with AuthRpcClient() as auth_client:
+        async def fetch(user_uuid: str):
+            async with semaphore:
+                try:
+                    results[user_uuid] = await auth_client.get_user(user_uuid=user_uuid)
+                except Exception as e:
+                    results[user_uuid] = e
+
+        await asyncio.gather(*(fetch(user_uuid) for user_uuid in user_uuids))
+    return results
+
+
+class UserLoader:
+    """
+    Dataloader for auth user profiles.
+
+    Uuids requested during the same event loop iteration are collected and handed to ``batch_fn``
+    together, and concurrent requests for one uuid share a single lookup. Nothing is cached here;
+    ``user_profile_cache`` sits in front of it.
+    """
+
+    def __init__(
+            self,
+            batch_fn: UserBatchFn = get_users_concurrently,
+            max_batch: int = settings.AUTH_USER_MAX_BATCH,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+
+        self._pending: dict[str, asyncio.Future[auth_pb2.GetUserResponse]] = {}
+        self._dispatch_scheduled = False
+        self._batches: set[asyncio.Task] = set()
+
+    async def load(self, user_uuid: str) -> auth_pb2.GetUserResponse:
+        future = self._pending.get(user_uuid)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[user_uuid] = loop.create_future()
+            # Callers may all have been cancelled; do not report their errors as never retrieved
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif not self._dispatch_scheduled:
+                self._dispatch_scheduled = True
+                loop.call_soon(self._dispatch)
+        # Shield so a cancelled caller does not cancel the lookup other callers are waiting on
+        return await asyncio.shield(future)
+
+    async def load_many(self, user_uuids: Iterable[str]) -> UserBatchResult:
+        """Profiles keyed by uuid; failed lookups map to their exception."""
+        user_uuids = list(dict.fromkeys(user_uuids))
+        results = await asyncio.gather(*(self.load(user_uuid) for user_uuid in user_uuids), return_exceptions=True)
+        return dict(zip(user_uuids, results))
+
+    def _dispatch(self):
+        self._dispatch_scheduled = False
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: dict[str, asyncio.Future[auth_pb2.GetUserResponse]]):
+        logger.debug("Loading auth users", extra={"users": len(batch)})
+        try:
+            results = await self.batch_fn(list(batch))
+        except Exception as e:
+            results = {}
+            error = e
+        else:
+            error = None
+
+        for user_uuid, future in batch.items():
+            if future.done():
+                continue
+            result = results.get(user_uuid, error)
+            if result is None:
+                future.set_exception(LookupError(f"Auth returned no user for {user_uuid}"))
+            elif isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+user_loader = UserLoader()
@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.database.models import Order
+from app.enums.auction import AuctionEnum
+from app.enums.order import OrderStatusEnum
+
+
+@pytest.fixture
+def make_order():
+    def make(i: int, **overrides) -> Order:
+        fields = dict(
+            auction=AuctionEnum.COPART, lot_id=1000 + i, vehicle_value=100, vin=f"VIN{i:014d}",
+            vehicle_name=f"Car {i}", location_id=1, location_name="CA", terminal_id=1, terminal_name="T",
+            fee_type_id=1, fee_type_name="F", user_uuid="u1" if i % 2 else "u2", user_name="n", user_email="e",
+            delivery_status=OrderStatusEnum.WON, order_date=datetime(2025, 1, 1 + i, tzinfo=timezone.utc),
+        )
+        return Order(**{**fields, **overrides})
+
+    return make
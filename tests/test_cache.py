@@ -0,0 +1,182 @@
+import asyncio
+import traceback
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import AsyncTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    # Only the cache sees the fake clock; the event loop keeps real time
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def _counting_loader(values: list):
+    calls = []
+
+    async def loader():
+        calls.append(None)
+        await asyncio.sleep(0)
+        value = values[len(calls) - 1]
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+    return loader, calls
+
+
+def test_get_and_set_respect_ttl(clock):
+    cache = AsyncTTLCache("test_ttl", max_size=10, ttl=5.0)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    clock.now += 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = AsyncTTLCache("test_lru", max_size=2, ttl=5.0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_concurrent_misses_share_one_load(clock):
+    cache = AsyncTTLCache("test_coalesce", max_size=10, ttl=5.0)
+    loader, calls = _counting_loader(["value"])
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load("a", loader) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+    assert cache.get("a") == "value"
+
+
+def test_expired_value_is_served_stale_while_refreshing(clock):
+    cache = AsyncTTLCache("test_stale", max_size=10, ttl=5.0, stale_ttl=60.0)
+    loader, calls = _counting_loader(["old", "new"])
+
+    async def run():
+        first = await cache.get_or_load("a", loader)
+        clock.now += 10.0
+        stale = await cache.get_or_load("a", loader)
+        await asyncio.sleep(0.01)
+        fresh = await cache.get_or_load("a", loader)
+        return first, stale, fresh
+
+    assert asyncio.run(run()) == ("old", "old", "new")
+    assert len(calls) == 2
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_failed_refresh_keeps_stale_value(clock):
+    cache = AsyncTTLCache("test_stale_error", max_size=10, ttl=5.0, negative_ttl=30.0, stale_ttl=60.0)
+    loader, calls = _counting_loader(["old", RuntimeError("down"), "new"])
+
+    async def run():
+        await cache.get_or_load("a", loader)
+        clock.now += 10.0
+        stale = await cache.get_or_load("a", loader, cache_error=lambda e: True)
+        await asyncio.sleep(0.01)
+        still_stale = await cache.get_or_load("a", loader, cache_error=lambda e: True)
+        await asyncio.sleep(0.01)
+        return stale, still_stale
+
+    assert asyncio.run(run()) == ("old", "old")
+    assert len(calls) == 3
+
+
+def test_accepted_errors_are_cached_for_negative_ttl(clock):
+    cache = AsyncTTLCache("test_negative", max_size=10, ttl=5.0, negative_ttl=2.0)
+    loader, calls = _counting_loader([LookupError("missing"), "found"])
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(LookupError):
+                await cache.get_or_load("a", loader, cache_error=lambda e: isinstance(e, LookupError))
+        clock.now += 2.0
+        return await cache.get_or_load("a", loader, cache_error=lambda e: isinstance(e, LookupError))
+
+    assert asyncio.run(run()) == "found"
+    assert len(calls) == 2
+    assert cache.stats()["negative_hits"] == 1
+
+
+def test_rejected_errors_are_not_cached(clock):
+    cache = AsyncTTLCache("test_no_negative", max_size=10, ttl=5.0, negative_ttl=2.0)
+    loader, calls = _counting_loader([RuntimeError("down"), "value"])
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("a", loader, cache_error=lambda e: isinstance(e, LookupError))
+        return await cache.get_or_load("a", loader)
+
+    assert asyncio.run(run()) == "value"
+    assert len(calls) == 2
+
+
+def test_invalidate_during_load_drops_the_loaded_value(clock):
+    cache = AsyncTTLCache("test_invalidate", max_size=10, ttl=5.0)
+    release = None
+
+    async def loader():
+        await release.wait()
+        return "old"
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        load = asyncio.create_task(cache.get_or_load("a", loader))
+        await asyncio.sleep(0)
+        cache.invalidate("a")
+        release.set()
+        return await load
+
+    assert asyncio.run(run()) == "old"
+    assert cache.get("a") is None
+
+
+def test_cached_error_is_raised_with_a_fresh_traceback(clock):
+    cache = AsyncTTLCache("test_negative_traceback", max_size=10, ttl=5.0, negative_ttl=2.0)
+    loader, _ = _counting_loader([LookupError("missing")])
+
+    async def raised() -> LookupError:
+        try:
+            await cache.get_or_load("a", loader, cache_error=lambda e: True)
+        except LookupError as e:
+            return e
+
+    async def run():
+        await raised()
+        depths = []
+        for _ in range(3):
+            error = await raised()
+            depths.append(len(traceback.extract_tb(error.__traceback__)))
+        return depths
+
+    depths = asyncio.run(run())
+
+    assert len(set(depths)) == 1
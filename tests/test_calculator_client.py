@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.rpc_client import calculator as calculator_module
+from app.rpc_client.calculator import CalculatorRpcClient, calculator_quote_cache
+from app.rpc_client.gen.python.calculator.v1 import calculator_pb2
+
+
+class FakeCalculatorClient:
+    """Stands in for the client a quote load opens for itself."""
+
+    opened = 0
+
+    async def __aenter__(self):
+        type(self).opened += 1
+        self.stub = self
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.stub = None
+
+    async def GetCalculatorWithData(self, request):
+        return calculator_pb2.GetCalculatorWithDataResponse(message=f"{request.price}")
+
+    async def _execute_request(self, method, request):
+        await asyncio.sleep(0)
+        return await method(request)
+
+
+@pytest.fixture
+def calculator(monkeypatch) -> type[FakeCalculatorClient]:
+    monkeypatch.setattr(FakeCalculatorClient, "opened", 0)
+    monkeypatch.setattr(calculator_module, "CalculatorRpcClient", FakeCalculatorClient)
+    calculator_quote_cache.clear()
+    yield FakeCalculatorClient
+    calculator_quote_cache.clear()
+
+
+def test_quote_load_does_not_use_the_callers_client(calculator):
+    # Never connected, so any use of the caller's own stub would fail
+    caller = CalculatorRpcClient()
+
+    async def run():
+        return await asyncio.gather(*(
+            caller.get_calculator_with_data(price=100, auction="copart", vehicle_type="car", location="CA")
+            for _ in range(3)
+        ))
+
+    responses = asyncio.run(run())
+
+    assert [response.message for response in responses] == ["100"] * 3
+    assert calculator.opened == 1
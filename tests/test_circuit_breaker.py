@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.rpc_client import circuit_breaker as circuit_breaker_module
+from app.rpc_client.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker_module, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def breaker(clock) -> CircuitBreaker:
+    return CircuitBreaker("test:1", window=10.0, min_calls=4, failure_rate=0.5, open_for=30.0, half_open_calls=2)
+
+
+def _call(breaker: CircuitBreaker, failed: bool):
+    probe = breaker.before_call()
+    breaker.after_call(probe, failed)
+
+
+def test_stays_closed_below_min_calls(breaker):
+    for _ in range(3):
+        _call(breaker, failed=True)
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_opens_at_failure_rate_and_rejects_calls(breaker, clock):
+    for failed in (False, True, False, True):
+        _call(breaker, failed)
+
+    assert breaker.state == CircuitState.OPEN
+    clock.now += 10.0
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == pytest.approx(20.0)
+    assert breaker.stats()["rejected"] == 1
+    assert breaker.stats()["times_opened"] == 1
+
+
+def test_outcomes_outside_the_window_are_forgotten(breaker, clock):
+    for _ in range(3):
+        _call(breaker, failed=True)
+    clock.now += 11.0
+    _call(breaker, failed=True)
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.stats()["calls_in_window"] == 1
+
+
+def test_half_open_probes_close_the_breaker(breaker, clock):
+    for _ in range(4):
+        _call(breaker, failed=True)
+    clock.now += 30.0
+
+    first = breaker.before_call()
+    second = breaker.before_call()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert first and second
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.after_call(first, failed=False)
+    breaker.after_call(second, failed=False)
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_failed_probe_reopens_the_breaker(breaker, clock):
+    for _ in range(4):
+        _call(breaker, failed=True)
+    clock.now += 30.0
+
+    _call(breaker, failed=True)
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.stats()["times_opened"] == 2
+    assert breaker.stats()["retry_after_s"] == pytest.approx(30.0)
+
+
+def test_abandoned_probe_frees_its_slot(breaker, clock):
+    for _ in range(4):
+        _call(breaker, failed=True)
+    clock.now += 30.0
+
+    for _ in range(2):
+        breaker.after_call(breaker.before_call(), failed=None)
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.before_call() is True
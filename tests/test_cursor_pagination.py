@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from rfc9457 import BadRequestProblem
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.cursor_pagination import CursorDirection, CursorParams, decode_cursor, encode_cursor, paginate_by_cursor
+from app.database.models import Base, Order
+
+SORT_COLUMNS = (Order.order_date, Order.id)
+
+
+def test_cursor_round_trip_keeps_datetimes():
+    order_date = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(CursorDirection.PREV, "order_date", [order_date, 7])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "order_date", 2) == (CursorDirection.PREV, [order_date, 7])
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", encode_cursor(CursorDirection.NEXT, "id", [1])[:-2]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(BadRequestProblem):
+        decode_cursor(cursor, "id", 1)
+
+
+@pytest.mark.parametrize(("sort", "key_count"), [("order_date", 1), ("id", 2)])
+def test_cursor_of_another_sort_order_is_rejected(sort, key_count):
+    cursor = encode_cursor(CursorDirection.NEXT, "id", [1])
+
+    with pytest.raises(BadRequestProblem):
+        decode_cursor(cursor, sort, key_count)
+
+
+async def _walk_pages(orders: list[Order]) -> list[list[int]]:
+    """Ids of every page forwards, then of the pages walked back from the last one."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add_all(orders)
+            await session.commit()
+
+            stmt = select(Order)
+            pages = []
+            page = await paginate_by_cursor(
+                session, stmt, CursorParams(size=2, include_total=True), "order_date", SORT_COLUMNS,
+            )
+            assert page.prev_cursor is None
+            assert page.count == len(orders)
+            pages.append([order.id for order in page.data])
+            while page.next_cursor:
+                page = await paginate_by_cursor(
+                    session, stmt, CursorParams(cursor=page.next_cursor, size=2), "order_date", SORT_COLUMNS,
+                )
+                pages.append([order.id for order in page.data])
+            while page.prev_cursor:
+                page = await paginate_by_cursor(
+                    session, stmt, CursorParams(cursor=page.prev_cursor, size=2), "order_date", SORT_COLUMNS,
+                )
+                pages.append([order.id for order in page.data])
+            return pages
+    finally:
+        await engine.dispose()
+
+
+def test_pages_walk_forwards_and_back(make_order):
+    # Orders 3 and 4 share an order date, so the id breaks the tie
+    tie = datetime(2025, 2, 1, tzinfo=timezone.utc)
+    orders = [make_order(i, id=i + 1) for i in range(3)]
+    orders += [make_order(i, id=i + 1, order_date=tie) for i in range(3, 5)]
+
+    pages = asyncio.run(_walk_pages(orders))
+
+    assert pages == [[5, 4], [3, 2], [1], [3, 2], [5, 4]]
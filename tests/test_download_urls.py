@@ -0,0 +1,133 @@
+import asyncio
+
+import grpc
+import grpc.aio
+import pytest
+
+from app.rpc_client.gen.python.files.v1 import files_pb2
+from app.services import download_urls as download_urls_module
+from app.services.download_urls import DownloadUrlNotFoundError, DownloadUrlResolver
+
+
+def _not_found() -> grpc.aio.AioRpcError:
+    return grpc.aio.AioRpcError(grpc.StatusCode.NOT_FOUND, grpc.aio.Metadata(), grpc.aio.Metadata(), "File not found")
+
+
+class FakeFilesClient:
+    """Stands in for ``FilesRpcClient``; calls are recorded on the class."""
+
+    calls: list[tuple[str, list[int]]] = []
+    missing: set[int] = set()
+    expires_in = 3600
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def _download(self, file_id: int) -> files_pb2.GetDownloadUrlResponse:
+        if file_id in self.missing:
+            raise _not_found()
+        return files_pb2.GetDownloadUrlResponse(
+            file_id=file_id, download_url=f"https://files/{file_id}", expires_in=self.expires_in,
+        )
+
+    async def get_download_url(self, *, file_id: int):
+        self.calls.append(("single", [file_id]))
+        return self._download(file_id)
+
+    async def get_batch_download_urls(self, *, file_ids):
+        self.calls.append(("batch", list(file_ids)))
+        return files_pb2.GetBatchDownloadUrlsResponse(download_urls=[self._download(file_id) for file_id in file_ids])
+
+
+@pytest.fixture
+def files(monkeypatch) -> type[FakeFilesClient]:
+    monkeypatch.setattr(FakeFilesClient, "calls", [])
+    monkeypatch.setattr(FakeFilesClient, "missing", set())
+    monkeypatch.setattr(FakeFilesClient, "expires_in", 3600)
+    monkeypatch.setattr(download_urls_module, "FilesRpcClient", FakeFilesClient)
+    return FakeFilesClient
+
+
+def _resolver(**overrides) -> DownloadUrlResolver:
+    settings = {"batch_window": 0.001, "max_batch": 50, "refresh_margin": 60, "cache_size": 100}
+    return DownloadUrlResolver(**{**settings, **overrides})
+
+
+def test_concurrent_misses_are_resolved_in_one_batch_and_cached(files):
+    resolver = _resolver()
+
+    async def run():
+        first = await asyncio.gather(*(resolver.get(file_id) for file_id in [1, 2, 1, 3]))
+        second = await resolver.get(2)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert [url.file_id for url in first] == [1, 2, 1, 3]
+    assert first[0].download_url == "https://files/1"
+    assert second.download_url == "https://files/2"
+    assert 3500 < second.expires_in <= 3600
+    assert files.calls == [("batch", [1, 2, 3])]
+
+
+def test_full_batch_is_sent_without_waiting(files):
+    resolver = _resolver(batch_window=60, max_batch=2)
+
+    urls = asyncio.run(asyncio.wait_for(resolver.get_many([1, 2]), timeout=1))
+
+    assert sorted(urls) == [1, 2]
+    assert files.calls == [("batch", [1, 2])]
+
+
+def test_unknown_file_falls_back_to_single_lookups(files):
+    files.missing.add(2)
+    resolver = _resolver()
+
+    async def run():
+        return await asyncio.gather(resolver.get(1), resolver.get(2), resolver.get(3), return_exceptions=True)
+
+    first, missing, third = asyncio.run(run())
+
+    assert first.download_url == "https://files/1"
+    assert third.download_url == "https://files/3"
+    assert isinstance(missing, DownloadUrlNotFoundError)
+    assert missing.file_id == 2
+    assert files.calls[0] == ("batch", [1, 2, 3])
+    assert sorted(files.calls[1:]) == [("single", [1]), ("single", [2]), ("single", [3])]
+
+
+def test_get_many_leaves_out_unresolved_files(files):
+    files.missing.add(2)
+
+    urls = asyncio.run(_resolver().get_many([1, 2, 1]))
+
+    assert list(urls) == [1]
+
+
+def test_urls_close_to_expiry_are_not_cached(files):
+    files.expires_in = 30
+    resolver = _resolver(refresh_margin=60)
+
+    async def run():
+        await resolver.get(1)
+        await resolver.get(1)
+
+    asyncio.run(run())
+
+    assert files.calls == [("single", [1]), ("single", [1])]
+
+
+def test_invalidate_forces_a_new_lookup(files):
+    resolver = _resolver()
+
+    async def run():
+        await resolver.get(1)
+        resolver.invalidate(1)
+        await resolver.get(1)
+
+    asyncio.run(run())
+
+    assert files.calls == [("single", [1]), ("single", [1])]
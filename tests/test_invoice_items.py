@@ -0,0 +1,54 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database.crud import InvoiceItemService
+from app.database.models import Base
+from app.database.models.order import InvoiceItems
+from app.database.schemas import InvoiceItemCreate
+
+
+def _item(order_id: int, name: str, is_calculated: bool = False, is_extra_fee: bool = False) -> InvoiceItems:
+    return InvoiceItems(
+        order_id=order_id, name=name, amount=10, is_calculated=is_calculated, is_extra_fee=is_extra_fee,
+    )
+
+
+async def _replace(orders, items, items_by_order) -> tuple[list[int], dict[int, list[str]]]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add_all(orders + items)
+            await session.commit()
+
+            replaced = await InvoiceItemService(session).replace_calculated_items(items_by_order)
+
+            names: dict[int, list[str]] = {}
+            for item in (await session.execute(select(InvoiceItems).order_by(InvoiceItems.id))).scalars():
+                names.setdefault(item.order_id, []).append(item.name)
+            return replaced, names
+    finally:
+        await engine.dispose()
+
+
+def test_only_calculated_lines_are_replaced(make_order):
+    orders = [make_order(i, id=i) for i in (1, 2)]
+    items = [
+        _item(1, "Broker Fee", is_calculated=True),
+        _item(1, "Storage"),
+        _item(1, "Late payment", is_extra_fee=True),
+        # Order 2 predates the flag
+        _item(2, "Broker Fee"),
+    ]
+    quotes = {
+        order_id: [InvoiceItemCreate(name="New Broker Fee", amount=20, order_id=order_id, is_calculated=True)]
+        for order_id in (1, 2)
+    }
+
+    replaced, names = asyncio.run(_replace(orders, items, quotes))
+
+    assert replaced == [1]
+    assert names == {1: ["Storage", "Late payment", "New Broker Fee"], 2: ["Broker Fee"]}
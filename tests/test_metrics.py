@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.metrics import PrometheusMiddleware, _sql_operation, instrument_engine
+
+
+def _count(metric: str, **labels) -> float:
+    return REGISTRY.get_sample_value(f"{metric}_count", labels) or 0.0
+
+
+@pytest.mark.parametrize(
+    ("statement", "operation"),
+    [
+        ("SELECT 1", "select"),
+        ("  with recent as (select 1) select * from recent", "with"),
+        ("INSERT INTO t VALUES (1)", "insert"),
+        ("VACUUM", "other"),
+        ("'; DROP TABLE x --", "other"),
+        ("   ", "other"),
+    ],
+)
+def test_sql_operation_label_is_a_known_verb(statement, operation):
+    assert _sql_operation(statement) == operation
+
+
+def test_requests_are_labelled_by_route_template():
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/metrics-test/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    labels = dict(method="GET", route="/metrics-test/{item_id}", status="2xx")
+    unmatched = dict(method="GET", route="unmatched", status="4xx")
+    before = _count("http_request_duration_seconds", **labels)
+    before_unmatched = _count("http_request_duration_seconds", **unmatched)
+
+    with TestClient(app) as client:
+        client.get("/metrics-test/1")
+        client.get("/metrics-test/2")
+        client.get("/no-such-route/3")
+
+    assert _count("http_request_duration_seconds", **labels) == before + 2
+    assert _count("http_request_duration_seconds", **unmatched) == before_unmatched + 1
+
+
+def test_engine_statements_are_timed_by_operation():
+    before = _count("db_statement_duration_seconds", operation="select")
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        instrument_engine(engine, max_connections=1)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+    assert _count("db_statement_duration_seconds", operation="select") >= before + 1
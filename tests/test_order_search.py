@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database.crud.order_search import build_order_search_clause
+from app.database.models import Base, Order
+from app.enums.auction import AuctionEnum
+
+
+ORDERS = [
+    dict(id=1, lot_id=2015, vin="1HGCM82633A004352", vehicle_name="Honda Accord"),
+    dict(id=2, lot_id=5000, vin="JTDKB20U093512345", vehicle_name="2015 Toyota Camry"),
+    dict(id=3, lot_id=72015, vin="WBA3A5C51DF359123", vehicle_name="BMW 328i", auction=AuctionEnum.IAAI),
+    dict(id=4, lot_id=8000, vin="5YJ3E1EA7KF312015", vehicle_name="Tesla Model 3 100%"),
+]
+
+
+async def _search_ids(orders: list[Order], search: str) -> list[int]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add_all(orders)
+            await session.commit()
+            stmt = select(Order.id).where(build_order_search_clause(search)).order_by(Order.id)
+            return list((await session.execute(stmt)).scalars())
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    ("search", "expected_ids"),
+    [
+        # Numeric: exact and partial lot ids, VIN tails and model years in the vehicle name
+        ("2015", [1, 2, 3, 4]),
+        ("72015", [3]),
+        ("12345", [2]),
+        ("99999999999", []),
+        # VIN-shaped: exact match only, in any case
+        ("jtdkb20u093512345", [2]),
+        ("JTDKB20U093512346", []),
+        # Free text: VIN, vehicle name, lot id text and auction name
+        ("camry", [2]),
+        ("A3A5C", [3]),
+        ("iaa", [3]),
+        # LIKE wildcards are literal
+        ("100%", [4]),
+        ("_", []),
+    ],
+)
+def test_search_matches(make_order, search, expected_ids):
+    orders = [make_order(fields["id"], **fields) for fields in ORDERS]
+
+    ids = asyncio.run(_search_ids(orders, search))
+
+    assert ids == expected_ids
+
+
+def test_blank_search_has_no_clause():
+    assert build_order_search_clause("  ") is None
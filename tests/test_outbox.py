@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.crud.outbox import OutboxEventService
+from app.database.models import Base
+from app.database.models.outbox import OutboxEvent
+from app.enums.outbox import OutboxEventType
+from app.services.outbox_relay import OutboxRelay, _as_utc
+
+
+async def _pending_event_types(events: list[OutboxEvent], now: datetime) -> list[str]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add_all(events)
+            await session.commit()
+            return [event.event_type for event in await OutboxEventService(session).get_pending(10, now)]
+    finally:
+        await engine.dispose()
+
+
+def test_get_pending_skips_backed_off_and_parked_events():
+    now = datetime.now(timezone.utc)
+    due = now - timedelta(seconds=1)
+    later = now + timedelta(seconds=60)
+
+    def event(order_id: int, event_type: str, available_at: datetime, **fields) -> OutboxEvent:
+        return OutboxEvent(order_id=order_id, event_type=event_type, payload={}, available_at=available_at, **fields)
+
+    event_types = asyncio.run(_pending_event_types(
+        [
+            # Order 1 waits for its backed-off first event
+            event(1, "backing_off", later),
+            event(1, "held_back", due),
+            event(2, "due", due),
+            # A parked event no longer holds back its order
+            event(3, "parked", due, failed_at=now),
+            event(3, "after_parked", due),
+            event(4, "published", due, published_at=now),
+        ],
+        now,
+    ))
+
+    assert event_types == ["due", "after_parked"]
+
+
+async def _drain(events: list[OutboxEvent], **relay_options) -> tuple[OutboxRelay, list[int], list[OutboxEvent]]:
+    """Drains once with a handler that fails events whose payload asks for it."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as session:
+            session.add_all(events)
+            await session.commit()
+
+        relay = OutboxRelay(session_factory=session_factory, publisher=None, **relay_options)
+        handled = []
+
+        @relay.handler(OutboxEventType.ORDER_STATUS_CHANGED)
+        async def handle(outbox_event: OutboxEvent, publisher):
+            handled.append(outbox_event.id)
+            if outbox_event.payload.get("fail"):
+                raise RuntimeError("broker down")
+
+        await relay.drain_once()
+        async with session_factory() as session:
+            stored = (await session.execute(select(OutboxEvent).order_by(OutboxEvent.id))).scalars().all()
+        return relay, handled, list(stored)
+    finally:
+        await engine.dispose()
+
+
+def _status_event(order_id: int, fail: bool = False, **fields) -> OutboxEvent:
+    return OutboxEvent(
+        order_id=order_id,
+        event_type=OutboxEventType.ORDER_STATUS_CHANGED.value,
+        payload={"fail": fail},
+        available_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+        **fields,
+    )
+
+
+def test_failed_event_backs_off_and_holds_back_its_order():
+    started = datetime.now(timezone.utc)
+
+    relay, handled, stored = asyncio.run(_drain(
+        [_status_event(1, fail=True, attempts=2), _status_event(1), _status_event(2)],
+        max_backoff=60,
+    ))
+    failed, held_back, other = stored
+
+    # The later event of order 1 is not even tried; order 2 is unaffected
+    assert sorted(handled) == [failed.id, other.id]
+    assert (relay.published, relay.failed, relay.parked) == (1, 1, 0)
+    assert failed.attempts == 3
+    assert failed.last_error == "broker down"
+    assert failed.published_at is None and failed.failed_at is None
+    retry_in = (_as_utc(failed.available_at) - started).total_seconds()
+    assert 2 ** 2 <= retry_in < 2 ** 2 + 5
+    assert held_back.published_at is None
+    assert other.published_at is not None
+
+
+def test_backoff_is_capped():
+    started = datetime.now(timezone.utc)
+
+    _, _, (failed,) = asyncio.run(_drain([_status_event(1, fail=True, attempts=8)], max_backoff=30, max_attempts=20))
+
+    assert (_as_utc(failed.available_at) - started).total_seconds() < 30 + 5
+
+
+def test_event_is_parked_after_its_last_attempt():
+    relay, _, (parked, after) = asyncio.run(_drain(
+        [_status_event(1, fail=True, attempts=4), _status_event(1)],
+        max_attempts=5,
+    ))
+
+    assert relay.parked == 1
+    assert parked.attempts == 5
+    assert parked.failed_at is not None
+    assert parked.published_at is None
+    # Not published in this pass, but no longer held back by the parked event
+    assert after.published_at is None
@@ -0,0 +1,73 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.database.models import Base
+
+_MIGRATION = Path(__file__).parents[1] / "alembic" / "versions" / "b7e2f05c81d3_add_order_filter_and_fk_indexes.py"
+
+# The predicate each index exists for, written out so the plans depend on SQLite alone
+INDEXED_QUERIES = [
+    (
+        "ix_order_user_uuid_order_date",
+        """SELECT id FROM "order" WHERE user_uuid = 'u1' ORDER BY order_date DESC, id DESC LIMIT 6""",
+    ),
+    (
+        "ix_order_user_uuid_order_date",
+        """SELECT id FROM "order" WHERE user_uuid = 'u1' AND (order_date, id) < ('2025-01-03 00:00:00', 3)
+        ORDER BY order_date DESC, id DESC LIMIT 6""",
+    ),
+    ("ix_order_order_date_id", """SELECT id FROM "order" ORDER BY order_date DESC, id DESC LIMIT 6"""),
+    ("ix_order_delivery_status", """SELECT id FROM "order" WHERE delivery_status IN ('DELIVERED')"""),
+    ("ix_invoice_item_order_id", "SELECT id FROM invoice_item WHERE order_id IN (1, 2)"),
+    ("ix_order_status_history_order_id", "SELECT id FROM order_status_history WHERE order_id IN (1, 2)"),
+]
+
+
+def _migration_indexes() -> dict[str, tuple[str, list]]:
+    spec = importlib.util.spec_from_file_location("b7e2f05c81d3", _MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return {name: (table, columns) for name, table, columns in migration.INDEXES}
+
+
+def _column_names(columns) -> list[str]:
+    # Migration entries are names or text like "order_date DESC"; model entries are columns or orderings
+    names = []
+    for column in columns:
+        if isinstance(column, str):
+            names.append(column)
+        elif hasattr(column, "text"):
+            names.append(column.text.split()[0])
+        else:
+            names.append(getattr(column, "name", None) or column.element.name)
+    return names
+
+
+@pytest.fixture(scope="module")
+def sqlite_engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_model_declares_the_migrated_indexes():
+    model_indexes = {
+        index.name: (table.name, _column_names(index.expressions))
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    }
+
+    for name, (table, columns) in _migration_indexes().items():
+        assert model_indexes.get(name) == (table, _column_names(columns)), name
+
+
+@pytest.mark.parametrize(("index", "sql"), INDEXED_QUERIES)
+def test_query_uses_its_index(sqlite_engine, index, sql):
+    with sqlite_engine.connect() as conn:
+        plan = "\n".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+    assert f"INDEX {index}" in plan, plan
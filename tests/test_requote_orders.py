@@ -0,0 +1,135 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.models import Base
+from app.database.models.order import InvoiceItems
+from app.rpc_client.gen.python.calculator.v1 import calculator_pb2
+from app.schemas.requote import RequoteFilterIn
+from app.services import requote_orders as requote_module
+from app.enums.background_run_status import BackgroundRunStatus
+from app.services.requote_orders import RequoteOrders, requote_runs
+
+FAILING_PRICE = 666
+
+
+class FakeCalculatorClient:
+    """Quotes a broker fee equal to the vehicle price; a batch with ``FAILING_PRICE`` in it raises."""
+
+    batches: list[list[str]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def get_calculator_with_data_batch(self, requests):
+        self.batches.append([request.lot_id for request in requests])
+        if any(request.data.price == FAILING_PRICE for request in requests):
+            raise RuntimeError("circuit open")
+        return calculator_pb2.GetCalculatorWithDataBatchResponse(data=[
+            calculator_pb2.CalculatorBatchItem(
+                lot_id=request.lot_id,
+                calculator=calculator_pb2.CalculatorOut(
+                    calculator=calculator_pb2.DefaultCalculator(broker_fee=request.data.price),
+                ),
+            )
+            for request in requests
+        ])
+
+
+@pytest.fixture
+def database(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_db_context():
+        async with session_factory() as session:
+            yield session
+
+    monkeypatch.setattr(FakeCalculatorClient, "batches", [])
+    monkeypatch.setattr(requote_module, "CalculatorRpcClient", FakeCalculatorClient)
+    monkeypatch.setattr(requote_module, "get_db_context", get_db_context)
+    yield engine, session_factory
+    asyncio.run(engine.dispose())
+
+
+async def _seed(engine, session_factory, orders):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        session.add_all(orders)
+        await session.flush()
+        session.add_all(
+            InvoiceItems(order_id=order.id, name="Broker Fee", amount=0, is_extra_fee=False, is_calculated=True)
+            for order in orders
+        )
+        await session.commit()
+
+
+async def _broker_fees(session_factory) -> dict[int, int]:
+    async with session_factory() as session:
+        result = await session.execute(
+            select(InvoiceItems.order_id, InvoiceItems.amount).where(InvoiceItems.name == "Broker Fee")
+        )
+        return dict(result.all())
+
+
+def test_failed_batch_is_counted_and_other_batches_still_run(database, make_order):
+    engine, session_factory = database
+    orders = [make_order(i, id=i, vehicle_value=100 + i) for i in range(1, 5)]
+    orders[2].vehicle_value = FAILING_PRICE
+
+    async def run():
+        await _seed(engine, session_factory, orders)
+        result = await RequoteOrders(RequoteFilterIn(batch_size=2)).run()
+        return result, await _broker_fees(session_factory)
+
+    result, fees = asyncio.run(run())
+
+    assert (result.matched, result.requoted, result.skipped, result.failed_batches) == (4, 2, 2, 1)
+    assert fees == {1: 101, 2: 102, 3: 0, 4: 0}
+
+
+def test_quotes_are_matched_to_orders_by_order_id(database, make_order):
+    engine, session_factory = database
+    # Lot ids differ from the order ids, so the batch has to carry the order ids
+    orders = [make_order(i, id=i, lot_id=1003 - i, vehicle_value=100 + i) for i in (1, 2)]
+
+    async def run():
+        await _seed(engine, session_factory, orders)
+        result = await RequoteOrders(RequoteFilterIn()).run()
+        return result, await _broker_fees(session_factory)
+
+    result, fees = asyncio.run(run())
+
+    assert result.requoted == 2
+    assert fees == {1: 101, 2: 102}
+    assert FakeCalculatorClient.batches == [["1", "2"]]
+
+
+def test_started_run_can_be_polled_until_it_finishes(database, make_order):
+    engine, session_factory = database
+    orders = [make_order(i, id=i, vehicle_value=100 + i) for i in (1, 2)]
+
+    async def run():
+        await _seed(engine, session_factory, orders)
+        started = requote_runs.start(RequoteFilterIn())
+        run_out = requote_runs.get(started.run_id)
+        while run_out.status == BackgroundRunStatus.RUNNING:
+            await asyncio.sleep(0.01)
+            run_out = requote_runs.get(started.run_id)
+        return started, run_out
+
+    started, finished = asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+    assert started.status == BackgroundRunStatus.RUNNING
+    assert finished.status == BackgroundRunStatus.SUCCEEDED
+    assert finished.finished_at is not None
+    assert (finished.matched, finished.requoted, finished.skipped) == (2, 2, 0)
+    assert requote_runs.get("unknown") is None
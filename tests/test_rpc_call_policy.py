@@ -0,0 +1,147 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import grpc
+import grpc.aio
+import pytest
+
+from app.config import RpcCallPolicy, settings
+from app.rpc_client import base_client as base_client_module
+from app.rpc_client.base_client import BaseRpcClient
+
+METHOD = "test.v1.TestService/Call"
+
+
+def _error(code: grpc.StatusCode) -> grpc.aio.AioRpcError:
+    return grpc.aio.AioRpcError(code, grpc.aio.Metadata(), grpc.aio.Metadata(), code.name)
+
+
+class FakeMethod:
+    """A stub method answering with the scripted outcomes in turn; an ``asyncio.Event`` blocks until set."""
+
+    _method = f"/{METHOD}".encode()
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self, request, metadata=None, compression=None, timeout=None):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        try:
+            if isinstance(outcome, asyncio.Event):
+                await outcome.wait()
+                return "late"
+            await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+class FakeClient(BaseRpcClient[object]):
+    def __init__(self):
+        # A breaker of its own, so failures do not leak into other tests
+        super().__init__(server_url=f"test-{uuid.uuid4().hex}:1")
+        self.channel = self.stub = object()
+
+    def _create_stub(self, channel):
+        return channel
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    backoff_caps = []
+
+    def uniform(low, high):
+        backoff_caps.append(high)
+        return 0.0
+
+    def use(**fields) -> list[float]:
+        monkeypatch.setitem(settings.RPC_CALL_POLICIES, METHOD, RpcCallPolicy(**fields))
+        return backoff_caps
+
+    monkeypatch.setattr(base_client_module, "random", SimpleNamespace(uniform=uniform))
+    return use
+
+
+def _execute(method: FakeMethod):
+    return asyncio.run(FakeClient()._execute_request(method, None))
+
+
+def test_retryable_failures_are_retried_with_growing_backoff(policy):
+    backoff_caps = policy(max_attempts=3, backoff_base_s=0.1, backoff_max_s=0.3)
+    method = FakeMethod(_error(grpc.StatusCode.UNAVAILABLE), _error(grpc.StatusCode.UNAVAILABLE), "ok")
+
+    assert _execute(method) == "ok"
+    assert method.calls == 3
+    assert backoff_caps == [0.2, 0.3]
+
+
+def test_last_error_is_raised_once_attempts_run_out(policy):
+    policy(max_attempts=2)
+    method = FakeMethod(_error(grpc.StatusCode.UNAVAILABLE))
+
+    with pytest.raises(grpc.aio.AioRpcError) as raised:
+        _execute(method)
+
+    assert raised.value.code() == grpc.StatusCode.UNAVAILABLE
+    assert method.calls == 2
+
+
+@pytest.mark.parametrize(
+    ("fields", "code"),
+    [
+        ({}, grpc.StatusCode.INVALID_ARGUMENT),
+        ({"max_attempts": 1}, grpc.StatusCode.UNAVAILABLE),
+    ],
+)
+def test_non_retryable_failures_are_not_retried(policy, fields, code):
+    policy(**fields)
+    method = FakeMethod(_error(code), "ok")
+
+    with pytest.raises(grpc.aio.AioRpcError):
+        _execute(method)
+
+    assert method.calls == 1
+
+
+def test_slow_call_is_hedged_and_the_loser_cancelled(policy):
+    policy(hedge_after_s=0.01)
+
+    async def run():
+        method = FakeMethod(asyncio.Event(), "hedged")
+        return await FakeClient()._execute_request(method, None), method
+
+    response, method = asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+    assert response == "hedged"
+    assert method.calls == 2
+    assert method.cancelled == 1
+
+
+def test_fast_call_is_not_hedged(policy):
+    policy(hedge_after_s=1.0)
+    method = FakeMethod("ok")
+
+    assert _execute(method) == "ok"
+    assert method.calls == 1
+
+
+def test_failed_hedged_attempt_waits_for_the_other(policy):
+    policy(hedge_after_s=0.01, max_attempts=1)
+
+    async def run():
+        release = asyncio.Event()
+        method = FakeMethod(release, _error(grpc.StatusCode.UNAVAILABLE))
+        call = asyncio.ensure_future(FakeClient()._execute_request(method, None))
+        while method.calls < 2:
+            await asyncio.sleep(0.01)
+        release.set()
+        return await call
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=5)) == "late"
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from app.rpc_client.gen.python.auth.v1 import auth_pb2
+from app.services.user_loader import UserLoader
+
+
+class FakeAuth:
+    def __init__(self, missing: tuple[str, ...] = (), error: Exception | None = None):
+        self.missing = missing
+        self.error = error
+        self.batches: list[list[str]] = []
+
+    async def __call__(self, user_uuids):
+        self.batches.append(list(user_uuids))
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return {
+            user_uuid: auth_pb2.GetUserResponse(email=f"{user_uuid}@example.com")
+            for user_uuid in user_uuids
+            if user_uuid not in self.missing
+        }
+
+
+def test_loads_in_one_iteration_share_one_batch():
+    auth = FakeAuth()
+    loader = UserLoader(auth, max_batch=100)
+
+    async def run():
+        return await asyncio.gather(*(loader.load(user_uuid) for user_uuid in ["a", "b", "a", "c"]))
+
+    users = asyncio.run(run())
+
+    assert [user.email for user in users] == ["a@example.com", "b@example.com", "a@example.com", "c@example.com"]
+    assert auth.batches == [["a", "b", "c"]]
+
+
+def test_full_batches_are_dispatched_at_once():
+    auth = FakeAuth()
+    loader = UserLoader(auth, max_batch=2)
+
+    async def run():
+        return await loader.load_many(["a", "b", "c", "d", "e"])
+
+    users = asyncio.run(run())
+
+    assert sorted(users) == ["a", "b", "c", "d", "e"]
+    assert auth.batches == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_missing_users_fail_with_lookup_error():
+    loader = UserLoader(FakeAuth(missing=("b",)), max_batch=100)
+
+    users = asyncio.run(loader.load_many(["a", "b"]))
+
+    assert users["a"].email == "a@example.com"
+    assert isinstance(users["b"], LookupError)
+
+
+def test_batch_errors_reach_every_caller():
+    loader = UserLoader(FakeAuth(error=RuntimeError("auth down")), max_batch=100)
+
+    async def run():
+        return await asyncio.gather(loader.load("a"), loader.load("b"), return_exceptions=True)
+
+    errors = asyncio.run(run())
+
+    assert [str(error) for error in errors] == ["auth down", "auth down"]
+
+
+def test_cancelled_caller_does_not_cancel_shared_lookup():
+    auth = FakeAuth()
+    loader = UserLoader(auth, max_batch=100)
+
+    async def run():
+        cancelled = asyncio.create_task(loader.load("a"))
+        waiting = asyncio.create_task(loader.load("a"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await waiting
+
+    assert asyncio.run(run()).email == "a@example.com"
+    assert auth.batches == [["a"]]